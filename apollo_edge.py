@@ -31,19 +31,30 @@ import os
 import sys
 import json
 import time
+import heapq
+import itertools
 import asyncio
 import aiohttp
-import requests
 import threading
 import websocket
 from datetime import datetime, timedelta
 from dataclasses import dataclass, field, asdict
-from typing import Dict, List, Optional, Tuple, Callable
-from collections import defaultdict
+from typing import Dict, List, Optional, Set, Tuple, Callable
+from collections import defaultdict, deque, OrderedDict
 from concurrent.futures import ThreadPoolExecutor
 from queue import Queue, PriorityQueue
 import logging
 
+from fill_simulator import FillSimulator
+from transport import http_session, prewarm, get_stats as transport_stats
+from journal import Journal, to_record, from_record
+from auto_scaling import AutoScalingManager, BalanceFeed
+
+try:
+    from risk_simulation import RiskSimulator, polymarket_event_key
+except ImportError:  # numpy not installed
+    RiskSimulator = None
+
 # ============================================================================
 # LOAD CONFIG FROM config.py
 # ============================================================================
@@ -102,6 +113,34 @@ except ImportError:
     MAX_DAILY_LOSS_USD = 2000
     POLYGON_RPC_URL = "https://polygon-rpc.com"
 
+try:
+    from config import POLYMARKET_PROXY_ADDRESS
+except ImportError:
+    POLYMARKET_PROXY_ADDRESS = ""
+
+try:
+    from config import PLAYBOOKS_FILE, PLAYBOOKS_STORAGE_FORMAT, PLAYBOOKS_WRITE_DELAY_MS
+except ImportError:
+    PLAYBOOKS_FILE = "playbooks.json"
+    PLAYBOOKS_STORAGE_FORMAT = "json"
+    PLAYBOOKS_WRITE_DELAY_MS = 250
+
+try:
+    from config import APOLLO_EDGE_JOURNAL_FILE
+except ImportError:
+    APOLLO_EDGE_JOURNAL_FILE = ""  # Opt-in, like WHALE_SNIPER_JOURNAL_FILE
+
+try:
+    from config import PLAYBOOKS_METRICS_FILE
+except ImportError:
+    PLAYBOOKS_METRICS_FILE = ""  # Empty = no metrics dump on stop
+
+try:
+    from config import PLAYBOOKS_SHARD_WORKERS, PLAYBOOKS_SHARD_DEADLINE_MS
+except ImportError:
+    PLAYBOOKS_SHARD_WORKERS = 0  # 0 = evaluate in the whale callback
+    PLAYBOOKS_SHARD_DEADLINE_MS = 50
+
 # ============================================================================
 # CONFIGURATION
 # ============================================================================
@@ -117,6 +156,7 @@ class Config:
     # Wallet (from config.py)
     TRADING_WALLET_ADDRESS: str = TRADING_WALLET_ADDRESS
     TRADING_WALLET_PRIVATE_KEY: str = TRADING_WALLET_PRIVATE_KEY
+    POLYMARKET_PROXY_ADDRESS: str = POLYMARKET_PROXY_ADDRESS
     PAPER_TRADING_MODE: bool = PAPER_TRADING_MODE
     
     # Chain Configuration
@@ -135,6 +175,15 @@ class Config:
     MAX_RETRIES: int = 3
     RETRY_DELAY_MS: int = 500
     
+    # Signal Scheduling
+    MIN_SIGNAL_STRENGTH: float = 70       # Only schedule high-confidence signals
+    MAX_EXECUTIONS_PER_SECOND: float = 3  # Execution budget across all signals
+    SIGNAL_EXPIRY_MARGIN_MS: int = 500    # Drop signals this close to expiry
+    
+    # Persistence
+    JOURNAL_FILE: str = APOLLO_EDGE_JOURNAL_FILE  # Position journal ("" disables)
+    JOURNAL_FSYNC_MS: int = 50                 # Group-commit window
+    
     # Monitoring
     POLL_INTERVAL_SECONDS: float = 1.0
     WHALE_ALERT_THRESHOLD_USD: float = SNIPE_THRESHOLD_USD
@@ -144,6 +193,27 @@ class Config:
     MAX_POSITION_PCT: float = 20  # Max 20% of portfolio in single position
     STOP_LOSS_PCT: float = STOP_LOSS_PCT
     TAKE_PROFIT_PCT: float = TAKE_PROFIT_PCT
+    
+    # Correlated Risk (Monte Carlo over open positions)
+    ENABLE_RISK_SIMULATION: bool = True
+    RISK_SCENARIOS: int = 100_000
+    RISK_CONFIDENCE: float = 0.95
+    MAX_PORTFOLIO_VAR_USD: float = MAX_DAILY_LOSS_USD  # Reject orders pushing VaR past this
+    
+    # Auto-Scaling (from config.py)
+    ENABLE_AUTO_SCALING: bool = ENABLE_AUTO_SCALING
+    MAX_TRADING_CAPITAL: float = MAX_TRADING_CAPITAL  # Used until the first balance read
+    CAPITAL_USAGE_PCT: float = CAPITAL_USAGE_PCT
+    POSITION_SIZE_PCT: float = POSITION_SIZE_PCT
+    MIN_USDC_RESERVE: float = MIN_USDC_RESERVE
+    BALANCE_TTL_SECONDS: float = 15           # Wallet balance cache lifetime
+    BALANCE_PUSH_THRESHOLD_USD: float = 10    # Rescale only on moves this large
+    
+    # Coordinated Clusters (streaming detection over known clusters)
+    CLUSTER_MIN_WALLETS: int = 3              # Distinct wallets on one side...
+    CLUSTER_WINDOW_SECONDS: float = 600       # ...within this window
+    CLUSTER_REFRESH_SECONDS: float = 1800     # Re-cluster detected whales / watchlist wallets
+    CLUSTER_TRACES_PER_REFRESH: int = 50      # New wallets traced on Etherscan per refresh
 
 
 # Global config
@@ -244,6 +314,11 @@ class Position:
     pnl_usd: float = 0
     pnl_pct: float = 0
     status: str = "open"  # open, closed, stopped
+    source: str = ""  # Whale wallet the position follows (if any)
+    
+    @property
+    def value_usd(self) -> float:
+        return self.size_shares * self.current_price
     
     def update_pnl(self, current_price: float):
         self.current_price = current_price
@@ -279,7 +354,7 @@ class EtherscanV2Client:
     
     def __init__(self, api_key: str = CONFIG.ETHERSCAN_API_KEY):
         self.api_key = api_key
-        self.session = requests.Session()
+        self.session = http_session()
         self._last_call = 0
         self._rate_limit = 0.2  # 5 calls/sec
     
@@ -329,10 +404,10 @@ class PolymarketClient:
     WS_URL = "wss://ws-subscriptions-clob.polymarket.com/ws/market"
     
     def __init__(self):
-        self.session = requests.Session()
-        self.session.headers.update({"Accept": "application/json"})
+        self.session = http_session({"Accept": "application/json"})
         self.ws = None
         self.ws_callbacks = []
+        self.price_callbacks: Dict[str, List[Callable[[str, float], None]]] = defaultdict(list)
     
     def get_markets(self, tag: str = None, limit: int = 100) -> List[Dict]:
         params = {"_limit": limit, "closed": False, "active": True}
@@ -353,6 +428,16 @@ class PolymarketClient:
         except:
             return []
     
+    def get_market(self, condition_id: str) -> Optional[Dict]:
+        """Gamma metadata (event, outcomes, neg-risk group) of one market"""
+        try:
+            resp = self.session.get(f"{self.GAMMA_API}/markets",
+                                   params={"condition_ids": condition_id}, timeout=15)
+            markets = resp.json() if resp.status_code == 200 else []
+            return markets[0] if markets else None
+        except:
+            return None
+    
     def get_orderbook(self, token_id: str) -> Optional[Dict]:
         try:
             resp = self.session.get(f"{self.CLOB_API}/book",
@@ -379,12 +464,60 @@ class PolymarketClient:
         if not self.ws:
             self._start_websocket()
     
+    def subscribe_prices(self, token_id: str, callback: Callable[[str, float], None]):
+        """Receive (token_id, price) ticks for a token - best bid, else last trade"""
+        new_token = token_id not in self.price_callbacks
+        self.price_callbacks[token_id].append(callback)
+        
+        if not self.ws:
+            self._start_websocket()
+        elif new_token:
+            self._send_subscription(self.ws)
+    
+    def _send_subscription(self, ws):
+        if not self.price_callbacks:
+            return
+        try:
+            ws.send(json.dumps({"assets_ids": list(self.price_callbacks), "type": "market"}))
+        except Exception as e:
+            logger.debug(f"Price subscription deferred: {e}")
+    
+    def _emit_price(self, token_id: Optional[str], price):
+        if not token_id or price is None:
+            return
+        for callback in list(self.price_callbacks.get(token_id, ())):
+            try:
+                callback(token_id, float(price))
+            except Exception as e:
+                logger.error(f"Price callback error: {e}")
+    
+    def _on_price_event(self, event: Dict):
+        event_type = event.get("event_type")
+        if event_type == "book":
+            bids = event.get("bids") or event.get("buys") or []
+            if bids:
+                self._emit_price(event.get("asset_id"), max(float(b["price"]) for b in bids))
+        elif event_type == "price_change":
+            for change in event.get("price_changes", []):
+                self._emit_price(change.get("asset_id"), change.get("best_bid") or change.get("price"))
+        elif event_type == "last_trade_price":
+            self._emit_price(event.get("asset_id"), event.get("price"))
+    
     def _start_websocket(self):
+        def on_open(ws):
+            self._send_subscription(ws)
+        
         def on_message(ws, message):
-            data = json.loads(message)
-            for market_id, callback in self.ws_callbacks:
-                if data.get("market") == market_id:
-                    callback(data)
+            try:
+                data = json.loads(message)
+            except ValueError:
+                return
+            for event in data if isinstance(data, list) else [data]:
+                for market_id, callback in self.ws_callbacks:
+                    if event.get("market") == market_id:
+                        callback(event)
+                if self.price_callbacks:
+                    self._on_price_event(event)
         
         def on_error(ws, error):
             logger.error(f"WebSocket error: {error}")
@@ -396,6 +529,7 @@ class PolymarketClient:
         
         self.ws = websocket.WebSocketApp(
             self.WS_URL,
+            on_open=on_open,
             on_message=on_message,
             on_error=on_error,
             on_close=on_close
@@ -414,7 +548,7 @@ class OddsAPIClient:
     
     def __init__(self, api_key: str = ""):
         self.api_key = api_key
-        self.session = requests.Session()
+        self.session = http_session()
     
     def get_odds(self, sport: str = "americanfootball_nfl", 
                  markets: str = "h2h,spreads,totals") -> List[Dict]:
@@ -441,6 +575,171 @@ class OddsAPIClient:
 # CORE MODULES
 # ============================================================================
 
+class _ClusterWindow:
+    """Recent trades of one cluster on one (market, outcome, side)"""
+    __slots__ = ("trades", "wallets", "notional", "fired")
+    
+    def __init__(self):
+        self.trades = deque()   # (ts, wallet, notional), oldest first
+        self.wallets = {}       # wallet -> trades in window
+        self.notional = 0.0
+        self.fired = False      # Event emitted; re-arms below the threshold
+
+
+class ClusterActivityTracker:
+    """Streaming coordinated-buy detection over known wallet clusters
+    
+    Keeps wallet -> cluster in memory and, per (cluster, market, outcome,
+    side), a sliding window of trades with per-wallet counts and running
+    notional - O(1) amortized per trade. The trade that brings
+    `min_wallets` distinct cluster wallets inside the window emits the
+    cluster event immediately; the window re-arms once activity drops back
+    below the threshold.
+    """
+    
+    SEEN_MAX = 50_000      # (tx hash, wallet) pairs remembered for de-duplication
+    PRUNE_EVERY = 4096     # Trades between sweeps of idle windows
+    
+    def __init__(self, min_wallets: int = 3, window_seconds: float = 600):
+        self.min_wallets = min_wallets
+        self.window = window_seconds
+        
+        self.wallet_cluster: Dict[str, str] = {}     # wallet -> cluster id
+        self.clusters: Dict[str, Dict] = {}          # cluster id -> {"source", "wallets"}
+        self._windows: Dict[Tuple[str, str, str, str], _ClusterWindow] = {}
+        self._seen: OrderedDict = OrderedDict()
+        
+        self.callbacks = []
+        self.stats = {"trades": 0, "cluster_trades": 0, "duplicates": 0, "events": 0}
+    
+    def on_cluster(self, callback: Callable[[Dict], None]):
+        """Register callback for coordinated cluster activity"""
+        self.callbacks.append(callback)
+    
+    def add_cluster(self, cluster_id: str, wallets: List[str], source: Optional[str] = None):
+        """Add / replace a cluster (wallets funded from a common source)"""
+        previous = self.clusters.get(cluster_id, {}).get("wallets", set())
+        members = {wallet.lower() for wallet in wallets}
+        self.clusters[cluster_id] = {"source": source, "wallets": members}
+        for wallet in members:
+            self.wallet_cluster[wallet] = cluster_id
+        
+        # Members map to the cluster throughout a refresh - only leavers are dropped
+        for wallet in previous - members:
+            if self.wallet_cluster.get(wallet) == cluster_id:
+                del self.wallet_cluster[wallet]
+    
+    def on_trade(self, wallet: str, market_id: str, outcome: str, side: str, notional: float,
+                 price: float, ts: Optional[float] = None, tx_hash: str = "") -> Optional[Dict]:
+        """Feed one trade - returns the cluster event if this trade crossed the threshold"""
+        self.stats["trades"] += 1
+        cluster_id = self.wallet_cluster.get(wallet.lower())
+        if cluster_id is None:
+            return None
+        
+        if tx_hash:
+            # One transaction settles many wallets' fills - only the same
+            # wallet in the same transaction is a repeat
+            seen_key = (tx_hash, wallet.lower())
+            if seen_key in self._seen:
+                self.stats["duplicates"] += 1
+                return None
+            self._seen[seen_key] = None
+            if len(self._seen) > self.SEEN_MAX:
+                self._seen.popitem(last=False)
+        
+        self.stats["cluster_trades"] += 1
+        if self.stats["cluster_trades"] % self.PRUNE_EVERY == 0:
+            self.prune()
+        
+        key = (cluster_id, market_id, outcome, side.lower())
+        win = self._windows.get(key)
+        if win is None:
+            win = self._windows[key] = _ClusterWindow()
+        
+        trades = win.trades
+        ts = time.time() if ts is None else ts
+        if trades and ts < trades[-1][0]:
+            ts = trades[-1][0]  # Keep the window monotonic
+        
+        # Slide the window
+        cutoff = ts - self.window
+        while trades and trades[0][0] < cutoff:
+            _, old_wallet, old_notional = trades.popleft()
+            win.notional -= old_notional
+            count = win.wallets[old_wallet] - 1
+            if count:
+                win.wallets[old_wallet] = count
+            else:
+                del win.wallets[old_wallet]
+        
+        wallet = wallet.lower()
+        trades.append((ts, wallet, notional))
+        win.notional += notional
+        win.wallets[wallet] = win.wallets.get(wallet, 0) + 1
+        
+        active = len(win.wallets)
+        if active < self.min_wallets:
+            win.fired = False
+            return None
+        if win.fired:
+            return None
+        
+        win.fired = True
+        event = self._event(key, win, price, ts)
+        self.stats["events"] += 1
+        for callback in self.callbacks:
+            try:
+                callback(event)
+            except Exception as e:
+                logger.error(f"Cluster callback error: {e}")
+        return event
+    
+    def _event(self, key: Tuple, win: _ClusterWindow, price: float, ts: float) -> Dict:
+        """Cluster event in the fields CLUSTER playbooks read
+        
+        Confidence rises with wallets beyond the threshold and with the
+        share of the known cluster acting together.
+        """
+        cluster_id, market_id, outcome, side = key
+        cluster = self.clusters[cluster_id]
+        active = len(win.wallets)
+        confidence = min(100, 60 + 10 * (active - self.min_wallets + 1)
+                         + 20 * active / max(1, len(cluster["wallets"])))
+        
+        return {
+            "cluster_id": cluster_id,
+            "market_id": market_id,
+            "outcome": outcome,
+            "side": side,
+            "whale_action": side,
+            "cluster_wallets_active": active,
+            "cluster_wallets_known": len(cluster["wallets"]),
+            "total_cluster_size": round(win.notional, 2),
+            "cluster_confidence": round(confidence, 1),
+            "funding_source": cluster["source"],
+            "wallets": list(win.wallets),
+            "window_seconds": round(ts - win.trades[0][0], 1),
+            "price": price,
+            "timestamp": ts
+        }
+    
+    def prune(self, now: Optional[float] = None):
+        """Drop windows with no trade inside the window"""
+        cutoff = (time.time() if now is None else now) - self.window
+        idle = [key for key, win in self._windows.items() if not win.trades or win.trades[-1][0] < cutoff]
+        for key in idle:
+            del self._windows[key]
+    
+    def get_stats(self) -> Dict:
+        return {
+            **self.stats,
+            "clusters": len(self.clusters),
+            "wallets": len(self.wallet_cluster),
+            "windows": len(self._windows)
+        }
+
+
 class WhaleDetector:
     """Real-time whale position detection"""
     
@@ -462,8 +761,11 @@ class WhaleDetector:
     def __init__(self):
         self.etherscan = EtherscanV2Client()
         self.polymarket = PolymarketClient()
-        self.detected_whales = {}
-        self.wallet_clusters = defaultdict(set)
+        self.detected_whales = {}                        # wallet -> latest WhalePosition
+        self.wallet_funding: Dict[str, Set[str]] = {}    # wallet -> USDC funding sources
+        self._cluster_ids: Dict[str, str] = {}           # funding source -> cluster id
+        self.cluster_tracker = ClusterActivityTracker(CONFIG.CLUSTER_MIN_WALLETS,
+                                                      CONFIG.CLUSTER_WINDOW_SECONDS)
         self.callbacks = []
     
     def on_whale_detected(self, callback: Callable[[WhalePosition], None]):
@@ -481,8 +783,10 @@ class WhaleDetector:
         """Scan recent trades for whale activity"""
         whales = []
         
-        # Get recent large trades from Polymarket
+        # Get recent large trades from Polymarket (oldest first for the cluster windows)
         trades = self.polymarket.get_trades(limit=500)
+        if isinstance(trades, list):
+            trades.sort(key=self._trade_time)
         
         for trade in trades:
             try:
@@ -490,6 +794,13 @@ class WhaleDetector:
                 price = float(trade.get("price", 0))
                 value = size * price
                 
+                # Every trade feeds cluster detection, not just whale-sized ones
+                ts = self._trade_time(trade) or None
+                self.cluster_tracker.on_trade(
+                    trade.get("maker", "unknown"), trade.get("market", ""), trade.get("outcome", ""),
+                    str(trade.get("side", "buy")), value, price, ts, trade.get("transactionHash", "")
+                )
+                
                 if value >= min_size:
                     whale = WhalePosition(
                         wallet=trade.get("maker", "unknown"),
@@ -502,6 +813,8 @@ class WhaleDetector:
                         confidence=min(100, value / 1000)  # Higher value = higher confidence
                     )
                     whales.append(whale)
+                    if whale.wallet != "unknown":
+                        self.detected_whales[whale.wallet.lower()] = whale
                     self._notify_whale(whale)
                     
             except (ValueError, TypeError):
@@ -509,6 +822,15 @@ class WhaleDetector:
         
         return whales
     
+    @staticmethod
+    def _trade_time(trade: Dict) -> float:
+        """Trade timestamp in epoch seconds (0 if missing)"""
+        try:
+            ts = float(trade.get("timestamp") or 0)
+        except (TypeError, ValueError):
+            return 0.0
+        return ts / 1000 if ts > 1e12 else ts
+    
     def trace_wallet(self, address: str, max_hops: int = 5) -> Dict:
         """Trace wallet funding sources"""
         result = {
@@ -561,33 +883,56 @@ class WhaleDetector:
         
         return result
     
-    def find_clusters(self, wallets: List[str]) -> Dict[str, List[str]]:
-        """Find wallet clusters by common funding source"""
-        source_to_wallets = defaultdict(set)
+    def find_clusters(self, wallets: List[str], max_traces: Optional[int] = None) -> Dict[str, List[str]]:
+        """Find wallet clusters by common funding source
         
-        for wallet in wallets:
+        Each wallet's funding sources are looked up once (at most `max_traces`
+        new wallets per call); clusters are rebuilt over every wallet traced
+        so far and keep their ids across calls.
+        """
+        traced = 0
+        for wallet in dict.fromkeys(wallet.lower() for wallet in wallets):
+            if wallet in self.wallet_funding:
+                continue
+            if max_traces is not None and traced >= max_traces:
+                break
+            traced += 1
+            
             transfers = self.etherscan.get_token_transfers(
                 wallet, self.USDC_POLYGON, 137
             )
+            if not transfers:
+                continue  # A Polymarket wallet was funded somehow - retry on the next call
             
+            sources = set()
             for tx in transfers:
-                if tx.get("to", "").lower() == wallet.lower():
-                    source = tx.get("from", "").lower()
+                if tx.get("to", "").lower() == wallet:
                     value = int(tx.get("value", 0)) / 1e6
                     if value >= 100:
-                        source_to_wallets[source].add(wallet.lower())
+                        sources.add(tx.get("from", "").lower())
+            self.wallet_funding[wallet] = sources
         
-        clusters = {}
-        cluster_id = 0
+        source_to_wallets = defaultdict(set)
+        for wallet, sources in self.wallet_funding.items():
+            for source in sources:
+                source_to_wallets[source].add(wallet)
         
+        clusters = {}
         for source, funded_wallets in source_to_wallets.items():
             if len(funded_wallets) >= 2:
-                cluster_id += 1
-                clusters[f"CLUSTER_{cluster_id}"] = {
+                cluster_id = self._cluster_ids.get(source)
+                if cluster_id is None:
+                    cluster_id = self._cluster_ids[source] = f"CLUSTER_{len(self._cluster_ids) + 1}"
+                clusters[cluster_id] = {
                     "source": source,
                     "wallets": list(funded_wallets),
                     "count": len(funded_wallets)
                 }
+                
+                # Live trades from these wallets now count toward coordinated activity
+                label = self.CEX_WALLETS.get(source)
+                self.cluster_tracker.add_cluster(cluster_id, list(funded_wallets),
+                                                 label.lower() if label else source)
         
         return clusters
 
@@ -638,21 +983,148 @@ class ArbitrageScanner:
         return None
 
 
+class SignalScheduler:
+    """Deadline-aware signal scheduler (earliest deadline first)
+    
+    Signals are ordered by deadline in one-second buckets, then by strength,
+    so short-lived snipes always run ahead of long-lived whale follows.
+    Unexecuted signals carry over between scan cycles and are dropped
+    before they expire.
+    """
+    
+    DEADLINE_BUCKET_SECONDS = 1.0
+    DONE_RETENTION_SECONDS = 86400  # Remember executed/dropped ids for a day
+    
+    def __init__(self, min_strength: float = None, max_per_second: float = None,
+                 expiry_margin_ms: int = None):
+        self.min_strength = CONFIG.MIN_SIGNAL_STRENGTH if min_strength is None else min_strength
+        self.max_per_second = CONFIG.MAX_EXECUTIONS_PER_SECOND if max_per_second is None else max_per_second
+        margin_ms = CONFIG.SIGNAL_EXPIRY_MARGIN_MS if expiry_margin_ms is None else expiry_margin_ms
+        self.expiry_margin = margin_ms / 1000
+        
+        self._heap: List[Tuple] = []
+        self._pending: Dict[str, Signal] = {}
+        self._seq = itertools.count()
+        
+        # Ids already executed or dropped (regenerated signals are ignored)
+        self._done: Dict[str, float] = {}
+        self._done_order = []
+        
+        # Token bucket for the per-second execution budget
+        self._tokens = float(self.max_per_second)
+        self._last_refill = time.time()
+        
+        self.stats = {
+            "scheduled": 0,
+            "executed": 0,
+            "expired": 0,
+            "duplicates": 0,
+            "too_weak": 0
+        }
+    
+    def __len__(self) -> int:
+        return len(self._pending)
+    
+    def push(self, signal: Signal) -> bool:
+        """Schedule a signal - returns False if it was rejected"""
+        if signal.id in self._pending or signal.id in self._done:
+            self.stats["duplicates"] += 1
+            return False
+        
+        if signal.strength < self.min_strength:
+            self.stats["too_weak"] += 1
+            return False
+        
+        deadline = signal.expires_at.timestamp()
+        if deadline - self.expiry_margin <= time.time():
+            self._mark_done(signal.id)
+            self.stats["expired"] += 1
+            return False
+        
+        bucket = int(deadline // self.DEADLINE_BUCKET_SECONDS)
+        heapq.heappush(self._heap, (bucket, -signal.strength, deadline, next(self._seq), signal.id))
+        self._pending[signal.id] = signal
+        self.stats["scheduled"] += 1
+        return True
+    
+    def pop_ready(self) -> Optional[Signal]:
+        """Pop the most urgent live signal if the execution budget allows"""
+        now = time.time()
+        self._refill(now)
+        
+        while self._heap:
+            if self._tokens < 1:
+                return None
+            
+            _, _, deadline, _, signal_id = heapq.heappop(self._heap)
+            signal = self._pending.pop(signal_id, None)
+            if signal is None:
+                continue
+            
+            self._mark_done(signal_id)
+            
+            if deadline - self.expiry_margin <= now:
+                self.stats["expired"] += 1
+                logger.warning(f"Signal {signal_id} dropped before expiry")
+                continue
+            
+            self._tokens -= 1
+            self.stats["executed"] += 1
+            return signal
+        
+        return None
+    
+    def drain(self) -> List[Signal]:
+        """Pop every signal the current budget allows, most urgent first"""
+        ready = []
+        while True:
+            signal = self.pop_ready()
+            if signal is None:
+                return ready
+            ready.append(signal)
+    
+    def _refill(self, now: float):
+        elapsed = now - self._last_refill
+        self._last_refill = now
+        self._tokens = min(float(self.max_per_second), self._tokens + elapsed * self.max_per_second)
+        
+        # Forget old done ids (appended in time order)
+        cutoff = 0
+        while cutoff < len(self._done_order) and self._done_order[cutoff][0] <= now:
+            self._done.pop(self._done_order[cutoff][1], None)
+            cutoff += 1
+        if cutoff:
+            del self._done_order[:cutoff]
+    
+    def _mark_done(self, signal_id: str):
+        forget_at = time.time() + self.DONE_RETENTION_SECONDS
+        self._done[signal_id] = forget_at
+        self._done_order.append((forget_at, signal_id))
+    
+    def get_stats(self) -> Dict:
+        return {
+            **self.stats,
+            "pending": len(self._pending),
+            "budget_per_second": self.max_per_second,
+            "tokens_available": round(self._tokens, 2)
+        }
+
+
 class SignalGenerator:
     """Generates trading signals from various sources"""
     
     def __init__(self):
         self.whale_detector = WhaleDetector()
         self.arb_scanner = ArbitrageScanner()
-        self.signal_queue = PriorityQueue()
+        self.signal_queue = SignalScheduler()
         self.callbacks = []
     
     def on_signal(self, callback: Callable[[Signal], None]):
         self.callbacks.append(callback)
     
     def _emit_signal(self, signal: Signal):
-        # Priority queue: higher strength = higher priority (use negative for min-heap)
-        self.signal_queue.put((-signal.strength, signal))
+        # Deadline-aware scheduler: snipes run before long-lived follows
+        self.signal_queue.push(signal)
         
         for callback in self.callbacks:
             try:
@@ -723,6 +1195,7 @@ class ExecutionEngine:
         self.positions = {}
         self.pending_orders = {}
         self.executor = ThreadPoolExecutor(max_workers=10)
+        self.fill_simulator = FillSimulator()
     
     async def execute_signal(self, signal: Signal) -> Optional[Position]:
         """Execute a trading signal"""
@@ -751,16 +1224,36 @@ class ExecutionEngine:
         
         # Get current orderbook for price
         # In production: submit limit order or market order
+        entry_price = 0.5  # Would get from orderbook
+        size_shares = signal.size_usd  # Simplified
+        
+        # Paper mode: match against the mirrored book instead of a fixed price
+        if CONFIG.PAPER_TRADING_MODE:
+            book = self.polymarket.get_orderbook(signal.market_id)
+            if book and self.fill_simulator.mirror(signal.market_id, book):
+                fill = self.fill_simulator.submit(
+                    signal.id, signal.market_id, signal.direction,
+                    size_usd=signal.size_usd
+                )
+                await asyncio.sleep(fill.latency_ms / 1000)
+                
+                if fill.filled_shares <= 0:
+                    logger.warning(f"[PAPER] No liquidity for {signal.id}")
+                    return None
+                
+                entry_price = fill.avg_price
+                size_shares = fill.filled_shares
         
         position = Position(
             id=f"pos_{signal.id}",
             market_id=signal.market_id,
             platform="polymarket",
             outcome=signal.outcome,
-            size_shares=signal.size_usd,  # Simplified
-            entry_price=0.5,  # Would get from orderbook
-            current_price=0.5,
-            entry_time=datetime.now()
+            size_shares=size_shares,
+            entry_price=entry_price,
+            current_price=entry_price,
+            entry_time=datetime.now(),
+            source=signal.metadata.get("whale", {}).get("wallet", "")
         )
         
         self.positions[position.id] = position
@@ -811,36 +1304,247 @@ class ExecutionEngine:
 
 
 class PortfolioManager:
-    """Manages positions and risk"""
+    """Manages positions and risk
     
-    def __init__(self):
+    Totals and exposures (per market, outcome, platform and whale source)
+    are maintained incrementally on every add, close and price update, so
+    pre-trade checks and status reads never walk the position list.
+    """
+    
+    def __init__(self, journal: Optional[Journal] = None,
+                 resolver: Optional[Callable[[str, str], Optional[Tuple[str, str]]]] = None):
         self.positions: Dict[str, Position] = {}
         self.daily_pnl = 0
+        self.daily_pnl_date = datetime.now().date()
         self.total_value = 0
+        self.unrealized_pnl = 0
+        
+        # Exposure index (USD at current price)
+        self.exposure_by_market: Dict[str, float] = defaultdict(float)
+        self.exposure_by_outcome: Dict[Tuple[str, str], float] = defaultdict(float)
+        self.exposure_by_platform: Dict[str, float] = defaultdict(float)
+        self.exposure_by_source: Dict[str, float] = defaultdict(float)
+        self.positions_by_outcome: Dict[Tuple[str, str], set] = defaultdict(set)
+        
+        # Contribution of each position currently counted in the aggregates
+        self._values: Dict[str, float] = {}
+        self._pnls: Dict[str, float] = {}
+        
+        # Risk flags kept current on each price update
+        self.stop_loss_hits = set()
+        self.take_profit_hits = set()
+        
+        # Lazy max-heap of position values for concentration checks
+        self._value_heap: List[Tuple[float, int, str]] = []
+        self._versions: Dict[str, int] = {}
+        
+        # Joint-resolution risk model (correlated via shared events -
+        # resolver maps each market/outcome to the event it pays out on)
+        self.risk = None
+        if CONFIG.ENABLE_RISK_SIMULATION and RiskSimulator:
+            self.risk = RiskSimulator(CONFIG.RISK_SCENARIOS, CONFIG.RISK_CONFIDENCE, resolver=resolver)
+        
+        # Crash-safe log of opens/closes (price ticks are not journaled)
+        self.journal = journal
+        if journal:
+            self._restore()
+    
+    def _restore(self):
+        for record in self.journal.table("positions").values():
+            position = from_record(Position, record)
+            if position.status == "open":
+                self.positions[position.id] = position
+                self._index(position)
+        
+        counter = self.journal.get("counters", "daily_pnl")
+        if counter and counter["date"] == self.daily_pnl_date.isoformat():
+            self.daily_pnl = counter["pnl"]
+        
+        logger.info(f"[JOURNAL] Restored {len(self.positions)} open positions "
+                    f"({self.journal.stats['replay_ms']}ms)")
     
     def add_position(self, position: Position):
+        if position.id in self.positions:
+            self._unindex(self.positions[position.id])
+        
         self.positions[position.id] = position
-        self._update_totals()
+        self._index(position)
+        
+        if self.journal:
+            self.journal.put("positions", position.id, to_record(position))
     
     def close_position(self, position_id: str, exit_price: float) -> float:
         if position_id not in self.positions:
             return 0
         
         position = self.positions[position_id]
+        self._unindex(position)
+        
         position.current_price = exit_price
         position.update_pnl(exit_price)
         position.status = "closed"
         
         pnl = position.pnl_usd
+        if datetime.now().date() != self.daily_pnl_date:
+            self.daily_pnl = 0
+            self.daily_pnl_date = datetime.now().date()
         self.daily_pnl += pnl
         
         del self.positions[position_id]
-        self._update_totals()
+        
+        if self.journal:
+            self.journal.put("positions", position_id, to_record(position))
+            self.journal.put("counters", "daily_pnl",
+                             {"date": self.daily_pnl_date.isoformat(), "pnl": self.daily_pnl})
         
         return pnl
     
-    def _update_totals(self):
-        self.total_value = sum(p.size_shares * p.current_price for p in self.positions.values())
+    def update_price(self, position_id: str, price: float):
+        """Apply a price tick to one position in O(1)"""
+        position = self.positions.get(position_id)
+        if not position:
+            return
+        
+        old_value = self._values[position_id]
+        old_pnl = self._pnls[position_id]
+        
+        position.update_pnl(price)
+        
+        self._adjust(position, position.value_usd - old_value)
+        self._values[position_id] = position.value_usd
+        self.unrealized_pnl += position.pnl_usd - old_pnl
+        self._pnls[position_id] = position.pnl_usd
+        
+        self._flag(position)
+        self._push_value(position)
+    
+    def update_market_price(self, market_id: str, outcome: str, price: float):
+        """Apply a price tick to every position on a market outcome"""
+        for position_id in list(self.positions_by_outcome.get((market_id, outcome), ())):
+            self.update_price(position_id, price)
+    
+    def _index(self, position: Position):
+        value = position.value_usd
+        
+        self._adjust(position, value)
+        self._values[position.id] = value
+        self._pnls[position.id] = position.pnl_usd
+        self.unrealized_pnl += position.pnl_usd
+        self.positions_by_outcome[(position.market_id, position.outcome)].add(position.id)
+        
+        self._flag(position)
+        self._push_value(position)
+    
+    def _unindex(self, position: Position):
+        self._adjust(position, -self._values.pop(position.id, 0))
+        self.unrealized_pnl -= self._pnls.pop(position.id, 0)
+        
+        key = (position.market_id, position.outcome)
+        members = self.positions_by_outcome.get(key)
+        if members is not None:
+            members.discard(position.id)
+            if not members:
+                del self.positions_by_outcome[key]
+        
+        self.stop_loss_hits.discard(position.id)
+        self.take_profit_hits.discard(position.id)
+        self._versions.pop(position.id, None)
+        
+        if not self.positions_by_outcome:
+            # Reset accumulated float drift once flat
+            self.total_value = 0
+            self.unrealized_pnl = 0
+    
+    def _adjust(self, position: Position, delta: float):
+        self.total_value += delta
+        
+        for index, key in ((self.exposure_by_market, position.market_id),
+                           (self.exposure_by_outcome, (position.market_id, position.outcome)),
+                           (self.exposure_by_platform, position.platform),
+                           (self.exposure_by_source, position.source or "direct")):
+            index[key] += delta
+            if index[key] <= 1e-9:
+                del index[key]
+    
+    def _flag(self, position: Position):
+        if position.pnl_pct < -CONFIG.STOP_LOSS_PCT:
+            self.stop_loss_hits.add(position.id)
+        else:
+            self.stop_loss_hits.discard(position.id)
+        
+        if position.pnl_pct > CONFIG.TAKE_PROFIT_PCT:
+            self.take_profit_hits.add(position.id)
+        else:
+            self.take_profit_hits.discard(position.id)
+    
+    def _push_value(self, position: Position):
+        version = self._versions.get(position.id, 0) + 1
+        self._versions[position.id] = version
+        heapq.heappush(self._value_heap, (-position.value_usd, version, position.id))
+        
+        # Compact stale entries once they dominate the heap
+        if len(self._value_heap) > 4 * len(self.positions) + 64:
+            self._value_heap = [(-self._values[pid], self._versions[pid], pid)
+                                for pid in self.positions]
+            heapq.heapify(self._value_heap)
+    
+    def _oversized_positions(self, max_pct: float) -> List[Tuple[str, float]]:
+        """Positions above max_pct of the portfolio, largest first"""
+        limit = max_pct / 100 * max(1, self.total_value)
+        heap = self._value_heap
+        result = []
+        
+        # Walk the heap top-down, only descending below entries that breach
+        frontier = [(heap[0][0], 0)] if heap else []
+        while frontier:
+            neg_value, i = heapq.heappop(frontier)
+            _, version, position_id = heap[i]
+            stale = self._versions.get(position_id) != version
+            
+            if not stale:
+                if -neg_value <= limit:
+                    continue
+                result.append((position_id, -neg_value / max(1, self.total_value) * 100))
+            
+            for child in (2 * i + 1, 2 * i + 2):
+                if child < len(heap):
+                    heapq.heappush(frontier, (heap[child][0], child))
+        
+        return result
+    
+    def pre_trade_check(self, market_id: str, outcome: str, size_usd: float,
+                        price: Optional[float] = None) -> Optional[str]:
+        """Risk gate for a new order - returns a reason to reject
+        
+        Limit checks are constant-time; the VaR check then simulates the
+        portfolio with the order added.
+        """
+        if self.daily_pnl < -CONFIG.MAX_DAILY_LOSS_USD:
+            return f"daily loss limit reached (${self.daily_pnl:,.2f})"
+        
+        max_positions = getattr(CONFIG, "MAX_CONCURRENT_POSITIONS", None)
+        if max_positions and len(self.positions) >= max_positions:
+            return f"max concurrent positions ({max_positions}) open"
+        
+        exposure = self.exposure_by_outcome.get((market_id, outcome), 0)
+        if exposure + size_usd > CONFIG.MAX_POSITION_SIZE_USD:
+            return (f"outcome exposure ${exposure + size_usd:,.2f} would exceed "
+                    f"${CONFIG.MAX_POSITION_SIZE_USD:,.2f}")
+        
+        if self.risk:
+            if not price:
+                held = self.positions_by_outcome.get((market_id, outcome))
+                price = self.positions[next(iter(held))].current_price if held else 0.5
+            return self.risk.check_order(self.positions.values(), market_id, outcome,
+                                         size_usd, price, CONFIG.MAX_PORTFOLIO_VAR_USD)
+        
+        return None
+    
+    def simulate_risk(self) -> Optional[Dict]:
+        """VaR / expected shortfall / worst case per event of open positions"""
+        if not self.risk or not self.positions:
+            return None
+        return self.risk.simulate(self.positions.values())
     
     def check_risk_limits(self) -> List[str]:
         """Check if any risk limits are breached"""
@@ -849,17 +1553,21 @@ class PortfolioManager:
         if self.daily_pnl < -CONFIG.MAX_DAILY_LOSS_USD:
             alerts.append(f"DAILY LOSS LIMIT BREACHED: ${self.daily_pnl:,.2f}")
         
-        for pos in self.positions.values():
-            pos_pct = (pos.size_shares * pos.current_price) / max(1, self.total_value) * 100
-            
-            if pos_pct > CONFIG.MAX_POSITION_PCT:
-                alerts.append(f"POSITION SIZE LIMIT: {pos.id} at {pos_pct:.1f}%")
-            
-            if pos.pnl_pct < -CONFIG.STOP_LOSS_PCT:
-                alerts.append(f"STOP LOSS TRIGGERED: {pos.id} at {pos.pnl_pct:.1f}%")
-            
-            if pos.pnl_pct > CONFIG.TAKE_PROFIT_PCT:
-                alerts.append(f"TAKE PROFIT TRIGGERED: {pos.id} at {pos.pnl_pct:.1f}%")
+        for position_id, pos_pct in self._oversized_positions(CONFIG.MAX_POSITION_PCT):
+            alerts.append(f"POSITION SIZE LIMIT: {position_id} at {pos_pct:.1f}%")
+        
+        for position_id in self.stop_loss_hits:
+            alerts.append(f"STOP LOSS TRIGGERED: {position_id} at {self.positions[position_id].pnl_pct:.1f}%")
+        
+        for position_id in self.take_profit_hits:
+            alerts.append(f"TAKE PROFIT TRIGGERED: {position_id} at {self.positions[position_id].pnl_pct:.1f}%")
+        
+        report = self.simulate_risk()
+        if report and report["var"] > CONFIG.MAX_PORTFOLIO_VAR_USD:
+            event, worst = next(iter(report["worst_by_event"].items()))
+            alerts.append(f"PORTFOLIO VAR: ${report['var']:,.2f} "
+                          f"(ES ${report['expected_shortfall']:,.2f}, largest event {event} "
+                          f"${worst['loss']:,.2f})")
         
         return alerts
     
@@ -867,9 +1575,21 @@ class PortfolioManager:
         return {
             "total_positions": len(self.positions),
             "total_value": self.total_value,
+            "unrealized_pnl": self.unrealized_pnl,
             "daily_pnl": self.daily_pnl,
-            "positions": [asdict(p) for p in self.positions.values()]
+            "exposure": {
+                "by_market": dict(self.exposure_by_market),
+                "by_outcome": {f"{m}:{o}": v for (m, o), v in self.exposure_by_outcome.items()},
+                "by_platform": dict(self.exposure_by_platform),
+                "by_source": dict(self.exposure_by_source)
+            },
+            "stop_loss_hits": len(self.stop_loss_hits),
+            "take_profit_hits": len(self.take_profit_hits)
         }
+    
+    def get_positions(self) -> List[Dict]:
+        """Full position listing (walks every position - not for hot paths)"""
+        return [asdict(p) for p in self.positions.values()]
 
 
 # ============================================================================
@@ -884,14 +1604,49 @@ class ApolloEdge:
         self.arb_scanner = ArbitrageScanner()
         self.signal_generator = SignalGenerator()
         self.execution = ExecutionEngine()
-        self.portfolio = PortfolioManager()
+        
+        self.journal = None
+        if CONFIG.JOURNAL_FILE:
+            self.journal = Journal(
+                CONFIG.JOURNAL_FILE,
+                terminal={"positions": lambda p: p["status"] != "open"},
+                fsync_interval_ms=CONFIG.JOURNAL_FSYNC_MS
+            )
+        self.portfolio = PortfolioManager(self.journal, resolver=self._market_event)
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._cluster_refresh = None
+        self._game_anchors = None
+        self._price_watched = set()  # (market_id, outcome) streaming into the portfolio
+        self._scanning = False
+        self.execution.positions.update(self.portfolio.positions)
+        
+        # Auto-scaling driven by the cached wallet balance
+        self.auto_scaler = None
+        self.balance_feed = None
+        if CONFIG.ENABLE_AUTO_SCALING:
+            self.auto_scaler = AutoScalingManager(CONFIG)
+            self._apply_scaled_limits(CONFIG.MAX_TRADING_CAPITAL)
+            
+            wallets = [CONFIG.TRADING_WALLET_ADDRESS, CONFIG.POLYMARKET_PROXY_ADDRESS]
+            if any(wallets):
+                self.balance_feed = BalanceFeed(
+                    CONFIG.POLYGON_RPC_URL, wallets,
+                    ttl_seconds=CONFIG.BALANCE_TTL_SECONDS,
+                    threshold_usd=CONFIG.BALANCE_PUSH_THRESHOLD_USD,
+                    exposure_fn=lambda: self.portfolio.total_value
+                )
+                self.balance_feed.subscribe(self._on_balance)
         
         # Playbooks integration
         self.playbook_manager = None
+        self.playbook_shards = None
+        self._playbook_timers = None
         if ENABLE_PLAYBOOKS:
             try:
                 from playbooks import PlaybookManager
-                self.playbook_manager = PlaybookManager()
+                self.playbook_manager = PlaybookManager(
+                    PLAYBOOKS_FILE, PLAYBOOKS_STORAGE_FORMAT, PLAYBOOKS_WRITE_DELAY_MS
+                )
                 self._load_playbooks()
                 logger.info("[SUCCESS] Playbooks system enabled")
             except ImportError:
@@ -903,11 +1658,13 @@ class ApolloEdge:
             "trades_executed": 0,
             "whales_detected": 0,
             "arb_opportunities": 0,
-            "playbooks_triggered": 0
+            "playbooks_triggered": 0,
+            "clusters_detected": 0
         }
         
         # Wire up callbacks
         self.whale_detector.on_whale_detected(self._on_whale)
+        self.whale_detector.cluster_tracker.on_cluster(self._on_cluster)
         self.signal_generator.on_signal(self._on_signal)
     
     def _on_whale(self, whale: WhalePosition):
@@ -917,6 +1674,11 @@ class ApolloEdge:
         
         # Check playbooks
         if self.playbook_manager:
+            watchlists = self.playbook_manager.check_watchlists("wallets", whale.wallet)
+            if watchlists:
+                logger.info(f"[WATCHLIST] {whale.wallet[:10]}... is on "
+                            f"{', '.join(wl.name for wl in watchlists)}")
+            
             whale_data = {
                 "whale_size": whale.size_usd,
                 "whale_action": "buy",
@@ -924,37 +1686,163 @@ class ApolloEdge:
                 "market_name": whale.outcome,
                 "wallet": whale.wallet,
                 "confidence": whale.confidence,
-                "price": whale.entry_price
+                "whale_confidence": whale.confidence,  # Field name the playbooks use
+                "price": whale.entry_price,
+                "watchlisted": bool(watchlists)
             }
-            actions = self.playbook_manager.evaluate_playbooks(whale_data)
-            if actions:
-                self.stats["playbooks_triggered"] += len(actions)
-                logger.info(f"[PLAYBOOK] {len(actions)} playbook actions triggered")
+            self._evaluate_playbooks(whale_data, "whale")
         
         # Auto-snipe if enabled and size is large enough
         if whale.size_usd >= CONFIG.WHALE_ALERT_THRESHOLD_USD:
             self.execution.snipe_position(whale, follow_pct=0.1)
     
+    def _on_cluster(self, event: Dict):
+        """Handle coordinated buying by one wallet cluster"""
+        self.stats["clusters_detected"] += 1
+        logger.info(f"[CLUSTER] {event['cluster_id']}: {event['cluster_wallets_active']} wallets "
+                    f"{event['side']} {event['outcome']} (${event['total_cluster_size']:,.0f} "
+                    f"in {event['window_seconds']:.0f}s)")
+        
+        if self.playbook_manager:
+            self._evaluate_playbooks(event, "cluster")
+    
+    def _evaluate_playbooks(self, data: Dict, event_type: str):
+        """Evaluate inline, or just enqueue when playbooks are sharded"""
+        if self.playbook_shards:
+            self.playbook_shards.submit(data, event_type)
+        else:
+            actions = self.playbook_manager.evaluate_playbooks(data, event_type=event_type)
+            self._on_playbook_actions(actions, data, event_type)
+    
+    def _playbook_metrics(self) -> Dict:
+        """Per-playbook counters - the shards hold them when evaluation is sharded"""
+        if self.playbook_shards:
+            return self.playbook_shards.get_metrics()
+        return self.playbook_manager.get_metrics()
+    
+    def _on_playbook_actions(self, actions: List, data: Dict, event_type: Optional[str]):
+        if actions:
+            self.stats["playbooks_triggered"] += len(actions)
+            logger.info(f"[PLAYBOOK] {len(actions)} playbook actions triggered")
+    
+    def _on_balance(self, snapshot: Dict):
+        """Rescale limits when wallet capital moves past the threshold"""
+        logger.info(f"[BALANCE] USDC ${snapshot['usdc']:,.2f} + exposure "
+                    f"${snapshot['exposure']:,.2f}")
+        self._apply_scaled_limits(snapshot["capital"])
+    
+    def _watch_price(self, position: Position):
+        """Stream ticks for a position's token into the portfolio aggregates
+        
+        Ticks arrive on the WebSocket thread and are applied on the event loop.
+        """
+        if position.platform != "polymarket" or self._loop is None:
+            return
+        key = (position.market_id, position.outcome)
+        if key in self._price_watched:
+            return
+        self._price_watched.add(key)
+        
+        def on_tick(token_id: str, price: float, key=key):
+            if not self._loop.is_closed():
+                self._loop.call_soon_threadsafe(self.portfolio.update_market_price, *key, price)
+        
+        self.execution.polymarket.subscribe_prices(position.market_id, on_tick)
+    
+    async def _resolve_event(self, market_id: str, outcome: str):
+        """Map a market to its event for the risk model - once, off the loop"""
+        if self.portfolio.risk:
+            await asyncio.to_thread(self.portfolio.risk.resolve, market_id, outcome)
+    
+    def _market_event(self, market_id: str, outcome: str) -> Optional[Tuple[str, str]]:
+        """Event a position pays out on, for correlated risk (Polymarket metadata)
+        
+        The same metadata gives the market's end date - the "market_close"
+        anchor of TIME_BASED playbooks.
+        """
+        market = self.execution.polymarket.get_market(market_id)
+        if market and market.get("endDate") and self.playbook_manager and self._loop:
+            try:
+                close = datetime.fromisoformat(market["endDate"].replace("Z", "+00:00")).timestamp()
+            except (AttributeError, ValueError):
+                close = None
+            if close is not None:
+                data = {"market_id": market_id, "market_name": market.get("question", "")}
+                # Resolved on a worker thread - timers belong to the loop
+                self._loop.call_soon_threadsafe(self.playbook_manager.set_anchor,
+                                                "market_close", close, market_id, data)
+        return polymarket_event_key(market, market_id, outcome)
+    
+    def _apply_scaled_limits(self, capital: float):
+        scaled_limits = self.auto_scaler.calculate_limits(capital)
+        
+        CONFIG.MAX_POSITION_SIZE_USD = scaled_limits['max_position']
+        CONFIG.MAX_CONCURRENT_POSITIONS = scaled_limits['max_positions']
+        CONFIG.MAX_DAILY_SNIPES = scaled_limits['max_daily_snipes']
+        CONFIG.FOLLOW_PERCENTAGE = scaled_limits['follow_pct']
+    
     def _on_signal(self, signal: Signal):
         """Handle new trading signal"""
         self.stats["signals_generated"] += 1
         logger.info(f"[SIGNAL] {signal.signal_type} - {signal.reason}")
     
+    async def refresh_clusters(self) -> Dict:
+        """Cluster detected whales and watchlisted wallets by funding source
+        
+        Etherscan lookups run off the loop; the tracker then attributes live
+        trades from cluster members to their cluster.
+        """
+        wallets = list(self.whale_detector.detected_whales)
+        if self.playbook_manager:
+            for watchlist in list(self.playbook_manager.watchlists.values()):
+                if watchlist.watch_type == "wallets":
+                    wallets.extend(watchlist.items)
+        if not wallets:
+            return {}
+        
+        clusters = await asyncio.to_thread(self.whale_detector.find_clusters, wallets,
+                                           CONFIG.CLUSTER_TRACES_PER_REFRESH)
+        logger.info(f"[CLUSTER] {len(clusters)} clusters over "
+                    f"{len(self.whale_detector.wallet_funding)} traced wallets")
+        return clusters
+    
+    async def _run_cluster_refresh(self):
+        """Seed clusters at startup, then refresh them as new whales appear"""
+        while self.running:
+            try:
+                await self.refresh_clusters()
+            except Exception as e:
+                logger.error(f"Cluster refresh error: {e}")
+            # Until a wallet is traced, retry as soon as the scans may have found whales
+            await asyncio.sleep(CONFIG.CLUSTER_REFRESH_SECONDS if self.whale_detector.wallet_funding
+                                else CONFIG.POLL_INTERVAL_SECONDS)
+    
+    async def _watch_games(self):
+        """ESPN scoreboard -> "kickoff" / "halftime" anchors of TIME_BASED playbooks"""
+        try:
+            from live_game_arbitrage import ESPNLiveFeed
+        except ImportError as e:
+            logger.warning(f"⚠️ Live game feed unavailable, kickoff / halftime playbooks won't fire: {e}")
+            return
+        
+        feed = ESPNLiveFeed()
+        feed.on_anchor(self._on_game_anchor)
+        await feed.start(lambda event: None)  # Only the anchors are used here
+    
+    def _on_game_anchor(self, anchor: str, at: float, game_id: str, data: Dict):
+        # Halftime is stamped when it's seen - its offset 0 is due, not stale
+        self.playbook_manager.set_anchor(anchor, at, game_id, data, now=min(at, time.time()))
+    
+    def _schedule_anchors(self) -> set:
+        """Anchors the loaded TIME_BASED playbooks schedule against"""
+        from playbooks import PlaybookType
+        return {entry.get("anchor") for playbook in self.playbook_manager.playbooks.values()
+                if playbook.playbook_type == PlaybookType.TIME_BASED for entry in playbook.schedule}
+    
     async def run_scan_cycle(self):
         """Run one scan cycle"""
         
-        # Update scaled limits if auto-scaling enabled
-        if self.auto_scaler:
-            # TODO: Get actual USDC balance from wallet
-            # For now, use configured amount
-            usdc_balance = CONFIG.MAX_TRADING_CAPITAL
-            scaled_limits = self.auto_scaler.calculate_limits(usdc_balance)
-            
-            # Update config with scaled values
-            CONFIG.MAX_POSITION_SIZE_USD = scaled_limits['max_position']
-            CONFIG.MAX_CONCURRENT_POSITIONS = scaled_limits['max_positions']
-            CONFIG.MAX_DAILY_SNIPES = scaled_limits['max_daily_snipes']
-            CONFIG.FOLLOW_PERCENTAGE = scaled_limits['follow_pct']
+        # Scaled limits are pushed by the balance feed - nothing to do per cycle
         
         # Scan for whales
         whales = self.whale_detector.scan_recent_trades(CONFIG.MIN_WHALE_POSITION_USD)
@@ -965,16 +1853,22 @@ class ApolloEdge:
         
         self.stats["arb_opportunities"] += len(arb_signals)
         
-        # Execute top signals
-        all_signals = whale_signals + arb_signals
-        all_signals.sort(key=lambda s: s.strength, reverse=True)
-        
-        for signal in all_signals[:3]:  # Top 3 signals per cycle
-            if signal.strength >= 70:  # Only high-confidence signals
-                position = await self.execution.execute_signal(signal)
-                if position:
-                    self.portfolio.add_position(position)
-                    self.stats["trades_executed"] += 1
+        # Execute scheduled signals (carried over between cycles) within budget
+        for signal in self.signal_generator.signal_queue.drain():
+            await self._resolve_event(signal.market_id, signal.outcome)
+            reason = self.portfolio.pre_trade_check(
+                signal.market_id, signal.outcome, signal.size_usd,
+                price=signal.metadata.get("whale", {}).get("entry_price")
+            )
+            if reason:
+                logger.info(f"[RISK] Skipping {signal.id}: {reason}")
+                continue
+            
+            position = await self.execution.execute_signal(signal)
+            if position:
+                self.portfolio.add_position(position)
+                self._watch_price(position)
+                self.stats["trades_executed"] += 1
         
         # Check risk limits
         alerts = self.portfolio.check_risk_limits()
@@ -986,17 +1880,66 @@ class ApolloEdge:
         self.running = True
         logger.info("[STARTING] Apollo Edge launching...")
         
-        while self.running:
-            try:
-                await self.run_scan_cycle()
-                await asyncio.sleep(CONFIG.POLL_INTERVAL_SECONDS)
-            except Exception as e:
-                logger.error(f"Scan cycle error: {e}")
-                await asyncio.sleep(5)
+        # DNS + TLS to CLOB / Gamma / ESPN / Etherscan before the first scan
+        await asyncio.get_running_loop().run_in_executor(None, prewarm)
+        
+        # Live marks for open positions (restored ones included)
+        self._loop = asyncio.get_running_loop()
+        for position in list(self.portfolio.positions.values()):
+            self._watch_price(position)
+        await asyncio.gather(*(self._resolve_event(p.market_id, p.outcome)
+                               for p in list(self.portfolio.positions.values())))
+        
+        if self.balance_feed:
+            self.balance_feed.start()
+        
+        self._cluster_refresh = asyncio.create_task(self._run_cluster_refresh())
+        
+        # Cooldown re-arms, expiries and TIME_BASED playbooks
+        if self.playbook_manager:
+            self._playbook_timers = asyncio.create_task(
+                self.playbook_manager.run_timers(lambda: self.running, self._on_playbook_actions)
+            )
+            if self._schedule_anchors() & {"kickoff", "halftime"}:
+                self._game_anchors = asyncio.create_task(self._watch_games())
+            
+            # Large playbook sets: evaluate on worker processes, off the whale callback
+            if PLAYBOOKS_SHARD_WORKERS and not self.playbook_shards:
+                from playbook_shards import ShardedEvaluator
+                self.playbook_shards = ShardedEvaluator(
+                    self.playbook_manager, PLAYBOOKS_SHARD_WORKERS, PLAYBOOKS_SHARD_DEADLINE_MS
+                )
+                self.playbook_shards.on_actions(self._on_playbook_actions)
+                self.playbook_shards.start(asyncio.get_running_loop())
+        
+        self._scanning = True
+        try:
+            while self.running:
+                try:
+                    await self.run_scan_cycle()
+                    await asyncio.sleep(CONFIG.POLL_INTERVAL_SECONDS)
+                except Exception as e:
+                    logger.error(f"Scan cycle error: {e}")
+                    await asyncio.sleep(5)
+        finally:
+            # The scan loop is the journal's writer - close only once it has exited
+            self._scanning = False
+            if self.journal:
+                self.journal.close()
     
     def stop(self):
         """Stop the trading system"""
         self.running = False
+        if self.balance_feed:
+            self.balance_feed.stop()
+        if self.journal and not self._scanning:  # Otherwise start() closes it on the way out
+            self.journal.close()
+        if self.playbook_shards:
+            self.playbook_shards.stop()
+        if self.playbook_manager:
+            if PLAYBOOKS_METRICS_FILE:
+                self.playbook_manager.dump_metrics(PLAYBOOKS_METRICS_FILE, self._playbook_metrics())
+            self.playbook_manager.close()
         logger.info("Apollo Edge stopped")
     
     def _load_playbooks(self):
@@ -1024,6 +1967,11 @@ class ApolloEdge:
             "running": self.running,
             "stats": self.stats,
             "portfolio": self.portfolio.get_summary(),
+            "signal_scheduler": self.signal_generator.signal_queue.get_stats(),
+            "journal": self.journal.get_stats() if self.journal else None,
+            "balance": self.balance_feed.get_stats() if self.balance_feed else None,
+            "clusters": self.whale_detector.cluster_tracker.get_stats(),
+            "transport": transport_stats(),
             "config": asdict(CONFIG)
         }
         
@@ -1032,7 +1980,9 @@ class ApolloEdge:
                 "enabled": True,
                 "loaded": len(self.playbook_manager.playbooks),
                 "watchlists": len(self.playbook_manager.watchlists),
-                "signals_queued": len(self.playbook_manager.signal_queue)
+                "signals_queued": len(self.playbook_manager.signal_queue),
+                "metrics": self._playbook_metrics(),
+                "shards": self.playbook_shards.get_stats() if self.playbook_shards else None
             }
         
         return status
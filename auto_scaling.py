@@ -15,11 +15,19 @@ USAGE:
     ENABLE_AUTO_SCALING = True
     
     # System automatically adjusts when you add funds!
+    
+    feed = BalanceFeed(POLYGON_RPC_URL, [TRADING_WALLET_ADDRESS])
+    feed.subscribe(lambda snapshot: scaler.calculate_limits(snapshot["capital"]))
+    feed.start()
 """
 
-from typing import Dict
+import time
+import threading
+from typing import Callable, Dict, List, Optional
 import logging
 
+from transport import http_session
+
 logger = logging.getLogger('AutoScaling')
 
 
@@ -124,6 +132,142 @@ class AutoScalingManager:
         return self.scaled_limits
 
 
+class BalanceFeed:
+    """Cached wallet USDC balance read through batched eth_calls
+    
+    Native USDC and bridged USDC.e for every wallet are fetched in one
+    JSON-RPC batch. The result is cached for `ttl_seconds` and refreshed on
+    a background thread; subscribers only hear about it when capital moves
+    by at least `threshold_usd`.
+    """
+    
+    USDC_NATIVE = "0x3c499c542cEF5E3811e1192ce70d8cC03d5c3359"
+    USDC_BRIDGED = "0x2791Bca1f2de4661ED88A30C99A7a9449Aa84174"
+    BALANCE_OF = "0x70a08231"  # balanceOf(address)
+    DECIMALS = 1e6
+    
+    def __init__(self, rpc_url: str, wallets: List[str], ttl_seconds: float = 15,
+                 threshold_usd: float = 10, exposure_fn: Optional[Callable[[], float]] = None,
+                 timeout: float = 5):
+        self.rpc_url = rpc_url
+        self.wallets = [w for w in wallets if w]
+        self.ttl_seconds = ttl_seconds
+        self.threshold_usd = threshold_usd
+        self.exposure_fn = exposure_fn  # USD tied up in open positions
+        self.timeout = timeout
+        
+        self.session = http_session()
+        self.snapshot: Dict = {}
+        self.last_pushed: Optional[float] = None
+        self.callbacks: List[Callable[[Dict], None]] = []
+        
+        self._lock = threading.Lock()
+        self._running = False
+        self.stats = {"rpc_batches": 0, "rpc_errors": 0, "pushes": 0}
+    
+    def subscribe(self, callback: Callable[[Dict], None]):
+        """Get snapshots whenever capital moves past the threshold"""
+        self.callbacks.append(callback)
+    
+    def get_balance(self) -> Dict:
+        """Cached snapshot (fetched only on first use or once the TTL lapses)"""
+        if not self.snapshot or time.time() - self.snapshot["updated_at"] > self.ttl_seconds:
+            self.refresh()
+        return self.snapshot
+    
+    def refresh(self) -> Dict:
+        """Fetch balances now and push if capital moved enough"""
+        balances = self._fetch_usdc()
+        if balances is None:
+            return self.snapshot  # Keep the last good reading
+        
+        native, bridged = balances
+        exposure = self.exposure_fn() if self.exposure_fn else 0
+        
+        with self._lock:
+            self.snapshot = {
+                "usdc_native": native,
+                "usdc_bridged": bridged,
+                "usdc": native + bridged,
+                "exposure": exposure,
+                "capital": native + bridged + exposure,
+                "updated_at": time.time()
+            }
+            capital = self.snapshot["capital"]
+            push = self.last_pushed is None or abs(capital - self.last_pushed) >= self.threshold_usd
+            if push:
+                self.last_pushed = capital
+        
+        if push:
+            self.stats["pushes"] += 1
+            for callback in self.callbacks:
+                try:
+                    callback(self.snapshot)
+                except Exception as e:
+                    logger.error(f"[BALANCE] Subscriber error: {e}")
+        
+        return self.snapshot
+    
+    def _fetch_usdc(self) -> Optional[tuple]:
+        """(native, bridged) USDC across all wallets in one RPC round trip"""
+        if not self.wallets:
+            return None
+        
+        calls = []
+        for wallet in self.wallets:
+            data = self.BALANCE_OF + wallet.lower().replace("0x", "").rjust(64, "0")
+            for token in (self.USDC_NATIVE, self.USDC_BRIDGED):
+                calls.append({
+                    "jsonrpc": "2.0",
+                    "id": len(calls),
+                    "method": "eth_call",
+                    "params": [{"to": token, "data": data}, "latest"]
+                })
+        
+        try:
+            resp = self.session.post(self.rpc_url, json=calls, timeout=self.timeout)
+            results = resp.json()
+            self.stats["rpc_batches"] += 1
+        except Exception as e:
+            self.stats["rpc_errors"] += 1
+            logger.warning(f"[BALANCE] RPC batch failed: {e}")
+            return None
+        
+        if not isinstance(results, list):
+            self.stats["rpc_errors"] += 1
+            logger.warning(f"[BALANCE] Unexpected RPC response: {results}")
+            return None
+        
+        totals = [0.0, 0.0]
+        for result in results:
+            if "result" not in result:
+                self.stats["rpc_errors"] += 1
+                logger.warning(f"[BALANCE] eth_call error: {result.get('error')}")
+                return None
+            totals[result["id"] % 2] += int(result["result"] or "0x0", 16) / self.DECIMALS
+        
+        return totals[0], totals[1]
+    
+    def start(self):
+        """Refresh every TTL on a background thread"""
+        if self._running:
+            return
+        self._running = True
+        
+        def loop():
+            while self._running:
+                self.refresh()
+                time.sleep(self.ttl_seconds)
+        
+        threading.Thread(target=loop, name="balance-feed", daemon=True).start()
+    
+    def stop(self):
+        self._running = False
+    
+    def get_stats(self) -> Dict:
+        return {**self.stats, "snapshot": self.snapshot, "last_pushed": self.last_pushed}
+
+
 def get_scaled_config(config, usdc_balance: float):
     """
     Get config with auto-scaled values based on balance
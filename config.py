@@ -174,6 +174,14 @@ STOP_LOSS_PCT = 15.0  # Exit at -15%
 # Take profit: close position if up this much (percentage)
 TAKE_PROFIT_PCT = 50.0  # Exit at +50%
 
+# Whale sniper order/position journal - set a path (e.g. "whale_sniper.journal")
+# so a restart resumes open positions ("" = off)
+WHALE_SNIPER_JOURNAL_FILE = ""
+
+# Apollo Edge position journal - set a path (e.g. "apollo_edge.journal") so a
+# restart restores open positions and the daily P&L ("" = off)
+APOLLO_EDGE_JOURNAL_FILE = ""
+
 # Maximum portfolio allocation per position (percentage)
 MAX_POSITION_PCT = 20.0  # No more than 20% in single position
 
@@ -265,6 +273,21 @@ ENABLE_PLAYBOOKS = True
 # Where to store playbook data
 PLAYBOOKS_FILE = "playbooks.json"
 
+# "json" = atomic full snapshot, "log" = incremental journal (large watchlists)
+PLAYBOOKS_STORAGE_FORMAT = "json"
+
+# Edits are batched and written this long after the first change
+PLAYBOOKS_WRITE_DELAY_MS = 250
+
+# Per-playbook evaluation metrics are written here on shutdown ("" = off)
+PLAYBOOKS_METRICS_FILE = "playbook_metrics.json"
+
+# Evaluate playbooks on this many worker processes (0 = inline in the whale
+# callback). Pays off past ~10k playbooks; matches arriving after the
+# deadline are still applied but counted as late
+PLAYBOOKS_SHARD_WORKERS = 0
+PLAYBOOKS_SHARD_DEADLINE_MS = 50
+
 # Auto-load these preset playbooks on startup
 # Focused on core features: Whale Detection, Cluster Analysis, Value Detection, NFL Props
 
@@ -343,11 +366,28 @@ PERFORMANCE_LOG_INTERVAL = 3600  # Log stats every hour
 ENABLE_LIVE_GAME_DETECTION = True
 
 # Live game polling (check ESPN every second for TDs, injuries, etc.)
-LIVE_GAME_POLL_MS = 1000  # Check every second
+LIVE_GAME_POLL_MS = 1000  # Check every second while a game is in play
+LIVE_GAME_FAST_POLL_MS = 500  # Red zone, two-minute drill, overtime
+LIVE_GAME_PREGAME_POLL_MS = 15000  # Kickoff within the window below / halftime
+LIVE_GAME_IDLE_POLL_MS = 300000  # Nothing live or about to start
+LIVE_GAME_PREGAME_WINDOW_MINUTES = 30
+
+# Cap on ESPN requests (scoreboard + play-by-play) across all pollers
+ESPN_REQUEST_BUDGET_PER_HOUR = 7200
 
 # Minimum edge to execute live arbitrage
 LIVE_GAME_MIN_EDGE_PCT = 5.0  # 5% minimum edge
 
+# Fair value per event: win probability table built offline with
+# `python win_probability.py --build <play-by-play.csv>` (analytic surface if missing)
+WIN_PROBABILITY_TABLE = "win_probability.npz"
+
+# How long books take to re-price after an event (the arbitrage window)
+LIVE_GAME_BOOK_LAG_SECONDS = 10.0
+
+# How often games not yet matched to a Polymarket moneyline market are looked up again
+LIVE_GAME_MARKET_REFRESH_SECONDS = 300
+
 # Event detection timeout (aggressive for speed)
 EVENT_DETECTION_TIMEOUT_MS = 2000  # 2 second max
 
@@ -360,6 +400,8 @@ USE_CONNECTION_POOL = True
 CONNECTION_POOL_SIZE = 50
 ENABLE_DNS_CACHE = True
 DNS_CACHE_TTL_SECONDS = 300
+TRANSPORT_KEEP_WARM_SECONDS = 30  # Re-touch idle hosts so pooled connections stay open (0 = off)
+TRANSPORT_GLOBAL_DNS_CACHE = False  # Also cache requests lookups by patching socket.getaddrinfo process-wide
 
 # Aggressive execution (for arbitrage windows)
 ARBITRAGE_MODE_RETRIES = 1  # Only 1 retry (speed over reliability)
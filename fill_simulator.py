@@ -0,0 +1,475 @@
+#!/usr/bin/env python3
+"""
+PAPER FILL SIMULATOR - Order Book Replay
+=========================================
+Matches paper orders against recorded or mirrored order-book snapshots
+instead of fabricating fills.
+
+FEATURES:
+- Walks the book level by level (partial fills, real slippage)
+- Queue position for resting limit orders
+- Arrival delayed by our measured submit latency
+- Our own fills consume liquidity for later orders on the same snapshot
+- Thousands of simulated orders per second during replays
+
+USAGE:
+    from fill_simulator import FillSimulator
+
+    sim = FillSimulator()
+    sim.load_recording("books.jsonl")          # Replay recorded snapshots
+    sim.mirror(token_id)                       # Or mirror the live CLOB book
+
+    fill = sim.submit("order_1", token_id, "buy", size_usd=50, limit_price=0.52)
+    print(fill.status, fill.avg_price, fill.filled_shares)
+
+    python fill_simulator.py --record books.jsonl --token <id>   # Record books
+    python fill_simulator.py --bench books.jsonl                 # Replay speed
+"""
+
+import json
+import time
+import random
+import bisect
+from collections import deque
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional, Tuple
+import logging
+
+from transport import http_session
+
+logger = logging.getLogger('FillSimulator')
+
+
+CLOB_API = "https://clob.polymarket.com"
+
+
+# ============================================================================
+# DATA STRUCTURES
+# ============================================================================
+
+@dataclass
+class BookSnapshot:
+    """Order book at one instant (levels best-first)"""
+    timestamp: float                       # Epoch seconds
+    bids: List[Tuple[float, float]]        # (price, shares), highest first
+    asks: List[Tuple[float, float]]        # (price, shares), lowest first
+
+    @classmethod
+    def from_clob(cls, book: Dict, timestamp: Optional[float] = None) -> "BookSnapshot":
+        """Build from a CLOB /book response"""
+        if timestamp is None:
+            ts = book.get("timestamp")
+            timestamp = float(ts) / 1000 if ts else time.time()
+
+        bids = [(float(l["price"]), float(l["size"])) for l in book.get("bids", [])]
+        asks = [(float(l["price"]), float(l["size"])) for l in book.get("asks", [])]
+        bids.sort(key=lambda l: -l[0])
+        asks.sort(key=lambda l: l[0])
+
+        return cls(timestamp=timestamp, bids=bids, asks=asks)
+
+    def to_dict(self) -> Dict:
+        return {"timestamp": self.timestamp, "bids": self.bids, "asks": self.asks}
+
+    @property
+    def best_bid(self) -> Optional[float]:
+        return self.bids[0][0] if self.bids else None
+
+    @property
+    def best_ask(self) -> Optional[float]:
+        return self.asks[0][0] if self.asks else None
+
+
+@dataclass
+class SimulatedFill:
+    """Result of a simulated order"""
+    order_id: str
+    token_id: str
+    side: str                   # buy, sell
+    requested_shares: float
+    limit_price: Optional[float]
+    submitted_at: float
+    arrival_at: float
+    filled_shares: float = 0
+    notional_usd: float = 0
+    status: str = "unfilled"    # filled, partial, resting, unfilled
+    queue_ahead: float = 0      # Shares ahead of us while resting
+    fills: List[Tuple[float, float]] = field(default_factory=list)
+
+    @property
+    def avg_price(self) -> Optional[float]:
+        if self.filled_shares <= 0:
+            return None
+        return self.notional_usd / self.filled_shares
+
+    @property
+    def remaining_shares(self) -> float:
+        return max(0.0, self.requested_shares - self.filled_shares)
+
+    @property
+    def latency_ms(self) -> float:
+        return (self.arrival_at - self.submitted_at) * 1000
+
+    def _add(self, price: float, shares: float):
+        self.fills.append((price, shares))
+        self.filled_shares += shares
+        self.notional_usd += price * shares
+
+
+# ============================================================================
+# LATENCY MODEL
+# ============================================================================
+
+class LatencyModel:
+    """Submit latency sampled from our own measured round trips"""
+
+    def __init__(self, default_ms: float = 50, maxlen: int = 1000, seed: Optional[int] = None):
+        self.default_ms = default_ms
+        self.samples_ms = deque(maxlen=maxlen)
+        self._rng = random.Random(seed)
+
+    def record(self, ms: float):
+        """Record a measured live submit latency"""
+        self.samples_ms.append(ms)
+
+    def sample_ms(self) -> float:
+        if not self.samples_ms:
+            return self.default_ms
+        return self.samples_ms[self._rng.randrange(len(self.samples_ms))]
+
+
+# ============================================================================
+# FILL SIMULATOR
+# ============================================================================
+
+class FillSimulator:
+    """Matches paper orders against order-book snapshots"""
+
+    def __init__(self, latency: Optional[LatencyModel] = None, max_snapshots: int = 10000):
+        self.latency = latency or LatencyModel()
+        self.max_snapshots = max_snapshots
+
+        # token_id -> parallel lists of timestamps and snapshots
+        self._times: Dict[str, List[float]] = {}
+        self._books: Dict[str, List[BookSnapshot]] = {}
+
+        # (token_id, snapshot index) -> {(side, price): shares we already took}
+        self._consumed: Dict[Tuple[str, int], Dict[Tuple[str, float], float]] = {}
+
+        # Resting limit orders per token
+        self.resting: Dict[str, List[SimulatedFill]] = {}
+
+        self._session = None
+        self._recording = None
+
+        self.stats = {
+            "orders": 0,
+            "filled": 0,
+            "partial": 0,
+            "resting": 0,
+            "unfilled": 0,
+            "no_book": 0
+        }
+
+    # ========================================================================
+    # BOOK SOURCES
+    # ========================================================================
+
+    def has_book(self, token_id: str) -> bool:
+        return bool(self._books.get(token_id))
+
+    def add_snapshot(self, token_id: str, snapshot: BookSnapshot):
+        """Add a snapshot (recorded or mirrored) for a token"""
+        times = self._times.setdefault(token_id, [])
+        books = self._books.setdefault(token_id, [])
+
+        if not times or snapshot.timestamp >= times[-1]:
+            times.append(snapshot.timestamp)
+            books.append(snapshot)
+            index = len(books) - 1
+        else:
+            index = bisect.bisect_right(times, snapshot.timestamp)
+            times.insert(index, snapshot.timestamp)
+            books.insert(index, snapshot)
+            self._consumed = {k: v for k, v in self._consumed.items() if k[0] != token_id}
+
+        if self._recording:
+            self._recording.write(json.dumps({"token_id": token_id, **snapshot.to_dict()}) + "\n")
+
+        # Trim in live mirroring - replays are loaded with an unbounded history
+        if len(books) > self.max_snapshots:
+            drop = len(books) - self.max_snapshots
+            del times[:drop]
+            del books[:drop]
+            self._consumed = {k: v for k, v in self._consumed.items() if k[0] != token_id}
+            index -= drop
+
+        self._update_resting(token_id, index)
+
+    def mirror(self, token_id: str, book: Optional[Dict] = None) -> bool:
+        """Mirror the live CLOB book (fetched if not supplied)"""
+        if book is None:
+            try:
+                if self._session is None:
+                    self._session = http_session()
+                resp = self._session.get(f"{CLOB_API}/book",
+                                         params={"token_id": token_id}, timeout=5)
+                if resp.status_code != 200:
+                    return False
+                book = resp.json()
+            except Exception as e:
+                logger.debug(f"Book mirror failed for {token_id[:16]}: {e}")
+                return False
+
+        if not book or not (book.get("bids") or book.get("asks")):
+            return False
+
+        self.add_snapshot(token_id, BookSnapshot.from_clob(book, timestamp=time.time()))
+        return True
+
+    def load_recording(self, path: str) -> int:
+        """Load recorded snapshots (JSON lines with token_id, timestamp, bids, asks)"""
+        count = 0
+        saved_max, self.max_snapshots = self.max_snapshots, float("inf")
+
+        with open(path, "r") as f:
+            for line in f:
+                if not line.strip():
+                    continue
+                row = json.loads(line)
+                self.add_snapshot(row["token_id"], BookSnapshot(
+                    timestamp=float(row["timestamp"]),
+                    bids=[tuple(l) for l in row["bids"]],
+                    asks=[tuple(l) for l in row["asks"]]
+                ))
+                count += 1
+
+        self.max_snapshots = saved_max
+        logger.info(f"Loaded {count} book snapshots from {path}")
+        return count
+
+    def start_recording(self, path: str):
+        """Append every snapshot added from now on to a recording file"""
+        self._recording = open(path, "a", buffering=1)
+
+    def stop_recording(self):
+        if self._recording:
+            self._recording.close()
+            self._recording = None
+
+    # ========================================================================
+    # MATCHING
+    # ========================================================================
+
+    def submit(self, order_id: str, token_id: str, side: str,
+               size_usd: Optional[float] = None, size_shares: Optional[float] = None,
+               limit_price: Optional[float] = None,
+               submitted_at: Optional[float] = None) -> SimulatedFill:
+        """Simulate an order arriving after our submit latency
+
+        Buys are sized in USD (converted to shares level by level) unless
+        size_shares is given; sells are sized in shares. A limit_price of
+        None is a market order.
+        """
+        submitted_at = time.time() if submitted_at is None else submitted_at
+        arrival_at = submitted_at + self.latency.sample_ms() / 1000
+
+        fill = SimulatedFill(
+            order_id=order_id,
+            token_id=token_id,
+            side=side,
+            requested_shares=size_shares or 0,
+            limit_price=limit_price,
+            submitted_at=submitted_at,
+            arrival_at=arrival_at
+        )
+        self.stats["orders"] += 1
+
+        index = self._snapshot_index(token_id, arrival_at)
+        if index is None:
+            self.stats["no_book"] += 1
+            return fill
+
+        book = self._books[token_id][index]
+        consumed = self._consumed.setdefault((token_id, index), {})
+        levels = book.asks if side == "buy" else book.bids
+
+        if side == "sell" and size_shares is None:
+            # Sells are sized in shares - convert a USD size at the touch
+            ref_price = book.best_bid or limit_price
+            size_shares = size_usd / ref_price if ref_price else 0
+            fill.requested_shares = size_shares
+
+        budget_usd = size_usd if (side == "buy" and size_shares is None) else None
+        remaining = size_shares if budget_usd is None else None
+
+        for price, shares in levels:
+            if limit_price is not None:
+                if side == "buy" and price > limit_price:
+                    break
+                if side == "sell" and price < limit_price:
+                    break
+
+            key = (side, price)
+            available = shares - consumed.get(key, 0)
+            if available <= 0:
+                continue
+
+            if budget_usd is not None:
+                take = min(available, budget_usd / price)
+                budget_usd -= take * price
+            else:
+                take = min(available, remaining)
+                remaining -= take
+
+            fill._add(price, take)
+            consumed[key] = consumed.get(key, 0) + take
+
+            if (budget_usd is not None and budget_usd <= 1e-9) or (remaining is not None and remaining <= 1e-9):
+                break
+
+        if budget_usd is not None:
+            # Express the unspent budget in shares at the limit (or last) price
+            ref_price = limit_price or (fill.fills[-1][0] if fill.fills else book.best_ask)
+            leftover = budget_usd / ref_price if ref_price else 0
+            fill.requested_shares = fill.filled_shares + leftover
+
+        if fill.remaining_shares <= 1e-9:
+            fill.status = "filled"
+        elif limit_price is not None:
+            # Remainder rests at our limit behind the displayed queue
+            same_side = book.bids if side == "buy" else book.asks
+            fill.queue_ahead = sum(s for p, s in same_side if p == limit_price)
+            fill.status = "resting"
+            self.resting.setdefault(token_id, []).append(fill)
+        elif fill.filled_shares > 0:
+            fill.status = "partial"
+
+        self.stats[fill.status] += 1
+        return fill
+
+    def cancel(self, fill: SimulatedFill):
+        """Cancel a resting order (keeps any partial fill)"""
+        orders = self.resting.get(fill.token_id, [])
+        if fill in orders:
+            orders.remove(fill)
+            fill.status = "partial" if fill.filled_shares > 0 else "unfilled"
+
+    def _snapshot_index(self, token_id: str, at: float) -> Optional[int]:
+        """Latest snapshot at or before `at` (earliest one if we arrive first)"""
+        times = self._times.get(token_id)
+        if not times:
+            return None
+        index = bisect.bisect_right(times, at) - 1
+        return max(0, index)
+
+    def _update_resting(self, token_id: str, index: int):
+        """Advance resting orders against a newly added snapshot"""
+        orders = self.resting.get(token_id)
+        if not orders or index <= 0:
+            return
+
+        books = self._books[token_id]
+        book, prev = books[index], books[index - 1]
+
+        for fill in list(orders):
+            if book.timestamp < fill.arrival_at:
+                continue
+
+            price = fill.limit_price
+            if fill.side == "buy":
+                crossing = [(p, s) for p, s in book.asks if p <= price]
+                before = sum(s for p, s in prev.bids if p == price)
+                now = sum(s for p, s in book.bids if p == price)
+            else:
+                crossing = [(p, s) for p, s in book.bids if p >= price]
+                before = sum(s for p, s in prev.asks if p == price)
+                now = sum(s for p, s in book.asks if p == price)
+
+            # Opposite side traded through our price - we are filled at our limit
+            for _, shares in crossing:
+                take = min(shares, fill.remaining_shares)
+                fill._add(price, take)
+                if fill.remaining_shares <= 1e-9:
+                    break
+
+            # Depletion at our level consumes the queue ahead of us first
+            if fill.remaining_shares > 1e-9 and now < before:
+                fill.queue_ahead -= before - now
+                if fill.queue_ahead < 0:
+                    take = min(-fill.queue_ahead, fill.remaining_shares)
+                    fill._add(price, take)
+                    fill.queue_ahead = 0
+
+            if fill.remaining_shares <= 1e-9:
+                fill.status = "filled"
+                orders.remove(fill)
+
+    def get_stats(self) -> Dict:
+        return {
+            **self.stats,
+            "tokens": len(self._books),
+            "snapshots": sum(len(b) for b in self._books.values()),
+            "resting_orders": sum(len(o) for o in self.resting.values()),
+            "latency_samples": len(self.latency.samples_ms)
+        }
+
+
+# ============================================================================
+# CLI
+# ============================================================================
+
+def main():
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Paper Fill Simulator")
+    parser.add_argument("--record", type=str, help="Record mirrored books to file")
+    parser.add_argument("--token", type=str, action="append", help="Token id to record")
+    parser.add_argument("--interval", type=float, default=1.0, help="Record interval (s)")
+    parser.add_argument("--bench", type=str, help="Replay benchmark over a recording")
+    parser.add_argument("--orders", type=int, default=10000, help="Orders for benchmark")
+
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s [%(levelname)s] %(message)s')
+
+    sim = FillSimulator()
+
+    if args.record and args.token:
+        print(f"[*] Recording {len(args.token)} books to {args.record} (Ctrl+C to stop)")
+        sim.start_recording(args.record)
+        try:
+            while True:
+                for token in args.token:
+                    sim.mirror(token)
+                time.sleep(args.interval)
+        except KeyboardInterrupt:
+            sim.stop_recording()
+            print(f"\n[*] Recorded {sim.get_stats()['snapshots']} snapshots")
+
+    elif args.bench:
+        sim.load_recording(args.bench)
+        tokens = list(sim._books.keys())
+        if not tokens:
+            print("[!] Recording is empty")
+            return
+
+        rng = random.Random(7)
+        start = time.perf_counter()
+        for i in range(args.orders):
+            token = tokens[i % len(tokens)]
+            times = sim._times[token]
+            sim.submit(f"bench_{i}", token, rng.choice(["buy", "sell"]),
+                       size_usd=rng.uniform(10, 500), size_shares=None,
+                       submitted_at=rng.uniform(times[0], times[-1]))
+        elapsed = time.perf_counter() - start
+
+        print(f"[*] {args.orders} orders in {elapsed:.3f}s "
+              f"({args.orders / elapsed:,.0f} orders/s)")
+        print(json.dumps(sim.get_stats(), indent=2))
+
+    else:
+        parser.print_help()
+
+
+if __name__ == "__main__":
+    main()
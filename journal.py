@@ -0,0 +1,456 @@
+#!/usr/bin/env python3
+"""
+STATE JOURNAL - Crash-Safe Order & Position Log
+================================================
+Append-only binary journal of order, fill and position events so a
+restart mid-game picks up exactly where the bot left off.
+
+FEATURES:
+- Length + CRC framed records (torn tail writes are detected and dropped)
+- Group-committed fsyncs on a background thread (appends never block on disk)
+- Startup replay from a memory-mapped file
+- Periodic compaction down to live state (open positions, today's orders)
+
+USAGE:
+    from journal import Journal, to_record, from_record
+
+    journal = Journal("whale_sniper.journal",
+                      terminal={"positions": lambda p: p["status"] != "open"})
+    journal.put("positions", pos.id, to_record(pos))
+    journal.delete("positions", pos.id)
+
+    for key, record in journal.table("positions").items():
+        pos = from_record(Position, record)
+
+    journal.close()                                    # Flush + fsync
+
+    python journal.py --dump whale_sniper.journal      # Inspect a journal
+    python journal.py --bench 200000                   # Replay speed
+"""
+
+import os
+import json
+import mmap
+import time
+import zlib
+import struct
+import threading
+from dataclasses import asdict, fields, is_dataclass
+from datetime import datetime
+from typing import Callable, Dict, List, Optional, Tuple
+import logging
+
+logger = logging.getLogger('Journal')
+
+
+# Frame: body length, CRC32 of everything after it, op, timestamp,
+# table/key lengths - followed by table, key and the JSON record.
+# Replay only needs the header, so records are decoded lazily.
+HEADER = struct.Struct("<IIBdBH")
+OP_PUT = 1
+OP_DELETE = 2
+
+MAGIC = b"APJRNL1\n"
+
+
+# ============================================================================
+# RECORD HELPERS
+# ============================================================================
+
+def to_record(obj) -> Dict:
+    """Dataclass -> JSON-safe dict (datetimes as ISO strings)"""
+    record = asdict(obj) if is_dataclass(obj) else dict(obj)
+    for key, value in record.items():
+        if isinstance(value, datetime):
+            record[key] = value.isoformat()
+    return record
+
+
+def from_record(cls, record: Dict):
+    """JSON dict -> dataclass, parsing datetime fields back"""
+    kwargs = {}
+    for f in fields(cls):
+        if f.name not in record:
+            continue
+        value = record[f.name]
+        if isinstance(value, str) and f.type in (datetime, Optional[datetime]):
+            value = datetime.fromisoformat(value)
+        kwargs[f.name] = value
+    return cls(**kwargs)
+
+
+# ============================================================================
+# JOURNAL
+# ============================================================================
+
+class Journal:
+    """Append-only key/value event log with replayed in-memory tables
+
+    Every put/delete is framed and queued; a writer thread writes and
+    fsyncs the queue in one go every `fsync_interval_ms` (group commit).
+    Tables hold the latest frame per key, so compaction is a straight
+    rewrite of live frames.
+
+    `_lock` guards the tables and the queue and is only held for list
+    swaps; file writes, fsyncs and compaction run under `_write_lock`, so
+    put() / delete() never wait on the disk.
+    """
+
+    def __init__(self, path: str, terminal: Optional[Dict[str, Callable[[Dict], bool]]] = None,
+                 retain_hours: float = 24, fsync_interval_ms: int = 50,
+                 compact_min_bytes: int = 4 * 1024 * 1024):
+        self.path = path
+        self.terminal = terminal or {}            # table -> record is finished
+        self.retain_seconds = retain_hours * 3600
+        self.fsync_interval = fsync_interval_ms / 1000
+        self.compact_min_bytes = compact_min_bytes
+
+        # table -> key -> (frame bytes, record or None until decoded, timestamp)
+        self._tables: Dict[str, Dict[str, Tuple[bytes, Optional[Dict], float]]] = {}
+        self._pending: List[bytes] = []
+        self._lock = threading.Lock()
+        self._write_lock = threading.Lock()  # File I/O (flush vs compaction)
+        self._wakeup = threading.Condition(self._lock)
+        self._synced = threading.Condition(self._lock)
+        self._seq = 0          # Frames queued
+        self._durable = 0      # Frames fsynced
+        self._closed = False
+
+        self.stats = {
+            "replayed": 0, "torn_bytes": 0, "replay_ms": 0.0,
+            "appends": 0, "fsyncs": 0, "compactions": 0
+        }
+
+        self._replay()
+        self._file = open(self.path, "ab")
+        self._size = self._file.tell()
+        self._live_bytes = len(MAGIC) + sum(
+            len(entry[0]) for entries in self._tables.values() for entry in entries.values()
+        )
+
+        self._writer = threading.Thread(target=self._write_loop, name="journal-writer", daemon=True)
+        self._writer.start()
+
+    # ------------------------------------------------------------------
+    # Public API
+    # ------------------------------------------------------------------
+
+    def put(self, table: str, key: str, record: Dict):
+        """Record the latest state of `key` (returns immediately)"""
+        ts = time.time()
+        frame = self._frame(OP_PUT, table, key, record, ts)
+        with self._lock:
+            entries = self._tables.setdefault(table, {})
+            old = entries.get(key)
+            entries[key] = (frame, record, ts)
+            self._live_bytes += len(frame) - (len(old[0]) if old else 0)
+            self._queue(frame)
+
+    def delete(self, table: str, key: str):
+        """Forget `key` - it will not come back on replay"""
+        frame = self._frame(OP_DELETE, table, key, None, time.time())
+        with self._lock:
+            old = self._tables.get(table, {}).pop(key, None)
+            if old:
+                self._live_bytes -= len(old[0])
+            self._queue(frame)
+
+    def get(self, table: str, key: str) -> Optional[Dict]:
+        with self._lock:
+            return self._record(table, key)
+
+    def table(self, table: str) -> Dict[str, Dict]:
+        """Current records of a table (replayed ones decoded in one pass)"""
+        with self._lock:
+            entries = self._tables.get(table, {})
+            pending = [key for key, entry in entries.items() if entry[1] is None]
+            if pending:
+                records = json.loads(b"[" + b",".join(self._payload(entries[key][0]) for key in pending) + b"]")
+                for key, record in zip(pending, records):
+                    frame, _, ts = entries[key]
+                    entries[key] = (frame, record, ts)
+            return {key: entry[1] for key, entry in entries.items()}
+
+    def keys(self, table: str) -> set:
+        """Keys of a table, without decoding the records"""
+        with self._lock:
+            return set(self._tables.get(table, {}))
+
+    def sync(self, timeout: float = 5.0) -> bool:
+        """Block until everything queued so far is fsynced"""
+        with self._lock:
+            target = self._seq
+            self._wakeup.notify()
+            return self._synced.wait_for(lambda: self._durable >= target or self._closed, timeout)
+
+    def compact(self):
+        """Rewrite the journal as just the live records"""
+        with self._write_lock:
+            self._compact()
+
+    def close(self):
+        with self._lock:
+            if self._closed:
+                return
+            self._closed = True  # Later writes are dropped
+            self._wakeup.notify()
+        self._writer.join(timeout=2)
+
+        with self._write_lock:
+            self._flush_pending()
+            self._file.close()
+        with self._lock:
+            self._synced.notify_all()
+
+    def get_stats(self) -> Dict:
+        return {
+            **self.stats,
+            "file_bytes": self._size,
+            "live_bytes": self._live_bytes,
+            "pending_frames": len(self._pending),
+            "tables": {name: len(entries) for name, entries in self._tables.items()}
+        }
+
+    # ------------------------------------------------------------------
+    # Encoding / replay
+    # ------------------------------------------------------------------
+
+    @staticmethod
+    def _frame(op: int, table: str, key: str, record: Optional[Dict], ts: float) -> bytes:
+        table_b, key_b = table.encode(), key.encode()
+        body = table_b + key_b
+        if record is not None:
+            body += json.dumps(record, separators=(",", ":"), default=str).encode()
+
+        meta = HEADER.pack(len(body), 0, op, ts, len(table_b), len(key_b))[8:]
+        return HEADER.pack(len(body), zlib.crc32(body, zlib.crc32(meta)), op, ts,
+                           len(table_b), len(key_b)) + body
+
+    def _record(self, table: str, key: str) -> Optional[Dict]:
+        """Decode (and cache) a replayed record (lock held)"""
+        entries = self._tables.get(table, {})
+        entry = entries.get(key)
+        if not entry:
+            return None
+        frame, record, ts = entry
+        if record is None:
+            record = json.loads(self._payload(frame))
+            entries[key] = (frame, record, ts)
+        return record
+
+    @staticmethod
+    def _payload(frame: bytes) -> bytes:
+        _, _, _, _, table_len, key_len = HEADER.unpack_from(frame)
+        return frame[HEADER.size + table_len + key_len:]
+
+    def _replay(self):
+        """Rebuild tables from the memory-mapped journal"""
+        start = time.perf_counter()
+
+        if not os.path.exists(self.path) or os.path.getsize(self.path) == 0:
+            with open(self.path, "wb") as f:
+                f.write(MAGIC)
+                f.flush()
+                os.fsync(f.fileno())
+            return
+
+        with open(self.path, "r+b") as f:
+            size = os.fstat(f.fileno()).st_size
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                if mm[:len(MAGIC)] != MAGIC:
+                    raise ValueError(f"{self.path} is not a journal file")
+
+                offset = len(MAGIC)
+                tables = self._tables
+                unpack = HEADER.unpack_from
+                header_size = HEADER.size
+                crc32 = zlib.crc32
+                replayed = 0
+
+                while offset + header_size <= size:
+                    length, crc, op, ts, table_len, key_len = unpack(mm, offset)
+                    end = offset + header_size + length
+                    if end > size:
+                        break
+
+                    frame = mm[offset:end]
+                    if crc32(frame[8:]) != crc:
+                        break
+
+                    names = offset + header_size
+                    table = mm[names:names + table_len].decode()
+                    key = mm[names + table_len:names + table_len + key_len].decode()
+                    if op == OP_PUT:
+                        entries = tables.get(table)
+                        if entries is None:
+                            entries = tables[table] = {}
+                        entries[key] = (frame, None, ts)
+                    else:
+                        tables.get(table, {}).pop(key, None)
+
+                    offset = end
+                    replayed += 1
+
+                self.stats["replayed"] = replayed
+
+            if offset < size:
+                # Torn write from a crash - drop the partial tail
+                self.stats["torn_bytes"] = size - offset
+                logger.warning(f"Journal {self.path}: dropping {size - offset} torn bytes")
+                f.truncate(offset)
+                os.fsync(f.fileno())
+
+        self.stats["replay_ms"] = round((time.perf_counter() - start) * 1000, 2)
+        logger.info(f"Journal replayed {self.stats['replayed']} records in {self.stats['replay_ms']}ms")
+
+    # ------------------------------------------------------------------
+    # Writer thread (group commit)
+    # ------------------------------------------------------------------
+
+    def _queue(self, frame: bytes):
+        if self._closed:
+            logger.warning(f"Journal {self.path} is closed - dropping write")
+            return
+        self._pending.append(frame)
+        self._seq += 1
+        self.stats["appends"] += 1
+
+    def _write_loop(self):
+        while True:
+            with self._lock:
+                self._wakeup.wait_for(lambda: self._pending or self._closed, self.fsync_interval)
+                if self._closed:
+                    return
+                if not self._pending:
+                    continue
+
+            with self._write_lock:
+                self._flush_pending()
+                if self._size > self.compact_min_bytes and self._size > 4 * self._live_bytes:
+                    self._compact()
+
+            # Let appends batch up between commits
+            time.sleep(self.fsync_interval)
+
+    def _flush_pending(self):
+        """Write + fsync queued frames (write lock held)"""
+        with self._lock:
+            if not self._pending:
+                return
+            pending, self._pending = self._pending, []
+            count = self._seq
+
+        data = b"".join(pending)
+        self._file.write(data)
+        self._file.flush()
+        os.fsync(self._file.fileno())
+
+        with self._lock:
+            self._size += len(data)
+            self._durable = count
+            self.stats["fsyncs"] += 1
+            self._synced.notify_all()
+
+    def _compact(self):
+        """Rewrite live frames to a new file and swap it in atomically (write lock held)"""
+        cutoff = time.time() - self.retain_seconds
+
+        with self._lock:
+            # Finished records past retention don't survive compaction
+            for table, is_terminal in self.terminal.items():
+                entries = self._tables.get(table, {})
+                expired = [key for key, (_, _, ts) in list(entries.items())
+                           if ts < cutoff and is_terminal(self._record(table, key))]
+                for key in expired:
+                    self._live_bytes -= len(entries.pop(key)[0])
+
+            # The live frames already include everything queued
+            frames = [entry[0] for entries in self._tables.values() for entry in entries.values()]
+            self._pending = []
+            count = self._seq
+            self._live_bytes = len(MAGIC) + sum(len(frame) for frame in frames)
+
+        tmp_path = self.path + ".compact"
+        with open(tmp_path, "wb") as f:
+            f.write(MAGIC)
+            f.write(b"".join(frames))
+            f.flush()
+            os.fsync(f.fileno())
+
+        self._file.close()
+        os.replace(tmp_path, self.path)
+        self._fsync_dir()
+        self._file = open(self.path, "ab")
+
+        with self._lock:
+            self._size = self._file.tell()
+            self._durable = count
+            self.stats["compactions"] += 1
+            self._synced.notify_all()
+        logger.info(f"Journal compacted to {self._size:,} bytes")
+
+    def _fsync_dir(self):
+        try:
+            fd = os.open(os.path.dirname(os.path.abspath(self.path)), os.O_RDONLY)
+        except OSError:
+            return  # Not supported on this platform
+        try:
+            os.fsync(fd)
+        finally:
+            os.close(fd)
+
+
+# ============================================================================
+# CLI
+# ============================================================================
+
+def main():
+    import argparse
+    import tempfile
+
+    parser = argparse.ArgumentParser(description="State Journal")
+    parser.add_argument("--dump", type=str, help="Print the live records of a journal")
+    parser.add_argument("--compact", type=str, help="Compact a journal in place")
+    parser.add_argument("--bench", type=int, help="Write N events then time a cold replay")
+
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s [%(levelname)s] %(message)s')
+
+    if args.dump:
+        journal = Journal(args.dump)
+        for table in journal.get_stats()["tables"]:
+            print(f"== {table} ==")
+            for key, record in journal.table(table).items():
+                print(f"{key}: {json.dumps(record)}")
+        journal.close()
+
+    elif args.compact:
+        journal = Journal(args.compact)
+        journal.compact()
+        print(json.dumps(journal.get_stats(), indent=2))
+        journal.close()
+
+    elif args.bench:
+        path = os.path.join(tempfile.mkdtemp(), "bench.journal")
+        journal = Journal(path, compact_min_bytes=1 << 40)
+
+        start = time.perf_counter()
+        for i in range(args.bench):
+            journal.put("orders", f"order_{i}", {"id": f"order_{i}", "status": "filled",
+                                                 "size_usd": 50.0, "fill_price": 0.52})
+            journal.put("positions", f"pos_{i % 500}", {"id": f"pos_{i % 500}", "status": "open"})
+        journal.close()
+        elapsed = time.perf_counter() - start
+        print(f"[*] {args.bench * 2:,} appends in {elapsed:.3f}s "
+              f"({journal.stats['fsyncs']} fsyncs, {os.path.getsize(path):,} bytes)")
+
+        journal = Journal(path)
+        print(f"[*] Replay: {journal.stats['replayed']:,} records in {journal.stats['replay_ms']}ms")
+        journal.close()
+
+    else:
+        parser.print_help()
+
+
+if __name__ == "__main__":
+    main()
@@ -30,13 +30,54 @@ import asyncio
 import aiohttp
 import websockets
 import json
+import re
 import time
+import zlib
 from datetime import datetime, timedelta
-from typing import Dict, List, Optional, Callable
+from typing import Dict, List, NamedTuple, Optional, Callable, Tuple
 from dataclasses import dataclass, field
 from collections import deque
 import logging
 
+import transport
+
+try:
+    import orjson  # Optional - faster scoreboard parsing
+    _loads = orjson.loads
+except ImportError:
+    _loads = json.loads
+
+try:
+    from config import LIVE_GAME_POLL_MS
+except ImportError:
+    LIVE_GAME_POLL_MS = 1000
+
+try:
+    from config import (LIVE_GAME_FAST_POLL_MS, LIVE_GAME_PREGAME_POLL_MS, LIVE_GAME_IDLE_POLL_MS,
+                        LIVE_GAME_PREGAME_WINDOW_MINUTES, ESPN_REQUEST_BUDGET_PER_HOUR)
+except ImportError:
+    LIVE_GAME_FAST_POLL_MS = 500            # Red zone, two-minute drill, overtime
+    LIVE_GAME_PREGAME_POLL_MS = 15000       # Kickoff soon / halftime
+    LIVE_GAME_IDLE_POLL_MS = 300000         # No game live or about to start
+    LIVE_GAME_PREGAME_WINDOW_MINUTES = 30
+    ESPN_REQUEST_BUDGET_PER_HOUR = 7200
+
+try:
+    from config import LIVE_GAME_MIN_EDGE_PCT, LIVE_GAME_BOOK_LAG_SECONDS
+except ImportError:
+    LIVE_GAME_MIN_EDGE_PCT = 5.0
+    LIVE_GAME_BOOK_LAG_SECONDS = 10.0       # Typical time for books to re-price after an event
+
+try:
+    from config import LIVE_GAME_MARKET_REFRESH_SECONDS
+except ImportError:
+    LIVE_GAME_MARKET_REFRESH_SECONDS = 300
+
+try:
+    from win_probability import WinProbabilityTable
+except ImportError:  # numpy not installed
+    WinProbabilityTable = None
+
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger('LiveGameArb')
 
@@ -56,6 +97,7 @@ class GameEvent:
     score_before: Dict[str, int]
     score_after: Dict[str, int]
     detection_latency_ms: float  # How fast we detected it
+    details: Dict = field(default_factory=dict)  # Clock, down/distance, possession
     
     @property
     def impact_score(self) -> float:
@@ -69,7 +111,7 @@ class GameEvent:
             impact += 20
         elif self.event_type == "injury" and "QB" in str(self.player):
             impact += 50  # QB injury massive
-        elif self.event_type == "turnover":
+        elif self.event_type in ("turnover", "interception"):
             impact += 25
         
         # Speed bonus (faster = more edge)
@@ -123,6 +165,9 @@ class LiveGameDetector:
         self.event_callbacks = []
         self.last_scores = {}
         
+        # Conditional requests + per-game change detection
+        self.espn = ESPNLiveFeed()
+        
         # Speed tracking
         self.detection_times = deque(maxlen=100)
         self.avg_latency_ms = 0
@@ -133,99 +178,27 @@ class LiveGameDetector:
     
     async def monitor_espn_api(self):
         """Monitor ESPN API for live scores (2-3 second delay)"""
-        async with aiohttp.ClientSession() as session:
-            while True:
-                try:
-                    start = time.time()
-                    
-                    # ESPN scoreboard API (free, public)
-                    url = "https://site.api.espn.com/apis/site/v2/sports/football/nfl/scoreboard"
-                    
-                    async with session.get(url, timeout=2) as resp:
-                        if resp.status == 200:
-                            data = await resp.json()
-                            detection_ms = (time.time() - start) * 1000
-                            
-                            await self._process_espn_data(data, detection_ms)
-                    
-                    await asyncio.sleep(1)  # Poll every second
-                    
-                except Exception as e:
-                    logger.error(f"ESPN API error: {e}")
-                    await asyncio.sleep(5)
+        await self.espn.start(self._emit)  # Polls as often as the games warrant
     
     async def _process_espn_data(self, data: Dict, latency_ms: float):
-        """Process ESPN scoreboard data for events"""
-        events = data.get("events", [])
+        """Process ESPN scoreboard data for events (changed games only)"""
+        for event in self.espn._detect_events(data, latency_ms):
+            self._emit(event)
+    
+    def _emit(self, event: GameEvent):
+        self.last_scores[event.game_id] = event.score_after.copy()
         
-        for game in events:
-            game_id = game.get("id")
-            
-            if game.get("status", {}).get("type", {}).get("state") != "in":
-                continue  # Only live games
-            
-            # Get current score
-            competitions = game.get("competitions", [])
-            if not competitions:
-                continue
-            
-            comp = competitions[0]
-            competitors = comp.get("competitors", [])
-            
-            # Extract scores
-            scores = {}
-            for team in competitors:
-                team_name = team.get("team", {}).get("abbreviation", "")
-                score = int(team.get("score", 0))
-                scores[team_name] = score
-            
-            # Check for score changes
-            if game_id in self.last_scores:
-                old_scores = self.last_scores[game_id]
-                
-                # Detect score change (touchdown, field goal, etc.)
-                for team, score in scores.items():
-                    if score > old_scores.get(team, 0):
-                        points_scored = score - old_scores[team]
-                        
-                        # Determine event type
-                        if points_scored == 6:
-                            event_type = "touchdown"
-                        elif points_scored == 7:
-                            event_type = "touchdown_extra_point"
-                        elif points_scored == 3:
-                            event_type = "field_goal"
-                        elif points_scored == 2:
-                            event_type = "safety"
-                        else:
-                            event_type = "score_change"
-                        
-                        # Create event
-                        event = GameEvent(
-                            game_id=game_id,
-                            event_type=event_type,
-                            team=team,
-                            player=None,  # Would need play-by-play data
-                            timestamp=datetime.now(),
-                            score_before=old_scores.copy(),
-                            score_after=scores.copy(),
-                            detection_latency_ms=latency_ms
-                        )
-                        
-                        self.detection_times.append(latency_ms)
-                        self.avg_latency_ms = sum(self.detection_times) / len(self.detection_times)
-                        
-                        logger.info(f"[EVENT] {team} {event_type}! Detected in {latency_ms:.0f}ms")
-                        
-                        # Emit to callbacks
-                        for callback in self.event_callbacks:
-                            try:
-                                callback(event)
-                            except Exception as e:
-                                logger.error(f"Callback error: {e}")
-            
-            # Update last known scores
-            self.last_scores[game_id] = scores.copy()
+        self.detection_times.append(event.detection_latency_ms)
+        self.avg_latency_ms = sum(self.detection_times) / len(self.detection_times)
+        
+        logger.info(f"[EVENT] {event.team} {event.event_type}! "
+                    f"Detected in {event.detection_latency_ms:.0f}ms")
+        
+        for callback in self.event_callbacks:
+            try:
+                callback(event)
+            except Exception as e:
+                logger.error(f"Callback error: {e}")
     
     async def monitor_twitter_feed(self):
         """Monitor Twitter for instant game updates (500ms-1s delay)"""
@@ -247,6 +220,17 @@ class LiveGameDetector:
 # SPEED-OPTIMIZED ARBITRAGE ENGINE
 # ============================================================================
 
+def _seconds_left(period: int, clock: str, status: str = "in") -> int:
+    """Game time remaining - overtime counts its own clock"""
+    if status == "post":
+        return 0
+    if period <= 0:
+        return 3600
+    if period > 4:
+        return _clock_seconds(clock)
+    return (4 - period) * 900 + _clock_seconds(clock)
+
+
 class FastArbitrageEngine:
     """Millisecond-optimized arbitrage execution"""
     
@@ -256,6 +240,15 @@ class FastArbitrageEngine:
         self.pending_orders = {}
         self.execution_times = deque(maxlen=100)
         
+        # Fair value: win probability surface + live book prices
+        self.win_probability = WinProbabilityTable.default() if WinProbabilityTable else None
+        self.markets: Dict[str, Dict[str, Tuple[str, str]]] = {}  # game_id -> team -> (market_id, name)
+        self.prices: Dict[str, float] = {}  # market_id -> live "team wins" price
+        
+        # Polymarket moneyline markets of the scoreboard's games, with live prices
+        self.game_markets = PolymarketGameMarkets(self)
+        self.detector.espn.on_game(self.game_markets.on_game)
+        
         # Speed tracking
         self.avg_execution_ms = 0
         self.fastest_execution_ms = float('inf')
@@ -263,6 +256,10 @@ class FastArbitrageEngine:
         # Wire up detector
         self.detector.on_event(self._on_game_event)
     
+    async def start(self):
+        """Watch the games and their markets' prices"""
+        await asyncio.gather(self.detector.monitor_espn_api(), self.game_markets.start())
+    
     def _on_game_event(self, event: GameEvent):
         """Handle live game event - SPEED CRITICAL"""
         start = time.time()
@@ -272,7 +269,7 @@ class FastArbitrageEngine:
         # Create arbitrage window
         window = self._create_arb_window(event)
         
-        if window and window.edge_pct >= 5.0:  # 5%+ edge minimum
+        if window and window.edge_pct >= LIVE_GAME_MIN_EDGE_PCT:
             logger.info(f"[ARBITRAGE] {window.edge_pct:.1f}% edge, {window.window_seconds:.0f}s window")
             logger.info(f"[URGENCY] {window.urgency} - Execute immediately!")
             
@@ -282,38 +279,83 @@ class FastArbitrageEngine:
         elapsed_ms = (time.time() - start) * 1000
         logger.info(f"[TIMING] Event processed in {elapsed_ms:.0f}ms")
     
-    def _create_arb_window(self, event: GameEvent) -> Optional[ArbitrageWindow]:
-        """Create arbitrage window from game event"""
+    def register_market(self, game_id: str, team: str, market_id: str, market_name: str = ""):
+        """Track the "team wins" market for one side of a game
+        
+        market_id is what update_price() is keyed by - PolymarketGameMarkets
+        registers the CLOB token id of the team's outcome.
+        """
+        self.markets.setdefault(game_id, {})[team] = (market_id, market_name or f"{team} to win")
+    
+    def update_price(self, market_id: str, price: float):
+        """Latest book price for a registered market (from the order book feed)"""
+        self.prices[market_id] = price
+    
+    def fair_value(self, team: str, scores: Dict[str, int], details: Dict,
+                   possession: Optional[str] = None, yard_line: Optional[int] = None) -> Optional[float]:
+        """Win probability for team in a game state (table lookup)"""
+        if self.win_probability is None:
+            return None
+        
+        opponent_score = max((score for other, score in scores.items() if other != team), default=0)
+        possession = details.get("possession", "") if possession is None else possession
+        yard_line = details.get("yard_line", 0) if yard_line is None else yard_line
+        
+        diff = scores.get(team, 0) - opponent_score
+        seconds = _seconds_left(details.get("period", 0), details.get("clock", ""), details.get("status", "in"))
+        yardline = yard_line or 75  # Unknown spot: touchback
         
-        # Map event to market impact
-        # Example: Chiefs score TD → Chiefs win probability increases
+        lookup = self.win_probability.lookup
+        if possession == team or (possession and possession in scores):
+            return lookup(diff, seconds, has_ball=possession == team, yardline_100=yardline)
+        
+        # Unknown possession: average both sides, so the teams still sum to 1
+        return (lookup(diff, seconds, True, yardline) + lookup(diff, seconds, False, yardline)) / 2
+    
+    def _create_arb_window(self, event: GameEvent) -> Optional[ArbitrageWindow]:
+        """Create arbitrage window from game event
         
-        # This requires:
-        # 1. Knowing which markets exist for this game
-        # 2. Estimating new probability based on score
-        # 3. Comparing to current Polymarket price
-        # 4. Predicting where sportsbook will move
+        For each registered market in the game, the event's fair-value jump
+        is the win probability after it minus before it; the edge is fair
+        value after minus the live book price, which hasn't moved yet.
+        """
+        markets = self.markets.get(event.game_id)
+        details = event.details
+        if not markets or not details or self.win_probability is None:
+            return None
         
-        # Simplified example:
-        if event.event_type in ["touchdown", "touchdown_extra_point"]:
-            # Scoring team's win probability increases
-            # Typical increase: 5-15% depending on score, time remaining
+        best = None
+        for team, (market_id, market_name) in markets.items():
+            price = self.prices.get(market_id)
+            if price is None:
+                continue
+            
+            fair_after = self.fair_value(team, event.score_after, details)
+            fair_before = self.fair_value(team, event.score_before, details,
+                                          details.get("possession_before"), details.get("yard_line_before"))
+            
+            edge = fair_after - price
+            if edge <= 0 or (best and edge * 100 <= best.edge_pct):
+                continue
             
-            window = ArbitrageWindow(
+            # Share of the edge this event explains - mispricing that was
+            # already there before the play is model disagreement, not lag
+            jump = fair_after - fair_before
+            confidence = min(1.0, max(0.0, jump) / edge) * 100
+            
+            best = ArbitrageWindow(
                 event=event,
-                market_id="game_winner_market",
-                market_name=f"{event.team} to win",
-                current_polymarket_price=0.50,  # Current price
-                expected_new_price=0.60,  # Should move to ~60%
-                sportsbook_will_update_to=0.62,  # Books will update here
-                edge_pct=10.0,  # 10% edge window
-                window_seconds=10.0,  # 10 second window before books update
-                confidence=85.0
+                market_id=market_id,
+                market_name=market_name,
+                current_polymarket_price=price,
+                expected_new_price=fair_after,
+                sportsbook_will_update_to=fair_after,
+                edge_pct=edge * 100,
+                window_seconds=max(0.0, LIVE_GAME_BOOK_LAG_SECONDS - event.detection_latency_ms / 1000),
+                confidence=confidence
             )
-            
-            return window
         
-        return None
+        return best
     
     async def _execute_fast(self, window: ArbitrageWindow):
         """Execute arbitrage with sub-100ms target"""
@@ -369,23 +411,25 @@ class SpeedOptimizer:
     @staticmethod
     def optimize_execution():
         """Optimize trade execution speed"""
+        settings = transport.SETTINGS
         return {
             "use_market_orders": True,  # Fastest fill (vs limit)
             "skip_slippage_check": False,  # Still important
             "parallel_execution": True,  # Multiple orders at once
-            "connection_pooling": True,  # Reuse connections
-            "dns_prefetch": True,  # Pre-resolve DNS
-            "tcp_keepalive": True,  # Keep connections open
+            "connection_pooling": settings.connection_pooling,  # Reuse connections
+            "dns_prefetch": settings.dns_cache,  # Pre-resolve DNS (transport.prewarm)
+            "tcp_keepalive": settings.tcp_keepalive,  # Keep connections open
         }
     
     @staticmethod
     def optimize_network():
-        """Network-level optimizations"""
+        """Network-level optimizations (applied to every client by transport.py)"""
+        settings = transport.SETTINGS
         return {
-            "timeout_ms": 2000,  # 2s timeout (aggressive)
-            "max_retries": 1,  # Only 1 retry (speed over reliability)
-            "connection_pool_size": 50,  # Many concurrent connections
-            "dns_cache_ttl": 300,  # Cache DNS for 5 min
+            "timeout_ms": settings.timeout_ms,  # 2s timeout (aggressive)
+            "max_retries": settings.max_retries,  # Only 1 retry (speed over reliability)
+            "connection_pool_size": settings.pool_size,  # Many concurrent connections
+            "dns_cache_ttl": settings.dns_cache_ttl,  # Cache DNS for 5 min
         }
 
 
@@ -393,45 +437,617 @@ class SpeedOptimizer:
 # LIVE FEED INTEGRATIONS
 # ============================================================================
 
+class GameState(NamedTuple):
+    """What ESPNLiveFeed diffs per game - an equal state means nothing happened"""
+    status: str              # pre / in / post
+    period: int
+    clock: str
+    scores: Tuple[Tuple[str, int], ...]
+    possession: str          # Team abbreviation
+    down: int
+    distance: int
+    yard_line: int
+    red_zone: bool
+
+
+def _clock_seconds(clock: str) -> int:
+    """Game clock "1:45" -> 105 seconds (unparseable counts as a full quarter)"""
+    minutes, _, seconds = clock.partition(":")
+    try:
+        return int(minutes) * 60 + int(float(seconds or 0))
+    except ValueError:
+        return 900
+
+
+def _parse_kickoff(date: Optional[str]) -> Optional[float]:
+    """ESPN event date ("2025-09-07T17:00Z") -> epoch seconds"""
+    if not date:
+        return None
+    try:
+        return datetime.fromisoformat(date.replace("Z", "+00:00")).timestamp()
+    except ValueError:
+        return None
+
+
+def _score_event_type(points: int) -> str:
+    if points == 6:
+        return "touchdown"
+    elif points == 7:
+        return "touchdown_extra_point"
+    elif points == 3:
+        return "field_goal"
+    elif points == 2:
+        return "safety"
+    return "score_change"
+
+
+_SCORE_EVENTS = {"touchdown", "touchdown_extra_point", "field_goal", "safety", "score_change"}
+
+_PLAYER = r"(?:\d+-)?([A-Z][A-Za-z]?\.[A-Z][A-Za-z'\-]+)"  # ESPN style: "P.Mahomes", "AJ.Brown"
+_FIRST_PLAYER = re.compile(_PLAYER)
+_RECEIVER = re.compile(r"pass [^,]*?to " + _PLAYER)
+_INTERCEPTOR = re.compile(r"INTERCEPTED by " + _PLAYER)
+_INJURED = re.compile(_PLAYER + r" (?:was |has been |is )?injured")
+_TEAM_REF = re.compile(r"/teams/(\d+)")
+
+
+def _play_sequence(play: Dict) -> int:
+    try:
+        return int(play.get("sequenceNumber") or 0)
+    except (TypeError, ValueError):
+        return 0
+
+
+def _match(pattern: re.Pattern, text: str) -> Optional[str]:
+    match = pattern.search(text)
+    return match.group(1) if match else None
+
+
+def _play_events(play: Dict) -> List[Tuple[str, Optional[str]]]:
+    """Typed events in one ESPN play - (event_type, player)
+    
+    Scoring plays come back as ("score", scorer) so the scoreboard's
+    touchdown / field goal events can be credited to a player.
+    """
+    kind = (play.get("type") or {}).get("text", "").lower()
+    text = play.get("text") or ""
+    lower = text.lower()
+    events = []
+    
+    if "interception" in kind or "intercepted" in lower:
+        events.append(("interception", _match(_INTERCEPTOR, text)))
+    elif "fumble" in kind and ("opponent" in kind or "return" in kind):
+        events.append(("turnover", _match(_FIRST_PLAYER, text)))  # Who fumbled
+    elif "sack" in kind:
+        events.append(("sack", _match(_FIRST_PLAYER, text)))
+    elif "blocked" in kind:
+        events.append(("blocked_kick", None))
+    elif "field goal" in kind and ("missed" in kind or "no good" in lower):
+        events.append(("missed_field_goal", _match(_FIRST_PLAYER, text)))
+    
+    if play.get("scoringPlay"):
+        scorer = _match(_RECEIVER, text) if "pass" in kind else None
+        events.append(("score", scorer or _match(_FIRST_PLAYER, text)))
+    
+    if "injur" in lower:
+        events.append(("injury", _match(_INJURED, text)))
+    
+    return events
+
+
+class RequestBudget:
+    """Token bucket shared by every request to one provider
+    
+    Allows bursts up to an hour's budget / 60 and refills continuously.
+    """
+    
+    def __init__(self, per_hour: float = ESPN_REQUEST_BUDGET_PER_HOUR):
+        self.rate = per_hour / 3600
+        self.capacity = max(1.0, per_hour / 60)
+        self.tokens = self.capacity
+        self.refilled_at = time.monotonic()
+        self.spent = 0
+    
+    def _refill(self):
+        now = time.monotonic()
+        self.tokens = min(self.capacity, self.tokens + (now - self.refilled_at) * self.rate)
+        self.refilled_at = now
+    
+    def delay(self) -> float:
+        """Seconds until a request is within budget"""
+        self._refill()
+        return 0.0 if self.tokens >= 1 else (1 - self.tokens) / self.rate
+    
+    def take(self):
+        self._refill()
+        self.tokens -= 1  # May go negative - delay() then waits it off
+        self.spent += 1
+
+
+class AdaptivePollScheduler:
+    """Picks the next scoreboard poll from the state of the games on it
+    
+    Each live game asks for an interval (fastest in the red zone, the
+    two-minute drill and overtime, slow at halftime) and the feed polls at
+    the shortest. With nothing live it waits until the pre-game window of
+    the next kickoff. Errors back off exponentially; the request budget
+    caps everything.
+    """
+    
+    def __init__(self, budget: Optional[RequestBudget] = None,
+                 live_ms: float = LIVE_GAME_POLL_MS,
+                 fast_ms: float = LIVE_GAME_FAST_POLL_MS,
+                 pregame_ms: float = LIVE_GAME_PREGAME_POLL_MS,
+                 idle_ms: float = LIVE_GAME_IDLE_POLL_MS,
+                 pregame_window_minutes: float = LIVE_GAME_PREGAME_WINDOW_MINUTES,
+                 max_backoff_seconds: float = 60):
+        self.budget = budget or RequestBudget()
+        self.live = live_ms / 1000
+        self.fast = fast_ms / 1000
+        self.pregame = pregame_ms / 1000
+        self.idle = idle_ms / 1000
+        self.pregame_window = pregame_window_minutes * 60
+        self.max_backoff = max_backoff_seconds
+        
+        self.errors = 0
+        self.mode = "idle"
+        self.stats = {"idle": 0, "slow": 0, "live": 0, "fast": 0, "backoff": 0, "budget": 0}
+    
+    def game_interval(self, state: "GameState") -> float:
+        """Poll interval one live game warrants"""
+        seconds_left = _clock_seconds(state.clock)
+        if state.period == 2 and seconds_left == 0:
+            return self.pregame  # Halftime
+        if state.red_zone or state.period >= 5 or (state.period in (2, 4) and seconds_left <= 120):
+            return self.fast
+        return self.live
+    
+    def on_success(self):
+        self.errors = 0
+    
+    def on_error(self):
+        self.errors += 1
+    
+    def next_delay(self, feed: "ESPNLiveFeed", now: Optional[float] = None) -> float:
+        """Seconds to sleep before the next scoreboard request"""
+        now = time.time() if now is None else now
+        
+        if feed.last_update:
+            delay = min(self.game_interval(state) for state in feed.last_update.values())
+            mode = "fast" if delay <= self.fast else "live" if delay <= self.live else "slow"
+        elif feed.next_kickoff is not None and feed.next_kickoff - now <= self.pregame_window:
+            delay, mode = self.pregame, "slow"
+        else:
+            delay, mode = self.idle, "idle"
+            if feed.next_kickoff is not None:  # Wake up for the pre-game window
+                delay = max(self.pregame, min(delay, feed.next_kickoff - self.pregame_window - now))
+        
+        if self.errors:
+            delay = max(delay, min(self.max_backoff, self.live * 2 ** self.errors))
+            mode = "backoff"
+        
+        budget_delay = self.budget.delay()
+        if budget_delay > delay:
+            delay, mode = budget_delay, "budget"
+        
+        self.mode = mode
+        self.stats[mode] += 1
+        return delay
+    
+    def get_stats(self) -> Dict:
+        return {**self.stats, "mode": self.mode, "errors": self.errors,
+                "requests": self.budget.spent}
+
+
+class ESPNPlayByPlay:
+    """Incremental ESPN play-by-play, fetched only for games that changed
+    
+    Each game keeps a cursor (plays seen, last sequence number), so a fetch
+    asks for the one page the new plays start on - a catch-up after an
+    outage may take a few. The first fetch for a game only sets the cursor.
+    """
+    
+    PLAYS_URL = ("https://sports.core.api.espn.com/v2/sports/football/leagues/nfl"
+                 "/events/{game_id}/competitions/{game_id}/plays")
+    PAGE_SIZE = 25
+    MAX_PAGES = 4
+    
+    def __init__(self, budget: RequestBudget):
+        self.budget = budget
+        self.cursors: Dict[str, Tuple[int, int]] = {}  # game_id -> (plays seen, last sequence)
+        self.stats = {"requests": 0, "baselines": 0, "plays": 0, "skipped": 0, "errors": 0}
+    
+    async def fetch(self, session: aiohttp.ClientSession, game_id: str) -> List[Dict]:
+        """Plays newer than the last sequence seen for a game"""
+        if self.budget.delay() > 0:  # Never at the expense of scoreboard polls
+            self.stats["skipped"] += 1
+            return []
+        
+        cursor = self.cursors.get(game_id)
+        if cursor is None:
+            data = await self._page(session, game_id, 1, 1)
+            self.cursors[game_id] = (int(data.get("count") or 0), 0)
+            self.stats["baselines"] += 1
+            return []
+        
+        seen, last_sequence = cursor
+        page = first_page = seen // self.PAGE_SIZE + 1
+        plays = []
+        while True:
+            data = await self._page(session, game_id, page, self.PAGE_SIZE)
+            items = data.get("items") or []
+            plays.extend(items[max(0, seen - (page - 1) * self.PAGE_SIZE):])
+            if not items or page >= int(data.get("pageCount") or 0) or page - first_page + 1 >= self.MAX_PAGES:
+                break
+            page += 1
+        
+        # Index picks the page, the sequence number guards against replays
+        plays = [play for play in plays if _play_sequence(play) > last_sequence]
+        if plays:
+            last_sequence = max(_play_sequence(play) for play in plays)
+        seen = (page - 1) * self.PAGE_SIZE + len(items) if items else min(seen, int(data.get("count") or 0))
+        self.cursors[game_id] = (seen, last_sequence)
+        self.stats["plays"] += len(plays)
+        return plays
+    
+    async def _page(self, session: aiohttp.ClientSession, game_id: str, page: int, limit: int) -> Dict:
+        self.budget.take()
+        self.stats["requests"] += 1
+        async with session.get(self.PLAYS_URL.format(game_id=game_id),
+                               params={"limit": limit, "page": page}, timeout=2) as resp:
+            if resp.status != 200:
+                raise RuntimeError(f"plays HTTP {resp.status}")
+            return _loads(await resp.read())
+    
+    def forget(self, game_id: str):
+        self.cursors.pop(game_id, None)
+
+
 class ESPNLiveFeed:
-    """ESPN live scoreboard (free, 2-3s delay)"""
+    """ESPN live scoreboard (free, 2-3s delay)
+    
+    Each poll is a conditional request (ETag / Last-Modified). A body whose
+    hash matches the previous one is not parsed, and only games whose
+    GameState changed are diffed into events. Those games then get one
+    incremental play-by-play request for turnovers, injuries and players.
+    
+    Kickoff times and the start of halftime also go out as anchors (named
+    instants per game) for on_anchor callbacks, e.g. PlaybookManager.set_anchor.
+    on_game callbacks learn each upcoming / live game's kickoff and team names.
+    """
     
     API_URL = "https://site.api.espn.com/apis/site/v2/sports/football/nfl/scoreboard"
     
-    def __init__(self):
+    def __init__(self, scheduler: Optional[AdaptivePollScheduler] = None):
         self.session = None
-        self.last_update = {}
+        self.last_update: Dict[str, GameState] = {}  # Live games only
+        self.next_kickoff: Optional[float] = None    # Earliest game not started yet
+        self.scheduler = scheduler or AdaptivePollScheduler()
+        self.plays = ESPNPlayByPlay(self.scheduler.budget)
+        self.changed: List[str] = []                 # Games changed on the last poll
+        self.team_ids: Dict[str, Dict[str, str]] = {}  # game_id -> ESPN team id -> abbreviation
+        self.anchors: Dict[Tuple[str, str], float] = {}  # (anchor, game_id) -> time sent out
+        self.anchor_callbacks = []
+        self.games: Dict[str, Dict] = {}  # game_id -> kickoff / team names (on_game only)
+        self.game_callbacks = []
+        
+        # Validators and hash of the last scoreboard body
+        self.etag = None
+        self.last_modified = None
+        self.body_hash = None
+        
+        self.stats = {"polls": 0, "not_modified": 0, "unchanged": 0, "parsed": 0,
+                      "games_changed": 0, "events": 0, "errors": 0}
+    
+    def on_anchor(self, callback: Callable[[str, float, str, Dict], None]):
+        """Register callback(anchor, at, game_id, data) for "kickoff" / "halftime" """
+        self.anchor_callbacks.append(callback)
+    
+    def on_game(self, callback: Callable[[str, Dict], None]):
+        """Register callback(game_id, info) for games first seen (or rescheduled)
+        
+        info: {"kickoff": epoch seconds, "name": "KC @ BUF",
+               "teams": {abbreviation: [display name, short name, nickname]}}
+        """
+        self.game_callbacks.append(callback)
+    
+    def _game(self, game_id: str, kickoff: Optional[float], game: Dict):
+        info = self.games.get(game_id)
+        if info is not None and info["kickoff"] == kickoff:
+            return
+        
+        comp = (game.get("competitions") or [{}])[0]
+        teams = {}
+        for team in comp.get("competitors", []):
+            names = team.get("team", {})
+            teams[names.get("abbreviation", "")] = [name for name in (
+                names.get("displayName"), names.get("shortDisplayName"), names.get("name")) if name]
+        
+        info = self.games[game_id] = {"kickoff": kickoff, "name": game.get("shortName", ""), "teams": teams}
+        for callback in self.game_callbacks:
+            try:
+                callback(game_id, info)
+            except Exception as e:
+                logger.error(f"Game callback error: {e}")
+    
+    def _anchor(self, anchor: str, game_id: str, at: float, game: Dict):
+        """Send out an anchor once per value (a kickoff can be rescheduled)"""
+        if self.anchors.get((anchor, game_id)) == at:
+            return
+        self.anchors[(anchor, game_id)] = at
+        data = {"game_id": game_id, "game_name": game.get("shortName", ""),
+                "teams": list(self._team_ids(game).values())}
+        for callback in self.anchor_callbacks:
+            try:
+                callback(anchor, at, game_id, data)
+            except Exception as e:
+                logger.error(f"Anchor callback error: {e}")
     
     async def start(self, callback: Callable):
         """Start monitoring ESPN feed"""
-        async with aiohttp.ClientSession() as session:
+        async with transport.aiohttp_session() as session:
             self.session = session
+            await transport.prewarm_async(session, [transport.ESPN_HOST, transport.ESPN_CORE_HOST])
             
             while True:
                 try:
-                    start = time.time()
-                    async with session.get(self.API_URL, timeout=2) as resp:
-                        if resp.status == 200:
-                            data = await resp.json()
-                            latency = (time.time() - start) * 1000
-                            
-                            events = self._detect_events(data)
-                            for event in events:
-                                event.detection_latency_ms = latency
-                                callback(event)
+                    events = await self.poll(session)
+                    for event in events:
+                        callback(event)
+                    self.scheduler.on_success()
                     
-                    await asyncio.sleep(1)  # Check every second
+                    # Scoreboard events go out first; play detail follows
+                    for event in await self.fetch_plays(session, events):
+                        callback(event)
                     
                 except Exception as e:
                     logger.error(f"ESPN feed error: {e}")
-                    await asyncio.sleep(5)
+                    self.stats["errors"] += 1
+                    self.scheduler.on_error()
+                
+                await asyncio.sleep(self.scheduler.next_delay(self))
+    
+    async def poll(self, session: aiohttp.ClientSession) -> List[GameEvent]:
+        """One conditional scoreboard request - events of games that changed"""
+        headers = {}
+        if self.etag:
+            headers["If-None-Match"] = self.etag
+        if self.last_modified:
+            headers["If-Modified-Since"] = self.last_modified
+        
+        start = time.time()
+        self.stats["polls"] += 1
+        self.scheduler.budget.take()
+        async with session.get(self.API_URL, headers=headers, timeout=2) as resp:
+            if resp.status == 304:
+                self.stats["not_modified"] += 1
+                return []
+            if resp.status != 200:
+                raise RuntimeError(f"scoreboard HTTP {resp.status}")  # Backs off
+            body = await resp.read()
+            self.etag = resp.headers.get("ETag")
+            self.last_modified = resp.headers.get("Last-Modified")
+        
+        return self.process(body, (time.time() - start) * 1000)
+    
+    async def fetch_plays(self, session: aiohttp.ClientSession,
+                          score_events: List[GameEvent] = ()) -> List[GameEvent]:
+        """New plays of the games that changed on the last poll, as events
+        
+        Scoring plays credit their player to score_events of the same game.
+        """
+        game_ids, self.changed = self.changed, []
+        if not game_ids:
+            return []
+        
+        start = time.time()
+        results = await asyncio.gather(*(self.plays.fetch(session, game_id) for game_id in game_ids),
+                                       return_exceptions=True)
+        latency_ms = (time.time() - start) * 1000
+        
+        events = []
+        for game_id, plays in zip(game_ids, results):
+            if isinstance(plays, Exception):
+                logger.debug(f"ESPN plays {game_id} failed: {plays}")
+                self.plays.stats["errors"] += 1
+                continue
+            events.extend(self._play_events(game_id, plays, latency_ms, score_events))
+        
+        self.stats["events"] += len(events)
+        return events
+    
+    def _play_events(self, game_id: str, plays: List[Dict], latency_ms: float,
+                     score_events: List[GameEvent] = ()) -> List[GameEvent]:
+        state = self.last_update.get(game_id)
+        scores = dict(state.scores) if state else {}
+        details = self._details(state, state) if state else {}
+        team_ids = self.team_ids.get(game_id, {})
+        timestamp = datetime.now()
+        
+        events = []
+        for play in plays:
+            team_ref = play.get("team") or {}
+            team = team_ids.get(str(team_ref.get("id") or _match(_TEAM_REF, team_ref.get("$ref", "")) or ""), "")
+            
+            for event_type, player in _play_events(play):
+                if event_type == "score":
+                    for event in score_events:
+                        if (event.game_id == game_id and event.event_type in _SCORE_EVENTS
+                                and event.player is None and (not team or event.team == team)):
+                            event.player = player
+                            break
+                    continue
+                
+                events.append(GameEvent(
+                    game_id=game_id,
+                    event_type=event_type,
+                    team=team,
+                    player=player,
+                    timestamp=timestamp,
+                    score_before=scores,
+                    score_after=scores,
+                    detection_latency_ms=latency_ms,
+                    details={**details, "play": play.get("text", ""), "sequence": _play_sequence(play)}
+                ))
+        
+        return events
     
-    def _detect_events(self, data: Dict) -> List[GameEvent]:
+    def process(self, body: bytes, latency_ms: float = 0.0) -> List[GameEvent]:
+        """Events from a raw scoreboard body (not parsed if unchanged)"""
+        body_hash = zlib.crc32(body)
+        if body_hash == self.body_hash:
+            self.stats["unchanged"] += 1
+            return []
+        self.body_hash = body_hash
+        self.stats["parsed"] += 1
+        
+        return self._detect_events(_loads(body), latency_ms)
+    
+    def _detect_events(self, data: Dict, latency_ms: float = 0.0) -> List[GameEvent]:
         """Detect events from ESPN data"""
         events = []
+        next_kickoff = None
         
-        # Process scoreboard data
-        # Detect score changes, injuries, etc.
+        for game in data.get("events", []):
+            game_id = game.get("id")
+            status = game.get("status", {})
+            state_name = status.get("type", {}).get("state")
+            
+            # Not live and not being tracked - skip before reading anything else
+            previous = self.last_update.get(game_id)
+            if state_name != "in" and previous is None:
+                if state_name == "pre":  # Only the kickoff time, for the poll scheduler
+                    kickoff = _parse_kickoff(game.get("date"))
+                    if kickoff is not None and (next_kickoff is None or kickoff < next_kickoff):
+                        next_kickoff = kickoff
+                    if kickoff is not None and self.anchor_callbacks:
+                        self._anchor("kickoff", game_id, kickoff, game)
+                    if self.game_callbacks:
+                        self._game(game_id, kickoff, game)
+                continue
+            
+            state = self._game_state(game, status, state_name)
+            if state == previous:
+                continue
+            self.stats["games_changed"] += 1
+            
+            if state_name == "in":
+                self.last_update[game_id] = state
+                # Play-by-play (baseline on first sighting) - a clock tick alone has no new play
+                if previous is None or state._replace(clock=previous.clock) != previous:
+                    self.changed.append(game_id)
+                if previous is None:
+                    self.team_ids[game_id] = self._team_ids(game)
+                    if self.game_callbacks:
+                        self._game(game_id, _parse_kickoff(game.get("date")), game)
+                if (self.anchor_callbacks and ("halftime", game_id) not in self.anchors
+                        and status.get("type", {}).get("name") == "STATUS_HALFTIME"):
+                    self._anchor("halftime", game_id, time.time(), game)
+            else:
+                del self.last_update[game_id]  # Final - stop tracking
+                self.team_ids.pop(game_id, None)
+                self.plays.forget(game_id)
+                self.anchors.pop(("kickoff", game_id), None)
+                self.anchors.pop(("halftime", game_id), None)
+                self.games.pop(game_id, None)
+            
+            if previous is not None:  # First sighting is the baseline
+                events.extend(self._diff(game_id, previous, state, latency_ms))
+        
+        self.next_kickoff = next_kickoff
+        self.stats["events"] += len(events)
+        return events
+    
+    @staticmethod
+    def _team_ids(game: Dict) -> Dict[str, str]:
+        comp = (game.get("competitions") or [{}])[0]
+        return {str(team.get("id", "")): team.get("team", {}).get("abbreviation", "")
+                for team in comp.get("competitors", [])}
+    
+    @staticmethod
+    def _game_state(game: Dict, status: Dict, state_name: str) -> GameState:
+        comp = (game.get("competitions") or [{}])[0]
+        
+        abbreviations = {}
+        scores = []
+        for team in comp.get("competitors", []):
+            abbreviation = team.get("team", {}).get("abbreviation", "")
+            abbreviations[str(team.get("id", ""))] = abbreviation
+            scores.append((abbreviation, int(team.get("score") or 0)))
+        
+        situation = comp.get("situation") or {}
+        return GameState(
+            status=state_name or "",
+            period=int(status.get("period") or 0),
+            clock=status.get("displayClock", ""),
+            scores=tuple(scores),
+            possession=abbreviations.get(str(situation.get("possession", "")), ""),
+            down=int(situation.get("down") or 0),
+            distance=int(situation.get("distance") or 0),
+            yard_line=int(situation.get("yardLine") or 0),
+            red_zone=bool(situation.get("isRedZone"))
+        )
+    
+    @staticmethod
+    def _details(before: GameState, after: GameState) -> Dict:
+        return {
+            "status": after.status,
+            "period": after.period,
+            "clock": after.clock,
+            "possession": after.possession,
+            "down": after.down,
+            "distance": after.distance,
+            "yard_line": after.yard_line,
+            "red_zone": after.red_zone,
+            "possession_before": before.possession,
+            "yard_line_before": before.yard_line
+        }
+    
+    @staticmethod
+    def _diff(game_id: str, before: GameState, after: GameState,
+              latency_ms: float) -> List[GameEvent]:
+        """GameEvents for what changed between two states of one game"""
+        score_before = dict(before.scores)
+        score_after = dict(after.scores)
+        details = ESPNLiveFeed._details(before, after)
+        timestamp = datetime.now()
+        
+        def event(event_type: str, team: str) -> GameEvent:
+            return GameEvent(
+                game_id=game_id,
+                event_type=event_type,
+                team=team,
+                player=None,
+                timestamp=timestamp,
+                score_before=score_before,
+                score_after=score_after,
+                detection_latency_ms=latency_ms,
+                details=details
+            )
+        
+        events = []
+        
+        # Scores (touchdown, field goal, etc.)
+        for team, score in after.scores:
+            points = score - score_before.get(team, 0)
+            if points > 0:
+                events.append(event(_score_event_type(points), team))
+        
+        # Possession, then down & distance within a drive
+        if after.possession and before.possession and after.possession != before.possession:
+            events.append(event("possession_change", after.possession))
+        elif after.possession and after.down and (after.down, after.distance) != (before.down, before.distance):
+            events.append(event("down_distance", after.possession))
+        
+        if after.red_zone and not before.red_zone:
+            events.append(event("red_zone", after.possession))
+        
+        # Clock
+        if after.period != before.period:
+            events.append(event("period_change", after.possession))
+        if after.status == "post":
+            leader = max(after.scores, key=lambda team_score: team_score[1])[0] if after.scores else ""
+            events.append(event("game_final", leader))
         
         return events
 
@@ -477,6 +1093,177 @@ class TwitterGameFeed:
         pass
 
 
+# ============================================================================
+# POLYMARKET GAME MARKETS
+# ============================================================================
+
+def _json_list(value) -> List:
+    """Gamma list fields come JSON-encoded ('["Chiefs", "Bills"]')"""
+    if isinstance(value, str):
+        try:
+            value = json.loads(value)
+        except ValueError:
+            return []
+    return value if isinstance(value, list) else []
+
+
+class PolymarketGameMarkets:
+    """Polymarket moneyline markets of the ESPN games, with live CLOB prices
+    
+    A Gamma market whose two outcomes are the two teams' names (any of
+    ESPN's display / short / nick names) and whose game starts within a day
+    of the ESPN kickoff is that game's moneyline. Each outcome's CLOB token
+    is registered on the engine as the team's "wins" market, and the CLOB
+    market channel pushes its best ask (what a buy pays) to update_price.
+    """
+    
+    GAMMA_API = "https://gamma-api.polymarket.com"
+    WS_URL = "wss://ws-subscriptions-clob.polymarket.com/ws/market"
+    MATCH_WINDOW_SECONDS = 86400
+    
+    def __init__(self, engine: "FastArbitrageEngine", refresh_seconds: float = LIVE_GAME_MARKET_REFRESH_SECONDS):
+        self.engine = engine
+        self.refresh = refresh_seconds
+        self.pending: Dict[str, Dict] = {}  # game_id -> info, not matched to a market yet
+        self.tokens: Dict[str, str] = {}    # token id -> game_id
+        self.ws = None
+        self.stats = {"lookups": 0, "games_matched": 0, "ticks": 0, "errors": 0}
+    
+    def on_game(self, game_id: str, info: Dict):
+        """ESPNLiveFeed.on_game - look the game's market up on the next refresh"""
+        if game_id not in self.engine.markets:
+            self.pending[game_id] = info
+    
+    async def start(self):
+        async with transport.aiohttp_session() as session:
+            await asyncio.gather(self._refresh_loop(session), self._price_loop())
+    
+    async def _refresh_loop(self, session: aiohttp.ClientSession):
+        while True:
+            if self.pending:
+                try:
+                    self.match(await self.fetch_markets(session))
+                except Exception as e:
+                    logger.error(f"Game market lookup failed: {e}")
+                    self.stats["errors"] += 1
+            await asyncio.sleep(self.refresh)
+    
+    async def fetch_markets(self, session: aiohttp.ClientSession) -> List[Dict]:
+        """Open NFL markets on Gamma"""
+        self.stats["lookups"] += 1
+        params = {"tag": "nfl", "closed": "false", "active": "true", "_limit": 500}
+        async with session.get(f"{self.GAMMA_API}/markets", params=params, timeout=15) as resp:
+            if resp.status != 200:
+                raise RuntimeError(f"Gamma HTTP {resp.status}")
+            return await resp.json()
+    
+    def match(self, markets: List[Dict]) -> int:
+        """Register the moneylines of pending games found in `markets`"""
+        by_outcomes: Dict[frozenset, List[Dict]] = {}
+        for market in markets:
+            outcomes = _json_list(market.get("outcomes"))
+            if len(outcomes) == 2 and len(_json_list(market.get("clobTokenIds"))) == 2:
+                by_outcomes.setdefault(frozenset(o.lower() for o in outcomes), []).append(market)
+        
+        matched = 0
+        stale = time.time() - 6 * 3600  # Long over - stop looking
+        for game_id, info in list(self.pending.items()):
+            if info["kickoff"] is not None and info["kickoff"] < stale:
+                del self.pending[game_id]
+                continue
+            market = self._find(info, by_outcomes)
+            if market is None:
+                continue
+            
+            outcomes = _json_list(market["outcomes"])
+            tokens = _json_list(market["clobTokenIds"])
+            for abbreviation, names in info["teams"].items():
+                lowered = {name.lower() for name in names}
+                for outcome, token in zip(outcomes, tokens):
+                    if outcome.lower() in lowered:
+                        self.engine.register_market(game_id, abbreviation, str(token),
+                                                    f"{market.get('question', info['name'])}: {outcome}")
+                        self.tokens[str(token)] = game_id
+            
+            del self.pending[game_id]
+            matched += 1
+            logger.info(f"[MARKETS] {info['name']} -> {market.get('question', market.get('id'))}")
+        
+        self.stats["games_matched"] += matched
+        if matched:
+            self._subscribe()
+        return matched
+    
+    def _find(self, info: Dict, by_outcomes: Dict[frozenset, List[Dict]]) -> Optional[Dict]:
+        teams = list(info["teams"].values())
+        if len(teams) != 2:
+            return None
+        for first in teams[0]:
+            for second in teams[1]:
+                for market in by_outcomes.get(frozenset((first.lower(), second.lower())), ()):
+                    start = _parse_kickoff(market.get("gameStartTime") or market.get("endDate"))
+                    if (info["kickoff"] is None or start is None
+                            or abs(start - info["kickoff"]) <= self.MATCH_WINDOW_SECONDS):
+                        return market
+        return None
+    
+    # ------------------------------------------------------------------
+    # CLOB prices
+    # ------------------------------------------------------------------
+    
+    def _subscribe(self):
+        if self.ws is not None and self.tokens:
+            asyncio.ensure_future(self._send_subscription(self.ws))
+    
+    async def _send_subscription(self, ws):
+        try:
+            await ws.send(json.dumps({"assets_ids": list(self.tokens), "type": "market"}))
+        except Exception as e:
+            logger.debug(f"Game market subscription deferred: {e}")
+    
+    async def _price_loop(self):
+        while True:
+            try:
+                async with websockets.connect(self.WS_URL) as ws:
+                    self.ws = ws
+                    if self.tokens:
+                        await self._send_subscription(ws)
+                    async for message in ws:
+                        self.on_message(message)
+            except Exception as e:
+                logger.warning(f"Game market price stream: {e}")
+                self.stats["errors"] += 1
+            self.ws = None
+            await asyncio.sleep(5)
+    
+    def on_message(self, message):
+        """Best ask per tick of a registered token -> engine.update_price"""
+        try:
+            data = _loads(message)
+        except ValueError:
+            return
+        
+        for event in data if isinstance(data, list) else [data]:
+            event_type = event.get("event_type")
+            if event_type == "book":
+                asks = event.get("asks") or event.get("sells") or []
+                if asks:
+                    self._price(event.get("asset_id"), min(float(a["price"]) for a in asks))
+            elif event_type == "price_change":
+                for change in event.get("price_changes", []):
+                    self._price(change.get("asset_id"), change.get("best_ask") or change.get("price"))
+            elif event_type == "last_trade_price":
+                self._price(event.get("asset_id"), event.get("price"))
+    
+    def _price(self, token_id: Optional[str], price):
+        if token_id in self.tokens and price is not None:
+            self.engine.update_price(token_id, float(price))
+            self.stats["ticks"] += 1
+    
+    def get_stats(self) -> Dict:
+        return {**self.stats, "pending_games": len(self.pending), "tokens": len(self.tokens)}
+
+
 # ============================================================================
 # SPEED METRICS
 # ============================================================================
@@ -14,7 +14,6 @@ PROPS COVERED:
 - Super Bowl Props (First TD, Halftime Score, etc.)
 """
 
-import requests
 import json
 import time
 from datetime import datetime
@@ -22,6 +21,8 @@ from dataclasses import dataclass, field
 from typing import Dict, List, Optional, Tuple
 from collections import defaultdict
 
+from transport import http_session
+
 # ============================================================================
 # CONFIGURATION
 # ============================================================================
@@ -103,7 +104,7 @@ class PolymarketPropsScanner:
     GAMMA_API = "https://gamma-api.polymarket.com"
     
     def __init__(self):
-        self.session = requests.Session()
+        self.session = http_session()
         self.markets_cache = {}
         self.last_scan = None
     
@@ -237,7 +238,7 @@ class KalshiPropsScanner:
     
     def __init__(self, api_key: str = ""):
         self.api_key = api_key
-        self.session = requests.Session()
+        self.session = http_session()
     
     def scan_nfl_markets(self) -> List[PropMarket]:
         """Scan Kalshi NFL markets"""
@@ -302,7 +303,7 @@ class SportsBookScanner:
     
     def __init__(self, odds_api_key: str = ""):
         self.odds_api_key = odds_api_key
-        self.session = requests.Session()
+        self.session = http_session()
     
     def get_game_odds(self) -> List[PropMarket]:
         """Get upcoming game odds"""
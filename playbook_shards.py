@@ -0,0 +1,504 @@
+#!/usr/bin/env python3
+"""
+PLAYBOOK SHARDS - Multi-Process Playbook Evaluation
+====================================================
+Splits a large playbook set across worker processes so evaluation leaves
+the whale-detection thread. The caller only enqueues the event; a sender
+thread broadcasts it to every shard over a pipe, each shard evaluates its
+slice with the usual index / gating / cooldown logic, and a receiver
+thread applies the matches to the parent PlaybookManager.
+
+FEATURES:
+- Playbooks sharded by stable hash of their id (crc32 % workers)
+- Each event pickled once and broadcast to all shards
+- Shards keep their own cooldown / max_executions state in lockstep with
+  the parent (same clock, same matches)
+- Per-event deadline: replies after it are applied but counted as late
+- Per-playbook counters (matches, gating, rejects, latency) reported back
+  by the shards and merged into get_metrics()
+- A dead shard switches evaluation back in-process (get_stats()["failed"]);
+  the submit queue is bounded and overflow is counted as dropped
+- Edits picked up automatically (add_playbook invalidates the index) or
+  via sync()
+- Throughput scales with cores past ~10k playbooks; below that the pipe
+  round trip costs more than evaluating in-process
+
+TIME_BASED fire timers stay in the parent (run_timers), since anchors are
+only set there.
+
+USAGE:
+    from playbook_shards import ShardedEvaluator
+
+    shards = ShardedEvaluator(manager, workers=4, deadline_ms=50)
+    shards.on_actions(lambda actions, data, event_type: ...)
+    shards.start(asyncio.get_running_loop())   # Matches applied on the loop
+
+    shards.submit(whale_data, event_type="whale")   # Returns immediately
+    shards.get_metrics()                            # manager.get_metrics() + shard counters
+
+    shards.stop()
+
+    python playbook_shards.py --bench 20000 --workers 4
+"""
+
+import time
+import queue
+import pickle
+import zlib
+import threading
+import multiprocessing
+from multiprocessing.connection import wait
+from typing import Callable, Dict, List, Optional, Tuple
+import logging
+
+from playbooks import PlaybookManager, PlaybookScheduler, LatencyHistogram
+
+logger = logging.getLogger('PlaybookShards')
+
+
+METRICS_INTERVAL = 1.0   # Seconds between per-playbook counter reports from a shard
+QUEUE_MAX = 10_000       # Events waiting to be broadcast before submit() drops
+
+
+# ============================================================================
+# WORKER
+# ============================================================================
+
+def _load_shard(manager: PlaybookManager, records: List[Dict]):
+    """Replace the shard's playbooks, runtime state included
+
+    Instrumentation carries over for playbooks the shard already held, so
+    reported counters stay totals across syncs.
+    """
+    previous = dict(manager.playbooks)
+    manager.playbooks.clear()
+    manager.scheduler = PlaybookScheduler()
+    manager._index = None
+    for record in records:
+        manager._restore_playbook(record)
+
+    for playbook_id, playbook in manager.playbooks.items():
+        old = previous.get(playbook_id)
+        if old is not None:
+            playbook._gated = old._gated
+            playbook._matches = old._matches
+            playbook._rejected = old._rejected + sum(check.total_rejects for check in old._checks or ())
+            playbook._latency = old._latency
+
+
+def _report_metrics(conn, manager: PlaybookManager, reported: Dict[str, Tuple]):
+    """Send metrics() of every playbook evaluated since the last report"""
+    changed = {}
+    for playbook_id, playbook in manager.playbooks.items():
+        counts = (playbook._gated, playbook._matches,
+                  sum(check.total_rejects for check in playbook._checks or ()))
+        if reported.get(playbook_id) != counts:
+            reported[playbook_id] = counts
+            changed[playbook_id] = playbook.metrics()
+    if changed:
+        conn.send(("metrics", changed))
+
+
+def _shard_worker(conn, records: List[Dict]):
+    """Worker process: evaluate broadcast events against one shard
+
+    Messages in: ("event", seq, data, event_type, now), ("load", records),
+    ("stop",). Out: ("event", seq, matched playbook ids, seconds spent) per
+    event, and ("metrics", {playbook id: metrics()}) for playbooks whose
+    counters moved, at most every METRICS_INTERVAL.
+    """
+    logging.disable(logging.INFO)  # Triggers are logged by the parent
+
+    manager = PlaybookManager(None)
+    matched: List[str] = []
+    manager.on_playbook_triggered(lambda playbook, data: matched.append(playbook.id))
+    _load_shard(manager, records)
+
+    reported: Dict[str, Tuple] = {}
+    perf_counter = time.perf_counter
+    last_report = perf_counter()
+    while True:
+        try:
+            if not conn.poll(METRICS_INTERVAL):
+                _report_metrics(conn, manager, reported)  # Idle - flush the last burst
+                last_report = perf_counter()
+                continue
+            message = pickle.loads(conn.recv_bytes())
+        except (EOFError, OSError):
+            break
+
+        kind = message[0]
+        if kind == "event":
+            _, seq, data, event_type, now = message
+            start = perf_counter()
+            matched.clear()
+            manager.evaluate_playbooks(data, event_type, now)
+            conn.send(("event", seq, list(matched), perf_counter() - start))
+            if start - last_report >= METRICS_INTERVAL:
+                _report_metrics(conn, manager, reported)
+                last_report = start
+        elif kind == "load":
+            _load_shard(manager, message[1])
+        elif kind == "stop":
+            break
+
+
+# ============================================================================
+# SHARDED EVALUATOR
+# ============================================================================
+
+class ShardedEvaluator:
+    """Evaluate a PlaybookManager's playbooks on a pool of worker processes
+
+    The parent manager stays the source of truth for executions, timers,
+    persistence and callbacks - shards only decide which playbooks match.
+    Late replies are still applied (dropping them would let a shard's
+    cooldown drift from the parent's); the deadline is what get_stats()
+    reports against.
+
+    If a shard dies or its pipe breaks, the evaluator records why in
+    `failed` and evaluates queued and new events with the parent manager
+    instead (on the loop when there is one). Events in flight at that
+    moment are counted as lost.
+    """
+
+    def __init__(self, manager: PlaybookManager, workers: int = 0, deadline_ms: float = 50):
+        self.manager = manager
+        self.workers = workers or max(1, multiprocessing.cpu_count() - 1)
+        self.deadline = deadline_ms / 1000
+
+        self._conns = []
+        self._processes = []
+        self._queue: "queue.Queue[Optional[Tuple]]" = queue.Queue(QUEUE_MAX)
+        self._threads: List[threading.Thread] = []
+        self._loop = None
+        self._running = False
+        self.failed: Optional[str] = None
+
+        # seq -> [submitted_at, data, event_type, now, shards still to reply]
+        self._inflight: Dict[int, list] = {}
+        self._seq = 0
+
+        self.callbacks: List[Callable] = []
+        self.latency = LatencyHistogram()        # Submit -> last shard replied
+        self.shard_latency = [LatencyHistogram() for _ in range(self.workers)]
+        self.playbook_metrics: Dict[str, Dict] = {}   # Latest shard report per playbook
+        self.stats = {"submitted": 0, "evaluated": 0, "late_replies": 0,
+                      "matches": 0, "actions": 0, "syncs": 0,
+                      "dropped": 0, "lost": 0, "inline_evaluations": 0}
+
+    def _shard_of(self, playbook_id: str) -> int:
+        return zlib.crc32(playbook_id.encode()) % self.workers
+
+    def _shard_records(self) -> List[List[Dict]]:
+        records = [[] for _ in range(self.workers)]
+        for playbook_id in self.manager.playbooks:
+            records[self._shard_of(playbook_id)].append(self.manager.record("playbooks", playbook_id))
+        return records
+
+    def start(self, loop=None):
+        """Spawn the workers. With an asyncio loop, matches are applied on it"""
+        if self._threads:
+            return
+
+        self._loop = loop
+        context = multiprocessing.get_context("spawn")
+        self.manager.reindex()  # Marks the current playbook set as synced
+
+        for shard, records in enumerate(self._shard_records()):
+            parent_conn, child_conn = context.Pipe()
+            process = context.Process(target=_shard_worker, args=(child_conn, records),
+                                      name=f"playbook-shard-{shard}", daemon=True)
+            process.start()
+            child_conn.close()
+            self._conns.append(parent_conn)
+            self._processes.append(process)
+
+        self._running = True
+        self._threads = [
+            threading.Thread(target=self._send_loop, name="playbook-shards-send", daemon=True),
+            threading.Thread(target=self._receive_loop, name="playbook-shards-recv", daemon=True)
+        ]
+        for thread in self._threads:
+            thread.start()
+
+        logger.info(f"Sharded {len(self.manager.playbooks)} playbooks across "
+                    f"{self.workers} worker processes")
+
+    def stop(self):
+        """Stop the workers (events still queued are dropped)"""
+        if not self._threads:
+            return
+        self._running = False
+        try:
+            while True:
+                self._queue.get_nowait()
+        except queue.Empty:
+            pass
+        self._queue.put(None)
+        for thread in self._threads:
+            thread.join(timeout=2)
+
+        for conn, process in zip(self._conns, self._processes):
+            try:
+                conn.send_bytes(pickle.dumps(("stop",)))
+            except OSError:
+                pass
+            process.join(timeout=2)
+            if process.is_alive():
+                process.terminate()
+            conn.close()
+
+        self._conns.clear()
+        self._processes.clear()
+        self._threads.clear()
+
+    def submit(self, data: Dict, event_type: Optional[str] = None, now: Optional[float] = None):
+        """Queue an event for evaluation - returns immediately"""
+        self.stats["submitted"] += 1
+        try:
+            self._queue.put_nowait((data, event_type, time.time() if now is None else now,
+                                    time.perf_counter()))
+        except queue.Full:
+            self.stats["dropped"] += 1
+            if self.stats["dropped"] % 1000 == 1:
+                logger.warning(f"Playbook shard queue full ({QUEUE_MAX}) - "
+                               f"{self.stats['dropped']} events dropped")
+
+    def sync(self):
+        """Resend every shard its playbooks (after editing them in place)"""
+        self.manager._index = None
+
+    def on_actions(self, callback: Callable):
+        """Register callback(actions, data, event_type) for matched playbooks"""
+        self.callbacks.append(callback)
+
+    # ------------------------------------------------------------------
+    # Dispatch threads
+    # ------------------------------------------------------------------
+
+    def _send_loop(self):
+        while True:
+            item = self._queue.get()
+            if item is None:
+                break
+            if self.failed:
+                self._dispatch(self._evaluate_inline, *item[:3])
+                continue
+
+            try:
+                # add_playbook() and friends drop the parent's index on edits
+                if self.manager._index is None:
+                    self.manager.reindex()
+                    for conn, records in zip(self._conns, self._shard_records()):
+                        conn.send_bytes(pickle.dumps(("load", records), pickle.HIGHEST_PROTOCOL))
+                    self.stats["syncs"] += 1
+
+                data, event_type, now, submitted_at = item
+                self._seq += 1
+                self._inflight[self._seq] = [submitted_at, data, event_type, now, self.workers]
+
+                payload = pickle.dumps(("event", self._seq, data, event_type, now),
+                                       pickle.HIGHEST_PROTOCOL)
+                for conn in self._conns:
+                    conn.send_bytes(payload)
+            except OSError as e:
+                if not self._running:
+                    return
+                self._fail(f"pipe failed: {e}")
+                self._dispatch(self._evaluate_inline, *item[:3])
+
+    def _receive_loop(self):
+        shard_of_conn = {conn: shard for shard, conn in enumerate(self._conns)}
+        while self._running:
+            for conn in wait(self._conns, timeout=0.1):
+                try:
+                    message = conn.recv()
+                except (EOFError, OSError):
+                    if self._running:
+                        self._fail(f"shard {shard_of_conn[conn]} died")
+                    return
+                if message[0] == "metrics":
+                    self.playbook_metrics.update(message[1])
+                    continue
+                _, seq, matched, elapsed = message
+                self.shard_latency[shard_of_conn[conn]].record(elapsed)
+                self._on_reply(seq, matched)
+
+    def _fail(self, reason: str):
+        """Give up on the shards - the send thread evaluates in-process from now on"""
+        if self.failed:
+            return
+        self.failed = reason
+        self._running = False
+        self.stats["lost"] += len(self._inflight)
+        self._inflight.clear()
+        logger.error(f"Playbook sharding failed ({reason}) - evaluating in-process")
+
+    def _dispatch(self, fn: Callable, *args):
+        """Run fn on the loop when there is one, else on this thread"""
+        if self._loop is not None:
+            self._loop.call_soon_threadsafe(fn, *args)
+        else:
+            fn(*args)
+
+    def _on_reply(self, seq: int, matched: List[str]):
+        entry = self._inflight.get(seq)
+        if entry is None:  # Counted as lost by _fail()
+            return
+        submitted_at, data, event_type, now, _ = entry
+        waited = time.perf_counter() - submitted_at
+        if waited > self.deadline:
+            self.stats["late_replies"] += 1
+
+        entry[4] -= 1
+        if entry[4] == 0:
+            del self._inflight[seq]
+            self.stats["evaluated"] += 1
+            self.latency.record(waited)
+
+        if matched:
+            self._dispatch(self._apply, matched, data, event_type, now)
+
+    def _apply(self, matched: List[str], data: Dict, event_type: Optional[str], now: float):
+        """Execute shard matches on the parent's playbooks"""
+        actions = []
+        for playbook_id in matched:
+            playbook = self.manager.playbooks.get(playbook_id)
+            if playbook is None:  # Removed since the event was sent
+                continue
+            logger.info(f"✅ Playbook triggered: {playbook.name}")
+            actions.extend(self.manager._execute(playbook, data, now))
+
+        self.stats["matches"] += len(matched)
+        self._emit(actions, data, event_type)
+
+    def _evaluate_inline(self, data: Dict, event_type: Optional[str], now: float):
+        """Fallback after a shard failure: the parent evaluates everything"""
+        self.stats["inline_evaluations"] += 1
+        self._emit(self.manager.evaluate_playbooks(data, event_type, now), data, event_type)
+
+    def _emit(self, actions: List, data: Dict, event_type: Optional[str]):
+        self.stats["actions"] += len(actions)
+        for callback in self.callbacks:
+            try:
+                callback(actions, data, event_type)
+            except Exception as e:
+                logger.error(f"Shard actions callback error: {e}")
+
+    def get_metrics(self) -> Dict:
+        """manager.get_metrics() with the shards' evaluation counters merged in
+
+        Executions and actions are the parent's own; evaluations, gating
+        and matches add up the shards' reports and any in-process
+        evaluation after a failure. Conditions and latency come from
+        whichever side evaluated the playbook more.
+        """
+        metrics = self.manager.get_metrics()
+        playbooks = metrics["playbooks"]
+        for playbook_id, remote in list(self.playbook_metrics.items()):
+            local = playbooks.get(playbook_id)
+            if local is None:  # Removed since the report
+                continue
+            reached = (local["evaluations"] - local["gated"]) + (remote["evaluations"] - remote["gated"])
+            matches = local["matches"] + remote["matches"]
+            detail = remote if remote["evaluations"] >= local["evaluations"] else local
+            playbooks[playbook_id] = {
+                **local,
+                "evaluations": local["evaluations"] + remote["evaluations"],
+                "gated": local["gated"] + remote["gated"],
+                "matches": matches,
+                "match_rate": round(matches / reached, 4) if reached else 0.0,
+                "conditions": detail["conditions"],
+                "latency": detail["latency"]
+            }
+        return metrics
+
+    def get_stats(self) -> Dict:
+        return {
+            **self.stats,
+            "failed": self.failed,
+            "workers": self.workers,
+            "deadline_ms": self.deadline * 1000,
+            "queued": self._queue.qsize(),
+            "inflight": len(self._inflight),
+            "latency": self.latency.to_dict(),
+            "shard_latency": [hist.to_dict() for hist in self.shard_latency]
+        }
+
+
+# ============================================================================
+# CLI
+# ============================================================================
+
+def main():
+    import argparse
+    import json
+    import random
+    from playbooks import Playbook, PlaybookType, Condition, ConditionOperator, Action, ActionType
+
+    parser = argparse.ArgumentParser(description="Apollo Edge Playbook Shards")
+    parser.add_argument("--bench", type=int, default=20_000, help="Playbooks to shard")
+    parser.add_argument("--workers", type=int, default=4, help="Worker processes")
+    parser.add_argument("--events", type=int, default=2_000, help="Whale events to evaluate")
+
+    args = parser.parse_args()
+    logging.disable(logging.INFO)
+
+    def build() -> PlaybookManager:
+        rnd = random.Random(3)
+        manager = PlaybookManager(None)
+        for i in range(args.bench):
+            manager.add_playbook(Playbook(
+                f"pb_{i}", f"Playbook {i}", "", PlaybookType.WHALE_FOLLOW,
+                conditions=[
+                    Condition("whale_size", ConditionOperator.GREATER_THAN, rnd.uniform(1e4, 1e6)),
+                    Condition("whale_confidence", ConditionOperator.GREATER_THAN, rnd.uniform(50, 99)),
+                    Condition("market_name", ConditionOperator.CONTAINS,
+                              rnd.choice(["chiefs", "bills", "eagles"]))
+                ],
+                actions=[Action(ActionType.ALERT)],
+                cooldown_seconds=60
+            ))
+        return manager
+
+    # One whale a second of simulated time, so cooldowns expire as live
+    rnd = random.Random(4)
+    t0 = time.time()
+    events = [({"whale_size": rnd.uniform(1e3, 1e6), "whale_confidence": rnd.uniform(0, 100),
+                "market_name": rnd.choice(["chiefs ml", "bills ml", "jets ml"])}, t0 + i)
+              for i in range(args.events)]
+
+    manager = build()
+    start = time.perf_counter()
+    for event, now in events:
+        manager.evaluate_playbooks(event, "whale", now)
+    inline = time.perf_counter() - start
+
+    shards = ShardedEvaluator(build(), workers=args.workers, deadline_ms=50)
+    shards.start()
+    shards.submit({}, "whale", t0 - 1)  # Wait for the workers to come up
+    while shards.stats["evaluated"] < 1:
+        time.sleep(0.01)
+
+    start = time.perf_counter()
+    for event, now in events:
+        shards.submit(event, "whale", now)
+    enqueue = time.perf_counter() - start
+    while shards.stats["evaluated"] < len(events) + 1:
+        time.sleep(0.001)
+    sharded = time.perf_counter() - start
+
+    stats = shards.get_stats()
+    shards.stop()
+
+    stats.pop("shard_latency")
+    print(json.dumps(stats, indent=2))
+    print(f"[*] {args.bench:,} playbooks, {args.events:,} events")
+    print(f"[*] In-process: {args.events / inline:,.0f} events/s")
+    print(f"[*] {args.workers} shards:  {args.events / sharded:,.0f} events/s "
+          f"(enqueue {enqueue / args.events * 1e6:.1f} us/event)")
+
+
+if __name__ == "__main__":
+    main()
@@ -16,13 +16,27 @@ USAGE:
     python playbooks.py --create
 """
 
+import os
 import json
 import time
+import heapq
+import asyncio
+import atexit
+import threading
+import bisect
+import copy
+import operator
+import itertools
+import textwrap
+from collections import defaultdict
 from datetime import datetime, timedelta
-from dataclasses import dataclass, field, asdict
-from typing import Dict, List, Optional, Callable, Any
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional, Callable, Any, Iterable, Tuple
 from enum import Enum
 import logging
+from json.encoder import encode_basestring_ascii
+
+from journal import Journal
 
 # Setup logging
 logging.basicConfig(
@@ -67,6 +81,35 @@ class ActionType(Enum):
     CANCEL = "cancel"
 
 
+# Comparison operators bound once at compile time
+OPERATOR_FUNCS = {
+    ConditionOperator.GREATER_THAN: operator.gt,
+    ConditionOperator.LESS_THAN: operator.lt,
+    ConditionOperator.EQUAL: operator.eq,
+    ConditionOperator.NOT_EQUAL: operator.ne,
+    ConditionOperator.GREATER_EQUAL: operator.ge,
+    ConditionOperator.LESS_EQUAL: operator.le,
+}
+
+_MISSING = object()
+
+# Saved operator -> enum; older files stored the enum repr ("ConditionOperator.EQUAL")
+OPERATORS_BY_NAME = {
+    **{op.value: op for op in ConditionOperator},
+    **{str(op): op for op in ConditionOperator}
+}
+
+
+def _parse_time(value: Optional[str]) -> Optional[datetime]:
+    return datetime.fromisoformat(value) if value else None
+
+# Re-sort a playbook's checks by rejection count after this many rejections
+REORDER_EVERY = 256
+
+# Time each playbook's evaluation on one in this many events
+PROFILE_EVERY = 64
+
+
 # ============================================================================
 # DATA STRUCTURES
 # ============================================================================
@@ -104,6 +147,122 @@ class Condition:
             return actual in target
         
         return False
+    
+    def compile(self) -> Callable[[Dict], bool]:
+        """Specialized predicate equivalent to evaluate()
+        
+        The operator is bound up front, `contains` needles are lowercased
+        once and `in` targets become frozensets. Type mismatches count as
+        not met instead of raising.
+        """
+        field_name = self.field
+        
+        if self.operator == ConditionOperator.CONTAINS:
+            needle = str(self.value).lower()
+            
+            def predicate(data: Dict) -> bool:
+                actual = data.get(field_name, _MISSING)
+                return actual is not _MISSING and needle in str(actual).lower()
+        
+        elif self.operator == ConditionOperator.IN:
+            targets = self.value
+            if not isinstance(targets, str):  # Strings keep substring semantics
+                try:
+                    targets = frozenset(targets)
+                except TypeError:
+                    targets = tuple(targets)
+            
+            def predicate(data: Dict) -> bool:
+                actual = data.get(field_name, _MISSING)
+                try:
+                    return actual is not _MISSING and actual in targets
+                except TypeError:
+                    return False
+        
+        else:
+            compare = OPERATOR_FUNCS[self.operator]
+            target = self.value
+            
+            def predicate(data: Dict) -> bool:
+                actual = data.get(field_name, _MISSING)
+                try:
+                    return actual is not _MISSING and compare(actual, target)
+                except TypeError:
+                    return False
+        
+        return predicate
+    
+    def to_dict(self) -> Dict:
+        return {
+            "field": self.field,
+            "operator": self.operator.value,
+            "value": self.value
+        }
+    
+    @classmethod
+    def from_dict(cls, data: Dict) -> "Condition":
+        op = OPERATORS_BY_NAME.get(data["operator"])
+        if op is None:
+            raise ValueError(f"Unknown operator: {data['operator']}")
+        return cls(field=data["field"], operator=op, value=data["value"])
+
+
+class CompiledCheck:
+    """Compiled condition plus how often it rejected an event"""
+    __slots__ = ("predicate", "condition", "rejects", "decayed")
+    
+    def __init__(self, condition: Condition):
+        self.predicate = condition.compile()
+        self.condition = condition
+        self.rejects = 0   # Decayed - drives reordering
+        self.decayed = 0   # Rejections decayed away so far
+    
+    @property
+    def total_rejects(self) -> int:
+        return self.rejects + self.decayed
+
+
+class LatencyHistogram:
+    """Fixed-bucket latency histogram in microseconds"""
+    BOUNDS_US = (1, 2, 5, 10, 20, 50, 100, 200, 500, 1000, 2000, 5000, 10000, 50000)
+    __slots__ = ("counts", "count", "total_us", "max_us")
+    
+    def __init__(self):
+        self.counts = [0] * (len(self.BOUNDS_US) + 1)
+        self.count = 0
+        self.total_us = 0.0
+        self.max_us = 0.0
+    
+    def record(self, seconds: float):
+        us = seconds * 1e6
+        self.counts[bisect.bisect_left(self.BOUNDS_US, us)] += 1
+        self.count += 1
+        self.total_us += us
+        if us > self.max_us:
+            self.max_us = us
+    
+    def percentile(self, pct: float) -> float:
+        """Upper bound of the bucket holding the pct-th sample"""
+        target = self.count * pct / 100
+        seen = 0
+        for bound, n in zip(self.BOUNDS_US, self.counts):
+            seen += n
+            if seen >= target:
+                return min(bound, self.max_us)
+        return self.max_us
+    
+    def to_dict(self) -> Dict:
+        buckets = {f"<={bound}us": n for bound, n in zip(self.BOUNDS_US, self.counts) if n}
+        if self.counts[-1]:
+            buckets[f">{self.BOUNDS_US[-1]}us"] = self.counts[-1]
+        return {
+            "count": self.count,
+            "mean_us": round(self.total_us / self.count, 2) if self.count else 0.0,
+            "p50_us": round(self.percentile(50), 2) if self.count else 0.0,
+            "p99_us": round(self.percentile(99), 2) if self.count else 0.0,
+            "max_us": round(self.max_us, 2),
+            "buckets": buckets
+        }
 
 
 @dataclass
@@ -117,6 +276,10 @@ class Action:
             "action_type": self.action_type.value,
             "params": self.params
         }
+    
+    @classmethod
+    def from_dict(cls, data: Dict) -> "Action":
+        return cls(action_type=ActionType(data["action_type"]), params=data.get("params", {}))
 
 
 @dataclass
@@ -139,43 +302,131 @@ class Playbook:
     max_executions: int = 100       # Max times to execute
     expire_at: Optional[datetime] = None
     
+    # TIME_BASED: fire relative to named instants, e.g.
+    # {"anchor": "kickoff", "offset_seconds": -1800} = 30 min before kickoff
+    schedule: List[Dict] = field(default_factory=list)
+    
     # Tracking
     execution_count: int = 0
     last_execution: Optional[datetime] = None
     total_pnl: float = 0
     created_at: datetime = field(default_factory=datetime.now)
     
-    def can_execute(self) -> bool:
+    # Compiled state (rebuilt by compile())
+    _checks: Optional[List[CompiledCheck]] = field(default=None, init=False, repr=False, compare=False)
+    _ready_at: float = field(default=0.0, init=False, repr=False, compare=False)
+    _expires_at: float = field(default=float("inf"), init=False, repr=False, compare=False)
+    _rejects: int = field(default=0, init=False, repr=False, compare=False)
+    
+    # Cleared by the manager's scheduler during cooldown / after expiry
+    _armed: bool = field(default=True, init=False, repr=False, compare=False)
+    
+    # Instrumentation (runtime only, see metrics())
+    _rejected: int = field(default=0, init=False, repr=False, compare=False)
+    _matches: int = field(default=0, init=False, repr=False, compare=False)
+    _gated: int = field(default=0, init=False, repr=False, compare=False)
+    _actions_emitted: int = field(default=0, init=False, repr=False, compare=False)
+    _latency: LatencyHistogram = field(default_factory=LatencyHistogram, init=False,
+                                       repr=False, compare=False)
+    
+    def __post_init__(self):
+        # Hot-path counters become instance attributes up front, in one order,
+        # so every playbook keeps the same (shared-key) attribute layout
+        self._checks = None
+        self._ready_at = 0.0
+        self._expires_at = float("inf")
+        self._rejects = self._rejected = self._matches = self._gated = 0
+        self._armed = True
+    
+    def compile(self):
+        """Compile conditions and timing gates - call again after editing them"""
+        # Per-condition counts start over, the playbook's total carries on
+        self._rejected += sum(check.total_rejects for check in self._checks or ())
+        self._checks = [CompiledCheck(condition) for condition in self.conditions]
+        self._ready_at = (self.last_execution.timestamp() + self.cooldown_seconds
+                          if self.last_execution else 0.0)
+        self._expires_at = self.expire_at.timestamp() if self.expire_at else float("inf")
+        self._rejects = 0
+    
+    def can_execute(self, now: Optional[float] = None) -> bool:
         """Check if playbook can be executed"""
-        if not self.enabled:
+        if not self.enabled or self.execution_count >= self.max_executions:
             return False
         
-        if self.execution_count >= self.max_executions:
-            return False
-        
-        if self.expire_at and datetime.now() > self.expire_at:
-            return False
+        if self._checks is None:
+            self.compile()
         
-        if self.last_execution:
-            elapsed = (datetime.now() - self.last_execution).total_seconds()
-            if elapsed < self.cooldown_seconds:
-                return False
+        if now is None:
+            now = time.time()
         
-        return True
+        # Not expired and out of cooldown
+        return self._ready_at <= now <= self._expires_at
     
-    def evaluate(self, data: Dict) -> bool:
+    def evaluate(self, data: Dict, now: Optional[float] = None) -> bool:
         """Check if all conditions are met"""
-        if not self.can_execute():
+        # Inlined can_execute() - this runs for every playbook on every event
+        if not self._armed or not self.enabled or self.execution_count >= self.max_executions:
+            self._gated += 1
+            return False
+        if self._checks is None:
+            self.compile()
+        if now is None:
+            now = time.time()
+        if not self._ready_at <= now <= self._expires_at:
+            self._gated += 1
             return False
         
-        return all(condition.evaluate(data) for condition in self.conditions)
+        for check in self._checks:
+            if not check.predicate(data):
+                check.rejects += 1
+                self._rejects += 1
+                if self._rejects >= REORDER_EVERY:
+                    self._reorder()
+                return False
+        
+        self._matches += 1
+        return True
     
-    def execute(self) -> List[Action]:
-        """Mark as executed and return actions"""
+    def _reorder(self):
+        """Most-rejecting checks first so misses short-circuit early"""
+        self._checks.sort(key=lambda check: check.rejects, reverse=True)
+        for check in self._checks:
+            # Decay so the order tracks recent traffic, banking what decays
+            check.decayed += check.rejects - check.rejects // 2
+            check.rejects //= 2
+        self._rejects = 0
+    
+    def execute(self, now: Optional[float] = None) -> List[Action]:
+        """Mark as executed (at `now`, epoch seconds - default wall clock) and return actions"""
         self.execution_count += 1
-        self.last_execution = datetime.now()
+        if now is None:
+            self.last_execution = datetime.now()
+            now = self.last_execution.timestamp()
+        else:
+            self.last_execution = datetime.fromtimestamp(now)
+        self._ready_at = now + self.cooldown_seconds
         return self.actions
     
+    def metrics(self) -> Dict:
+        """Evaluation counters since start (not persisted)"""
+        rejected = self._rejected + sum(check.total_rejects for check in self._checks or ())
+        evaluated = rejected + self._matches  # Reached the conditions
+        return {
+            "evaluations": evaluated + self._gated,
+            "gated": self._gated,              # Disabled / cooling down / expired / maxed out
+            "matches": self._matches,
+            "match_rate": round(self._matches / evaluated, 4) if evaluated else 0.0,
+            "executions": self.execution_count,
+            "actions_emitted": self._actions_emitted,
+            # Checks in current evaluation order and how often each ended it
+            "conditions": [
+                {"position": position, "field": check.condition.field,
+                 "operator": check.condition.operator.value, "rejects": check.total_rejects}
+                for position, check in enumerate(self._checks or ())
+            ],
+            "latency": self._latency.to_dict()   # Sampled, 1 event in PROFILE_EVERY
+        }
+    
     def to_dict(self) -> Dict:
         return {
             "id": self.id,
@@ -183,10 +434,36 @@ class Playbook:
             "description": self.description,
             "type": self.playbook_type.value,
             "enabled": self.enabled,
+            "cooldown_seconds": self.cooldown_seconds,
+            "max_executions": self.max_executions,
+            "expire_at": self.expire_at.isoformat() if self.expire_at else None,
+            "schedule": self.schedule,
             "execution_count": self.execution_count,
+            "last_execution": self.last_execution.isoformat() if self.last_execution else None,
             "total_pnl": self.total_pnl,
             "created_at": self.created_at.isoformat() if self.created_at else None
         }
+    
+    @classmethod
+    def from_dict(cls, data: Dict) -> "Playbook":
+        """Rebuild from a saved record (PlaybookManager.record)"""
+        return cls(
+            id=data["id"],
+            name=data["name"],
+            description=data.get("description", ""),
+            playbook_type=PlaybookType(data["type"]),
+            enabled=data.get("enabled", True),
+            conditions=[Condition.from_dict(c) for c in data.get("conditions", [])],
+            actions=[Action.from_dict(a) for a in data.get("actions", [])],
+            cooldown_seconds=data.get("cooldown_seconds", 60),
+            max_executions=data.get("max_executions", 100),
+            expire_at=_parse_time(data.get("expire_at")),
+            schedule=data.get("schedule", []),
+            execution_count=data.get("execution_count", 0),
+            last_execution=_parse_time(data.get("last_execution")),
+            total_pnl=data.get("total_pnl", 0),
+            created_at=_parse_time(data.get("created_at")) or datetime.now()
+        )
 
 
 @dataclass
@@ -206,19 +483,60 @@ class Watchlist:
     last_activity: Optional[datetime] = None
     activity_count: int = 0
     
+    # Normalized item -> item as added (built on first use), and the manager's index hook
+    _keys: Optional[Dict[str, str]] = field(default=None, init=False, repr=False, compare=False)
+    _on_change: Optional[Callable[["Watchlist", str, bool], None]] = field(
+        default=None, init=False, repr=False, compare=False)
+    
+    def __post_init__(self):
+        self.items = list(self.items)
+    
+    def _index(self) -> Dict[str, str]:
+        if self._keys is None:
+            # One C-level pass; reversed so the first spelling of an item wins
+            self._keys = dict(zip(map(str.lower, reversed(self.items)), reversed(self.items)))
+        return self._keys
+    
+    def keys(self) -> Iterable[str]:
+        """Normalized (lowercased) items"""
+        return self._index().keys()
+    
     def contains(self, item: str) -> bool:
         """Check if item is in watchlist"""
-        return item.lower() in [i.lower() for i in self.items]
+        return item.lower() in self._index()
     
     def add(self, item: str):
         """Add item to watchlist"""
-        if not self.contains(item):
-            self.items.append(item)
+        if self._add(item):
             logger.info(f"Added {item} to watchlist '{self.name}'")
     
+    def add_many(self, items: Iterable[str]) -> int:
+        """Bulk add (e.g. imported cluster memberships) - returns count added"""
+        added = sum(1 for item in items if self._add(item))
+        logger.info(f"Added {added:,} items to watchlist '{self.name}'")
+        return added
+    
+    def _add(self, item: str) -> bool:
+        key = item.lower()
+        keys = self._index()
+        if key in keys:
+            return False
+        keys[key] = item
+        self.items.append(item)
+        if self._on_change:
+            self._on_change(self, key, True)
+        return True
+    
     def remove(self, item: str):
         """Remove item from watchlist"""
-        self.items = [i for i in self.items if i.lower() != item.lower()]
+        key = item.lower()
+        keys = self._index()
+        if key not in keys:
+            return
+        del keys[key]
+        self.items = [i for i in self.items if i.lower() != key]
+        if self._on_change:
+            self._on_change(self, key, False)
     
     def to_dict(self) -> Dict:
         return {
@@ -228,8 +546,24 @@ class Watchlist:
             "type": self.watch_type,
             "items": self.items,
             "playbooks": self.playbooks,
-            "activity_count": self.activity_count
+            "activity_count": self.activity_count,
+            "last_activity": self.last_activity.isoformat() if self.last_activity else None,
+            "created_at": self.created_at.isoformat() if self.created_at else None
         }
+    
+    @classmethod
+    def from_dict(cls, data: Dict) -> "Watchlist":
+        return cls(
+            id=data["id"],
+            name=data["name"],
+            description=data.get("description", ""),
+            watch_type=data["type"],
+            items=data.get("items", []),
+            playbooks=data.get("playbooks", []),
+            created_at=_parse_time(data.get("created_at")) or datetime.now(),
+            last_activity=_parse_time(data.get("last_activity")),
+            activity_count=data.get("activity_count", 0)
+        )
 
 
 @dataclass
@@ -295,10 +629,22 @@ class ArbitrageRoute:
             "name": self.name,
             "buy_platform": self.buy_platform,
             "sell_platform": self.sell_platform,
+            "intermediate_steps": self.intermediate_steps,
+            "min_spread_pct": self.min_spread_pct,
+            "max_size_usd": self.max_size_usd,
+            "max_slippage_pct": self.max_slippage_pct,
             "execution_count": self.execution_count,
             "total_profit": self.total_profit,
             "avg_spread": self.avg_spread
         }
+    
+    @classmethod
+    def from_dict(cls, data: Dict) -> "ArbitrageRoute":
+        fields = ("intermediate_steps", "min_spread_pct", "max_size_usd", "max_slippage_pct",
+                  "execution_count", "total_profit", "avg_spread")
+        return cls(id=data["id"], name=data["name"], buy_platform=data["buy_platform"],
+                   sell_platform=data["sell_platform"],
+                   **{name: data[name] for name in fields if name in data})
 
 
 # ============================================================================
@@ -619,6 +965,565 @@ PRESET_WATCHLISTS = {
 }
 
 
+# ============================================================================
+# DISPATCH INDEX
+# ============================================================================
+
+# Playbook types that can react to each kind of event
+EVENT_PLAYBOOK_TYPES = {
+    "whale": {PlaybookType.WHALE_FOLLOW, PlaybookType.CLUSTER,
+              PlaybookType.MARKET_CONDITION, PlaybookType.COMBO},
+    "cluster": {PlaybookType.CLUSTER, PlaybookType.COMBO},
+    "market": {PlaybookType.MARKET_CONDITION, PlaybookType.ARBITRAGE, PlaybookType.COMBO},
+    "arbitrage": {PlaybookType.ARBITRAGE, PlaybookType.COMBO},
+    "time": {PlaybookType.TIME_BASED, PlaybookType.COMBO},
+}
+
+
+class _DispatchGroup:
+    """Playbooks of one type that reference exactly the same fields"""
+    
+    def __init__(self, fields: frozenset):
+        self.fields = fields
+        self.unindexed: List[Tuple[int, Playbook]] = []
+        # field -> [gt values, gt playbooks, ge values, ge playbooks], sorted by value
+        self.thresholds: Dict[str, List[list]] = {}
+    
+    def add(self, order: int, playbook: Playbook):
+        for condition in playbook.conditions:
+            value = condition.value
+            if (condition.operator in (ConditionOperator.GREATER_THAN, ConditionOperator.GREATER_EQUAL)
+                    and isinstance(value, (int, float)) and not isinstance(value, bool)):
+                lists = self.thresholds.setdefault(condition.field, [[], [], [], []])
+                offset = 0 if condition.operator == ConditionOperator.GREATER_THAN else 2
+                i = bisect.bisect_right(lists[offset], value)
+                lists[offset].insert(i, value)
+                lists[offset + 1].insert(i, (order, playbook))
+                return
+        
+        self.unindexed.append((order, playbook))
+    
+    def candidates(self, data: Dict, out: List[Tuple[int, Playbook]]):
+        out.extend(self.unindexed)
+        
+        for field_name, (gt_values, gt_playbooks, ge_values, ge_playbooks) in self.thresholds.items():
+            actual = data[field_name]
+            if not isinstance(actual, (int, float)):
+                continue  # Comparison would fail for every playbook here
+            
+            # Only thresholds the value actually crosses
+            out.extend(gt_playbooks[:bisect.bisect_left(gt_values, actual)])
+            out.extend(ge_playbooks[:bisect.bisect_right(ge_values, actual)])
+
+
+class PlaybookIndex:
+    """Routes an event to the playbooks that could possibly match it
+    
+    Playbooks are grouped by type and by the set of fields they reference;
+    a group is skipped unless the event carries all of its fields. Within
+    a group, playbooks are indexed by their first numeric `>`/`>=`
+    threshold, so an event only reaches the thresholds it crosses.
+    """
+    
+    def __init__(self, playbooks: Iterable[Playbook]):
+        self.by_type: Dict[PlaybookType, List[_DispatchGroup]] = defaultdict(list)
+        self.size = 0
+        
+        groups: Dict[Tuple[PlaybookType, frozenset], _DispatchGroup] = {}
+        for order, playbook in enumerate(playbooks):
+            fields = frozenset(condition.field for condition in playbook.conditions)
+            key = (playbook.playbook_type, fields)
+            if key not in groups:
+                groups[key] = _DispatchGroup(fields)
+                self.by_type[playbook.playbook_type].append(groups[key])
+            groups[key].add(order, playbook)
+            self.size += 1
+    
+    def candidates(self, data: Dict, event_type: Optional[str] = None) -> List[Tuple[int, Playbook]]:
+        """(registration order, playbook) pairs worth evaluating"""
+        keys = data.keys()
+        types = EVENT_PLAYBOOK_TYPES.get(event_type, self.by_type.keys()) if event_type else self.by_type.keys()
+        
+        out: List[Tuple[int, Playbook]] = []
+        for playbook_type in types:
+            for group in self.by_type.get(playbook_type, ()):
+                if group.fields <= keys:
+                    group.candidates(data, out)
+        return out
+
+
+# ============================================================================
+# SIGNAL QUEUE
+# ============================================================================
+
+class SignalQueue:
+    """Priority queue of SignalQueueItems, best score first
+    
+    Heap entries carry the score computed once at push time. Expired,
+    cancelled and superseded entries are left in the heap and skipped when
+    they surface (lazy deletion), so push, pop, cancel and update are all
+    O(log n).
+    """
+    
+    def __init__(self):
+        self._heap: List[list] = []          # [-score, seq, expires_ts, item]
+        self._live: Dict[str, list] = {}     # id -> current heap entry
+        self._seq = itertools.count()
+        self.stats = {"pushed": 0, "popped": 0, "expired": 0, "cancelled": 0}
+    
+    def __len__(self) -> int:
+        return len(self._live)
+    
+    def __iter__(self):
+        return iter(self.top(len(self._live)))
+    
+    def push(self, item: SignalQueueItem):
+        """Add a signal (replaces any queued signal with the same id)"""
+        old = self._live.pop(item.id, None)
+        if old:
+            old[3] = None  # Superseded
+        
+        entry = [-item.score, next(self._seq), item.expires_at.timestamp(), item]
+        heapq.heappush(self._heap, entry)
+        self._live[item.id] = entry
+        self.stats["pushed"] += 1
+        
+        if len(self._heap) > 2 * len(self._live) + 64:
+            self._compact()
+    
+    update = push
+    
+    def cancel(self, signal_id: str) -> bool:
+        entry = self._live.pop(signal_id, None)
+        if not entry:
+            return False
+        entry[3] = None
+        self.stats["cancelled"] += 1
+        return True
+    
+    def peek(self) -> Optional[SignalQueueItem]:
+        """Best live signal without removing it"""
+        self._prune(time.time())
+        return self._heap[0][3] if self._heap else None
+    
+    def pop(self) -> Optional[SignalQueueItem]:
+        """Remove and return the best live signal"""
+        self._prune(time.time())
+        if not self._heap:
+            return None
+        
+        item = heapq.heappop(self._heap)[3]
+        del self._live[item.id]
+        self.stats["popped"] += 1
+        return item
+    
+    def top(self, k: int) -> List[SignalQueueItem]:
+        """Best k live signals, best first, without removing them - O(k log n)"""
+        now = time.time()
+        heap = self._heap
+        result = []
+        
+        # Best-first walk over the heap tree
+        frontier = [(heap[0][0], heap[0][1], 0)] if heap else []
+        while frontier and len(result) < k:
+            _, _, i = heapq.heappop(frontier)
+            _, _, expires_ts, item = heap[i]
+            if item is not None and expires_ts >= now:
+                result.append(item)
+            
+            for child in (2 * i + 1, 2 * i + 2):
+                if child < len(heap):
+                    heapq.heappush(frontier, (heap[child][0], heap[child][1], child))
+        
+        return result
+    
+    def clear(self):
+        self._heap.clear()
+        self._live.clear()
+    
+    def _prune(self, now: float):
+        """Drop dead entries off the top of the heap"""
+        heap = self._heap
+        while heap:
+            _, _, expires_ts, item = heap[0]
+            if item is not None and expires_ts >= now:
+                return
+            heapq.heappop(heap)
+            if item is not None:
+                del self._live[item.id]
+                self.stats["expired"] += 1
+    
+    def _compact(self):
+        now = time.time()
+        for signal_id, entry in list(self._live.items()):
+            if entry[2] < now:
+                del self._live[signal_id]
+                self.stats["expired"] += 1
+        self._heap = list(self._live.values())
+        heapq.heapify(self._heap)
+    
+    def get_stats(self) -> Dict:
+        return {**self.stats, "queued": len(self._live), "heap_size": len(self._heap)}
+
+
+# ============================================================================
+# SCHEDULER
+# ============================================================================
+
+class PlaybookScheduler:
+    """Min-heap of playbook timers
+    
+    Kinds:
+        rearm  - cooldown over, the playbook takes events again
+        expire - expire_at reached, the playbook stops for good
+        fire   - a TIME_BASED playbook is due (anchor time + offset)
+    
+    Scheduling (kind, key) again supersedes the earlier timer; superseded
+    entries are skipped when they surface. Scheduling is O(log n) and an
+    idle tick is one comparison against the heap top.
+    """
+    
+    def __init__(self):
+        self._timers: List[Tuple] = []                 # (due, seq, kind, key, payload)
+        self._live: Dict[Tuple[str, Any], int] = {}    # (kind, key) -> seq of its live timer
+        self._seq = itertools.count()
+        self._lock = threading.Lock()
+        self.stats = {"scheduled": 0, "fired": 0, "superseded": 0}
+    
+    def at(self, due: float, kind: str, key: Any, payload: Any = None):
+        """Schedule (kind, key) at `due` (epoch seconds)"""
+        seq = next(self._seq)
+        with self._lock:
+            self._live[(kind, key)] = seq
+            heapq.heappush(self._timers, (due, seq, kind, key, payload))
+            self.stats["scheduled"] += 1
+    
+    def cancel(self, kind: str, key: Any):
+        with self._lock:
+            self._live.pop((kind, key), None)
+    
+    def next_due(self) -> Optional[float]:
+        timers = self._timers
+        return timers[0][0] if timers else None
+    
+    def pop_due(self, now: float) -> List[Tuple]:
+        """(due, kind, key, payload) of every live timer due by `now`, in order"""
+        due = []
+        with self._lock:
+            timers = self._timers
+            while timers and timers[0][0] <= now:
+                at, seq, kind, key, payload = heapq.heappop(timers)
+                if self._live.get((kind, key)) != seq:
+                    self.stats["superseded"] += 1
+                    continue
+                del self._live[(kind, key)]
+                due.append((at, kind, key, payload))
+            self.stats["fired"] += len(due)
+        return due
+    
+    def __len__(self) -> int:
+        return len(self._live)
+    
+    def get_stats(self) -> Dict:
+        return {**self.stats, "pending": len(self._live), "heap": len(self._timers)}
+
+
+# ============================================================================
+# PERSISTENCE
+# ============================================================================
+
+class PlaybookStore:
+    """Write-behind storage for PlaybookManager
+    
+    Mutations serialize the changed record on the thread that made them; a
+    timer writes the batch on a background thread `delay_ms` later, so
+    bursts of edits become one write, the trading thread never touches the
+    disk and the timer never reads the manager's live objects.
+    
+    Formats:
+        json - full snapshot assembled from the serialized records, written
+               to a temp file and atomically renamed. A watchlist's items are
+               kept apart from the rest of its record, so activity counters
+               don't re-serialize the items
+        log  - incremental: only changed records (and single watchlist
+               items) are appended to a compacting journal
+    
+    path=None keeps everything in memory (backtests).
+    """
+    
+    WATCH_ITEMS = "watch_items:"  # Log table prefix for a watchlist's items
+    KINDS = ("playbooks", "watchlists", "arb_routes")
+    ITEMS = "\0items\0"           # json: where a watchlist record's items go
+    
+    def __init__(self, manager: "PlaybookManager", path: Optional[str], fmt: str = "json",
+                 delay_ms: int = 250):
+        if fmt not in ("json", "log"):
+            raise ValueError(f"Unknown playbook storage format: {fmt}")
+        
+        self.manager = manager
+        self.path = path
+        self.fmt = fmt
+        self.delay = delay_ms / 1000
+        
+        # log: (kind, key) -> JSON text (None = deleted), ("watch_items", id) -> {key: item}
+        self._dirty: Dict[Tuple[str, str], Any] = {}
+        self._item_ops: List[Tuple] = []      # (watchlist id, key, item or None) in order
+        # json: kind -> key -> every record, in manager order, as a dict until
+        # first written and as JSON text after (watchlists: items replaced by
+        # ITEMS) and watchlist id -> items (a copied list, then text)
+        self._records: Dict[str, Dict[str, Any]] = {kind: {} for kind in self.KINDS}
+        self._watch_items: Dict[str, Any] = {}
+        self._changed = False
+        self._lock = threading.Lock()          # Guards the pending state
+        self._write_lock = threading.Lock()    # One flush at a time
+        self._timer: Optional[threading.Timer] = None
+        
+        self.journal = None
+        if path and fmt == "log":
+            self.journal = Journal(self.log_path(path), fsync_interval_ms=delay_ms)
+        
+        self.stats = {"flushes": 0, "records_written": 0, "last_flush_ms": 0.0}
+        if path:
+            atexit.register(self.close)
+    
+    @staticmethod
+    def log_path(path: str) -> str:
+        return os.path.splitext(path)[0] + ".journal"
+    
+    def _serialize(self, kind: str, key: str) -> Any:
+        record = self.manager.record(kind, key)
+        if record is None:
+            return None
+        if kind == "watchlists":
+            if self.fmt == "json":
+                return {**record, "items": self.ITEMS, "playbooks": list(record["playbooks"])}
+            record.pop("items")  # Kept item by item, see _write_items
+        return json.dumps(record, indent=2, default=str)
+    
+    def mark(self, kind: str, key: str):
+        """Record (kind, key) changed - serialized now, written on the next flush
+        
+        Call on the thread that owns the manager (the one that made the change).
+        """
+        if not self.path:
+            return
+        if kind == "watch_items":
+            watchlist = self.manager.watchlists.get(key)
+            if self.fmt == "log":
+                state = dict(watchlist._index()) if watchlist else {}
+            else:
+                state = list(watchlist.items) if watchlist else None
+        else:
+            state = self._serialize(kind, key)
+        
+        with self._lock:
+            if self.fmt == "log":
+                self._dirty[(kind, key)] = state
+            else:
+                records = self._watch_items if kind == "watch_items" else self._records[kind]
+                if state is None:
+                    records.pop(key, None)
+                else:
+                    records[key] = state
+                self._changed = True
+            self._schedule()
+    
+    def mark_item(self, watchlist_id: str, key: str, added: bool):
+        """Single watchlist item added/removed"""
+        if not self.path:
+            return
+        if self.fmt == "json":
+            self.mark("watch_items", watchlist_id)
+            return
+        
+        watchlist = self.manager.watchlists.get(watchlist_id)
+        item = watchlist._keys.get(key) if added and watchlist else None
+        with self._lock:
+            self._item_ops.append((watchlist_id, key, item))
+            self._schedule()
+    
+    def mark_all(self):
+        """Everything changed - rewrite every record"""
+        for kind in self.KINDS:
+            for key in list(getattr(self.manager, kind)):
+                self.mark(kind, key)
+        if self.fmt == "log":
+            for key in list(self.manager.watchlists):
+                self.mark("watch_items", key)
+    
+    def loaded(self, data: Dict):
+        """json: keep the records just read from playbooks.json, without writing
+        them back - they are encoded again only when the snapshot is rewritten"""
+        if not self.path or self.fmt != "json":
+            return
+        records = {kind: {} for kind in self.KINDS}
+        watch_items = {}
+        for kind in self.KINDS:
+            restored = getattr(self.manager, kind)
+            for record in data.get(kind, []):
+                key = record.get("id") if isinstance(record, dict) else None
+                if key not in restored:
+                    continue  # Skipped on restore
+                if kind == "watchlists":
+                    watch_items[key] = record.get("items", [])
+                    record = {**record, "items": self.ITEMS}
+                # Restored objects share nested lists/dicts with the record read
+                records[kind][key] = copy.deepcopy(record)
+        with self._lock:
+            self._records = records
+            self._watch_items = watch_items
+    
+    def _schedule(self):
+        if self._timer is None:
+            self._timer = threading.Timer(self.delay, self.flush)
+            self._timer.daemon = True
+            self._timer.start()
+    
+    def flush(self):
+        """Write everything marked so far"""
+        with self._write_lock:
+            # Take the batch and release the lock - marking never waits on disk
+            with self._lock:
+                if self._timer:
+                    self._timer.cancel()
+                    self._timer = None
+                dirty, self._dirty = self._dirty, {}
+                item_ops, self._item_ops = self._item_ops, []
+                changed, self._changed = self._changed, False
+                # Entries are replaced, never mutated - shallow copies are a consistent view
+                records = {kind: dict(entries) for kind, entries in self._records.items()}
+                watch_items = dict(self._watch_items)
+                written = (len(dirty) + len(item_ops) if self.fmt == "log"
+                           else sum(map(len, records.values())))
+            
+            if not dirty and not item_ops and not changed:
+                return
+            
+            start = time.perf_counter()
+            snapshot = None
+            try:
+                if self.fmt == "json":
+                    snapshot = self._snapshot_text(records, watch_items)
+                    self._write_snapshot(snapshot)
+                else:
+                    self._write_log(dirty, item_ops)
+            except Exception as e:
+                logger.error(f"Save error: {e}")
+                with self._lock:
+                    for record_key, state in dirty.items():
+                        self._dirty.setdefault(record_key, state)  # Newer marks win
+                    self._item_ops[:0] = item_ops
+                    self._changed = self._changed or changed
+                    self._schedule()
+                return
+            
+            self.stats["flushes"] += 1
+            self.stats["records_written"] += written
+            self.stats["last_flush_ms"] = round((time.perf_counter() - start) * 1000, 2)
+    
+    def _snapshot_text(self, records: Dict[str, Dict[str, Any]], watch_items: Dict[str, Any]) -> str:
+        """playbooks.json from the serialized records (same text json.dump(indent=2) gives)"""
+        placeholder = json.dumps(self.ITEMS)
+        encoded = []  # (entries, key, value, text) - kept until the value is replaced
+        sections = []
+        for kind in self.KINDS:
+            texts = []
+            for key, record in records[kind].items():
+                if not isinstance(record, str):
+                    text = json.dumps(record, indent=2, default=str)
+                    encoded.append((kind, key, record, text))
+                    record = text
+                text = textwrap.indent(record, "    ")
+                if kind == "watchlists":
+                    items = watch_items.get(key, ())
+                    if not isinstance(items, str):
+                        text_items = self._items_text(items)
+                        encoded.append(("watch_items", key, items, text_items))
+                        items = text_items
+                    text = text.replace(placeholder, items, 1)
+                texts.append(text)
+            if texts:
+                body = ",\n".join(texts)
+                sections.append(f'  "{kind}": [\n{body}\n  ]')
+            else:
+                sections.append(f'  "{kind}": []')
+        
+        with self._lock:
+            for kind, key, value, text in encoded:
+                entries = self._watch_items if kind == "watch_items" else self._records[kind]
+                if entries.get(key) is value:
+                    entries[key] = text
+        return "{\n" + ",\n".join(sections) + "\n}"
+    
+    @staticmethod
+    def _items_text(items: List[str]) -> str:
+        """A watchlist's items as they sit inside its record in playbooks.json"""
+        if not items:
+            return "[]"
+        return "[\n        " + ",\n        ".join(map(encode_basestring_ascii, items)) + "\n      ]"
+    
+    def _write_snapshot(self, text: str):
+        tmp_path = self.path + ".tmp"
+        with open(tmp_path, "w") as f:
+            f.write(text)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, self.path)
+        logger.debug(f"Saved playbooks to {self.path}")
+    
+    def _write_log(self, dirty: Dict[Tuple[str, str], Any], item_ops: List[Tuple]):
+        for (kind, key), state in dirty.items():
+            if kind == "watch_items":
+                self._write_items(key, state)
+            elif state is None:
+                self.journal.delete(kind, key)
+            else:
+                self.journal.put(kind, key, json.loads(state))
+        
+        # Single-item edits replay in order, so the last op per item wins
+        for watchlist_id, key, item in item_ops:
+            table = self.WATCH_ITEMS + watchlist_id
+            if item is not None:
+                self.journal.put(table, key, self._item_record(key, item))
+            else:
+                self.journal.delete(table, key)
+    
+    def _write_items(self, watchlist_id: str, current: Dict[str, str]):
+        """Sync a whole watchlist's item table with its state when marked"""
+        table = self.WATCH_ITEMS + watchlist_id
+        stored = self.journal.keys(table)
+        
+        for key in stored - current.keys():
+            self.journal.delete(table, key)
+        for key, item in current.items():
+            if key not in stored:
+                self.journal.put(table, key, self._item_record(key, item))
+    
+    @staticmethod
+    def _item_record(key: str, item: str) -> Dict:
+        return {"item": item} if item != key else {}
+    
+    def read_log(self) -> Dict:
+        """Saved state from the journal, in the playbooks.json layout"""
+        watchlists = []
+        for watchlist_id, record in self.journal.table("watchlists").items():
+            table = self.WATCH_ITEMS + watchlist_id
+            items = [record.get("item", key) for key, record in self.journal.table(table).items()]
+            watchlists.append({**record, "items": items})
+        
+        return {
+            "playbooks": list(self.journal.table("playbooks").values()),
+            "watchlists": watchlists,
+            "arb_routes": list(self.journal.table("arb_routes").values())
+        }
+    
+    def close(self):
+        atexit.unregister(self.close)
+        self.flush()
+        if self.journal:
+            self.journal.close()
+
+
 # ============================================================================
 # PLAYBOOK MANAGER
 # ============================================================================
@@ -626,13 +1531,32 @@ PRESET_WATCHLISTS = {
 class PlaybookManager:
     """Manages all playbooks and playlists"""
     
-    def __init__(self, storage_file: str = "playbooks.json"):
+    def __init__(self, storage_file: Optional[str] = "playbooks.json", storage_format: str = "json",
+                 write_delay_ms: int = 250):
         self.storage_file = storage_file
+        self.store = PlaybookStore(self, storage_file, storage_format, write_delay_ms)
         self.playbooks: Dict[str, Playbook] = {}
         self.watchlists: Dict[str, Watchlist] = {}
-        self.signal_queue: List[SignalQueueItem] = []
+        self.signal_queue = SignalQueue()
         self.arb_routes: Dict[str, ArbitrageRoute] = {}
         
+        self._index: Optional[PlaybookIndex] = None  # Rebuilt lazily after changes
+        
+        # watch_type -> normalized item -> id of the watchlist holding it
+        # (a set of ids once several watchlists share the item)
+        self._watch_index: Dict[str, Dict[str, Any]] = {}
+        self._unindexed: List[Watchlist] = []  # Restored, indexed on first lookup or edit
+        self.dispatch_stats = {"events": 0, "candidates": 0}
+        self.dispatch_latency: Dict[str, LatencyHistogram] = defaultdict(LatencyHistogram)
+        
+        # Cooldown / expiry / TIME_BASED timers, and named instants
+        # (anchor, key) -> (time, data) the schedules are relative to
+        self.scheduler = PlaybookScheduler()
+        self.anchors: Dict[Tuple[str, str], Tuple[float, Dict]] = {}
+        # run_timers' wake-up (thread-safe) and when it will wake on its own
+        self._timers_wakeup: Optional[Callable[[], None]] = None
+        self._timers_wake_at = float("inf")
+        
         self.callbacks = []
         
         self.load()
@@ -643,9 +1567,12 @@ class PlaybookManager:
     
     def add_playbook(self, playbook: Playbook):
         """Add playbook to manager"""
+        playbook.compile()
         self.playbooks[playbook.id] = playbook
+        self._index = None
+        self._schedule_playbook(playbook, time.time())
         logger.info(f"Added playbook: {playbook.name}")
-        self.save()
+        self.store.mark("playbooks", playbook.id)
     
     def load_preset_playbook(self, preset_id: str) -> Optional[Playbook]:
         """Load a preset playbook"""
@@ -653,6 +1580,9 @@ class PlaybookManager:
             logger.error(f"Unknown preset: {preset_id}")
             return None
         
+        if preset_id in self.playbooks:  # Restored from disk - keep its counters
+            return self.playbooks[preset_id]
+        
         preset = PRESET_PLAYBOOKS[preset_id]
         
         # Build conditions
@@ -680,27 +1610,225 @@ class PlaybookManager:
             conditions=conditions,
             actions=actions,
             cooldown_seconds=preset.get("cooldown", 60),
-            max_executions=preset.get("max_executions", 100)
+            max_executions=preset.get("max_executions", 100),
+            schedule=list(preset.get("schedule", []))
         )
         
         self.add_playbook(playbook)
         return playbook
     
-    def evaluate_playbooks(self, data: Dict) -> List[Action]:
-        """Evaluate all playbooks against data"""
+    def reindex(self):
+        """Rebuild the dispatch index (after editing playbook conditions)"""
+        self._index = PlaybookIndex(self.playbooks.values())
+    
+    def evaluate_playbooks(self, data: Dict, event_type: Optional[str] = None,
+                           now: Optional[float] = None) -> List[Action]:
+        """Evaluate playbooks that could match data
+        
+        event_type ("whale", "cluster", "market", "arbitrage", "time")
+        narrows dispatch to the playbook types that react to it. `now`
+        (epoch seconds) replaces the wall clock for replays.
+        """
+        started = time.perf_counter()
         actions_to_execute = []
+        if now is None:
+            now = time.time()
         
-        for playbook in self.playbooks.values():
-            if playbook.evaluate(data):
-                logger.info(f"✅ Playbook triggered: {playbook.name}")
-                actions = playbook.execute()
-                actions_to_execute.extend(actions)
-                
-                # Emit callback
-                self._emit_playbook_triggered(playbook, data)
+        # Replays have no timer task - the event clock drives the scheduler
+        next_due = self.scheduler.next_due()
+        if next_due is not None and next_due <= now:
+            actions_to_execute.extend(self.check_timers(now))
+        
+        if self._index is None:
+            self.reindex()
+        
+        candidates = self._index.candidates(data, event_type)
+        candidates.sort(key=operator.itemgetter(0))  # Registration order
+        
+        self.dispatch_stats["events"] += 1
+        self.dispatch_stats["candidates"] += len(candidates)
+        
+        perf_counter = time.perf_counter
+        if self.dispatch_stats["events"] % PROFILE_EVERY:
+            matched = [playbook for _, playbook in candidates if playbook.evaluate(data, now)]
+        else:
+            matched = []
+            for _, playbook in candidates:
+                start = perf_counter()
+                if playbook.evaluate(data, now):
+                    matched.append(playbook)
+                playbook._latency.record(perf_counter() - start)
         
+        for playbook in matched:
+            logger.info(f"✅ Playbook triggered: {playbook.name}")
+            actions_to_execute.extend(self._execute(playbook, data, now))
+        
+        self.dispatch_latency[event_type or "any"].record(perf_counter() - started)
         return actions_to_execute
     
+    def _execute(self, playbook: Playbook, data: Dict, now: float) -> List[Action]:
+        actions = playbook.execute(now)
+        playbook._actions_emitted += len(actions)
+        
+        # Park the playbook until its cooldown timer re-arms it
+        if playbook.execution_count >= playbook.max_executions:
+            playbook._armed = False
+        elif playbook.cooldown_seconds > 0:
+            playbook._armed = False
+            self.scheduler.at(playbook._ready_at, "rearm", playbook.id)
+            self._timer_added(playbook._ready_at)
+        
+        self.store.mark("playbooks", playbook.id)
+        self._emit_playbook_triggered(playbook, data)
+        return actions
+    
+    # ========================================================================
+    # TIMERS
+    # ========================================================================
+    
+    def _schedule_playbook(self, playbook: Playbook, now: float):
+        """Timers for a newly added / restored playbook"""
+        scheduler = self.scheduler
+        for kind in ("rearm", "expire"):
+            scheduler.cancel(kind, playbook.id)
+        
+        ready_at = (playbook.last_execution.timestamp() + playbook.cooldown_seconds
+                    if playbook.last_execution else 0.0)
+        expires_at = playbook.expire_at.timestamp() if playbook.expire_at else None
+        
+        if expires_at is not None and expires_at < now:
+            playbook._armed = False
+            return
+        
+        playbook._armed = ready_at <= now
+        if not playbook._armed:
+            scheduler.at(ready_at, "rearm", playbook.id)
+            self._timer_added(ready_at)
+        if expires_at is not None:
+            scheduler.at(expires_at, "expire", playbook.id)
+            self._timer_added(expires_at)
+        
+        if playbook.playbook_type == PlaybookType.TIME_BASED:
+            for (anchor, key), (anchor_at, data) in self.anchors.items():
+                self._schedule_fires(playbook, anchor, key, anchor_at, data, now)
+    
+    def _schedule_fires(self, playbook: Playbook, anchor: str, key: str,
+                        anchor_at: float, data: Dict, now: float):
+        for entry in playbook.schedule:
+            if entry.get("anchor") != anchor:
+                continue
+            offset = entry.get("offset_seconds", 0)
+            timer_key = (playbook.id, anchor, key, offset)
+            if anchor_at + offset >= now:
+                self.scheduler.at(anchor_at + offset, "fire", timer_key, data)
+                self._timer_added(anchor_at + offset)
+            else:
+                self.scheduler.cancel("fire", timer_key)
+    
+    def _timer_added(self, due: float):
+        """Wake run_timers early for a timer due before its current sleep ends"""
+        if due < self._timers_wake_at and self._timers_wakeup:
+            self._timers_wake_at = due
+            self._timers_wakeup()
+    
+    def set_anchor(self, anchor: str, at: float, key: str = "", data: Optional[Dict] = None,
+                   now: Optional[float] = None):
+        """Declare a named instant TIME_BASED playbooks schedule against
+        
+        e.g. set_anchor("kickoff", game_start_ts, key="KC@BUF", data={"market_id": ...}).
+        Setting the same (anchor, key) again reschedules its timers; offsets
+        already in the past (before `now`) are dropped.
+        """
+        data = data or {}
+        self.anchors[(anchor, key)] = (at, data)
+        now = time.time() if now is None else now
+        for playbook in self.playbooks.values():
+            if playbook.playbook_type == PlaybookType.TIME_BASED and playbook.schedule:
+                self._schedule_fires(playbook, anchor, key, at, data, now)
+    
+    def check_timers(self, now: Optional[float] = None,
+                     on_actions: Optional[Callable[[List[Action], Dict, str], None]] = None) -> List[Action]:
+        """Handle timers due by `now` - returns actions of fired TIME_BASED playbooks
+        
+        on_actions(actions, data, "timer") also gets each fire as it happens,
+        like the actions of an evaluated event.
+        """
+        now = time.time() if now is None else now
+        actions = []
+        
+        for due, kind, key, payload in self.scheduler.pop_due(now):
+            if kind == "fire":
+                playbook_id, anchor, anchor_key, offset = key
+                playbook = self.playbooks.get(playbook_id)
+                if playbook is None:
+                    continue
+                data = {**payload, "anchor": anchor, "anchor_key": anchor_key,
+                        "anchor_offset_seconds": offset, "scheduled_at": due}
+                if playbook.evaluate(data, due):
+                    logger.info(f"⏰ Playbook fired: {playbook.name} ({anchor} {offset:+d}s)")
+                    fired = self._execute(playbook, data, due)
+                    actions.extend(fired)
+                    if on_actions:
+                        on_actions(fired, data, "timer")
+                continue
+            
+            playbook = self.playbooks.get(key)
+            if playbook is None:
+                continue
+            if kind == "rearm":
+                expired = playbook.expire_at is not None and playbook.expire_at.timestamp() < due
+                playbook._armed = not expired
+            elif kind == "expire":
+                playbook._armed = False
+                logger.info(f"Playbook expired: {playbook.name}")
+        
+        return actions
+    
+    async def run_timers(self, running: Callable[[], bool],
+                         on_actions: Optional[Callable[[List[Action], Dict, str], None]] = None):
+        """Sleep until the next playbook timer and handle it (actions go to on_actions)
+        
+        A timer added for earlier than the sleep ends (an anchor, a cooldown)
+        cuts the sleep short.
+        """
+        loop = asyncio.get_running_loop()
+        changed = asyncio.Event()
+        self._timers_wakeup = lambda: loop.call_soon_threadsafe(changed.set)
+        try:
+            while running():
+                self.check_timers(on_actions=on_actions)
+                next_due = self.scheduler.next_due()
+                delay = 60 if next_due is None else max(0.01, min(60, next_due - time.time()))
+                changed.clear()
+                self._timers_wake_at = time.time() + delay
+                try:
+                    await asyncio.wait_for(changed.wait(), delay)
+                except asyncio.TimeoutError:
+                    pass
+        finally:
+            self._timers_wakeup = None
+            self._timers_wake_at = float("inf")
+    
+    def get_metrics(self) -> Dict:
+        """Dispatch latency per event type plus per-playbook counters"""
+        return {
+            "dispatch": {
+                **self.dispatch_stats,
+                "latency": {event_type: hist.to_dict()
+                            for event_type, hist in self.dispatch_latency.items()}
+            },
+            "timers": self.scheduler.get_stats(),
+            "playbooks": {playbook_id: playbook.metrics()
+                          for playbook_id, playbook in self.playbooks.items()}
+        }
+    
+    def dump_metrics(self, path: str, metrics: Optional[Dict] = None):
+        """Write get_metrics() (or metrics gathered elsewhere) as JSON (atomic replace)"""
+        tmp_path = path + ".tmp"
+        with open(tmp_path, "w") as f:
+            json.dump({"timestamp": time.time(), **(metrics or self.get_metrics())}, f, indent=2)
+        os.replace(tmp_path, path)
+    
     def get_playbook(self, playbook_id: str) -> Optional[Playbook]:
         return self.playbooks.get(playbook_id)
     
@@ -714,9 +1842,66 @@ class PlaybookManager:
     
     def add_watchlist(self, watchlist: Watchlist):
         """Add watchlist"""
-        self.watchlists[watchlist.id] = watchlist
+        if self._unindexed:
+            self._index_watchlists()
+        previous = self.watchlists.get(watchlist.id)
+        if previous:
+            previous._on_change = None
+            for key in previous.keys():
+                self._on_watch_item(previous, key, False)
+        
+        self._attach_watchlist(watchlist)
+        
         logger.info(f"Added watchlist: {watchlist.name}")
-        self.save()
+        self.store.mark("watchlists", watchlist.id)
+        self.store.mark("watch_items", watchlist.id)
+    
+    def _attach_watchlist(self, watchlist: Watchlist):
+        """Register and index a watchlist without persisting it"""
+        self.watchlists[watchlist.id] = watchlist
+        index = self._watch_index.setdefault(watchlist.watch_type, {})
+        
+        # Items no other watchlist holds go in with one C-level update
+        shared = watchlist.keys() & index.keys()
+        if shared:
+            index.update(dict.fromkeys(watchlist.keys() - shared, watchlist.id))
+            for key in shared:
+                self._on_watch_item(watchlist, key, True)
+        else:
+            index.update(dict.fromkeys(watchlist.keys(), watchlist.id))
+        
+        watchlist._on_change = self._on_watchlist_edit
+    
+    def _index_watchlists(self):
+        """Index the watchlists restored by load()"""
+        pending, self._unindexed = self._unindexed, []
+        for watchlist in pending:
+            if self.watchlists.get(watchlist.id) is watchlist:
+                self._attach_watchlist(watchlist)
+    
+    def _on_watchlist_edit(self, watchlist: Watchlist, key: str, added: bool):
+        if self._unindexed:
+            self._index_watchlists()
+        self._on_watch_item(watchlist, key, added)
+        self.store.mark_item(watchlist.id, key, added)
+    
+    def _on_watch_item(self, watchlist: Watchlist, key: str, added: bool):
+        """Keep the item -> watchlist index in step with watchlist edits"""
+        index = self._watch_index.setdefault(watchlist.watch_type, {})
+        ids = index.get(key)
+        if added:
+            if ids is None:
+                index[key] = watchlist.id
+            elif isinstance(ids, set):
+                ids.add(watchlist.id)
+            elif ids != watchlist.id:
+                index[key] = {ids, watchlist.id}
+        elif ids == watchlist.id:
+            del index[key]
+        elif isinstance(ids, set):
+            ids.discard(watchlist.id)
+            if len(ids) == 1:
+                index[key] = ids.pop()
     
     def load_preset_watchlist(self, preset_id: str) -> Optional[Watchlist]:
         """Load preset watchlist"""
@@ -724,6 +1909,9 @@ class PlaybookManager:
             logger.error(f"Unknown watchlist preset: {preset_id}")
             return None
         
+        if preset_id in self.watchlists:  # Restored from disk - keep its edits
+            return self.watchlists[preset_id]
+        
         preset = PRESET_WATCHLISTS[preset_id]
         
         watchlist = Watchlist(
@@ -731,20 +1919,30 @@ class PlaybookManager:
             name=preset["name"],
             description=preset["description"],
             watch_type=preset["type"],
-            items=preset["items"]
+            items=list(preset["items"])
         )
         
         self.add_watchlist(watchlist)
         return watchlist
     
     def check_watchlists(self, item_type: str, item_value: str) -> List[Watchlist]:
-        """Check if item is in any watchlists"""
+        """Check if item is in any watchlists (one index lookup)"""
+        if self._unindexed:
+            self._index_watchlists()
+        ids = self._watch_index.get(item_type, {}).get(item_value.lower())
+        if not ids:
+            return []
+        if isinstance(ids, str):
+            ids = (ids,)
+        
         matches = []
-        for wl in self.watchlists.values():
-            if wl.watch_type == item_type and wl.contains(item_value):
-                wl.activity_count += 1
-                wl.last_activity = datetime.now()
-                matches.append(wl)
+        now = datetime.now()
+        for watchlist_id in ids:
+            wl = self.watchlists[watchlist_id]
+            wl.activity_count += 1
+            wl.last_activity = now
+            matches.append(wl)
+            self.store.mark("watchlists", watchlist_id)
         return matches
     
     def list_watchlists(self) -> List[Dict]:
@@ -756,29 +1954,25 @@ class PlaybookManager:
     # ========================================================================
     
     def add_signal(self, signal: SignalQueueItem):
-        """Add signal to priority queue"""
-        # Remove expired signals
-        self.signal_queue = [s for s in self.signal_queue if not s.is_expired()]
-        
-        # Add new signal
-        self.signal_queue.append(signal)
-        
-        # Sort by score (highest first)
-        self.signal_queue.sort(key=lambda s: s.score, reverse=True)
-        
+        """Add signal to priority queue (same id replaces the queued one)"""
+        self.signal_queue.push(signal)
         logger.info(f"Added signal to queue: {signal.id} (score: {signal.score:.1f})")
     
+    def update_signal(self, signal: SignalQueueItem):
+        """Re-score / replace a queued signal"""
+        self.signal_queue.update(signal)
+    
+    def cancel_signal(self, signal_id: str) -> bool:
+        """Remove a queued signal by id"""
+        return self.signal_queue.cancel(signal_id)
+    
     def get_top_signals(self, limit: int = 10) -> List[SignalQueueItem]:
         """Get top N signals from queue"""
-        # Remove expired
-        self.signal_queue = [s for s in self.signal_queue if not s.is_expired()]
-        return self.signal_queue[:limit]
+        return self.signal_queue.top(limit)
     
     def pop_signal(self) -> Optional[SignalQueueItem]:
         """Get and remove top signal"""
-        if not self.signal_queue:
-            return None
-        return self.signal_queue.pop(0)
+        return self.signal_queue.pop()
     
     def clear_queue(self):
         """Clear all signals"""
@@ -792,7 +1986,7 @@ class PlaybookManager:
         """Add arbitrage route"""
         self.arb_routes[route.id] = route
         logger.info(f"Added arb route: {route.name}")
-        self.save()
+        self.store.mark("arb_routes", route.id)
     
     def get_route(self, route_id: str) -> Optional[ArbitrageRoute]:
         return self.arb_routes.get(route_id)
@@ -820,44 +2014,97 @@ class PlaybookManager:
     # PERSISTENCE
     # ========================================================================
     
-    def save(self):
-        """Save all data to file"""
-        try:
-            data = {
-                "playbooks": [
-                    {
-                        **pb.to_dict(),
-                        "conditions": [asdict(c) for c in pb.conditions],
-                        "actions": [a.to_dict() for a in pb.actions]
-                    }
-                    for pb in self.playbooks.values()
-                ],
-                "watchlists": [wl.to_dict() for wl in self.watchlists.values()],
-                "arb_routes": [route.to_dict() for route in self.arb_routes.values()]
+    def record(self, kind: str, key: str) -> Optional[Dict]:
+        """Serialized form of one playbook / watchlist / arb route (None if gone)"""
+        if kind == "playbooks":
+            pb = self.playbooks.get(key)
+            if pb is None:
+                return None
+            return {
+                **pb.to_dict(),
+                "conditions": [c.to_dict() for c in pb.conditions],
+                "actions": [a.to_dict() for a in pb.actions]
             }
-            
-            with open(self.storage_file, 'w') as f:
-                json.dump(data, f, indent=2, default=str)
-                
-            logger.debug(f"Saved playbooks to {self.storage_file}")
-        except Exception as e:
-            logger.error(f"Save error: {e}")
+        if kind == "watchlists":
+            wl = self.watchlists.get(key)
+            return wl.to_dict() if wl else None
+        route = self.arb_routes.get(key)
+        return route.to_dict() if route else None
+    
+    def snapshot(self) -> Dict:
+        """Everything, in the playbooks.json layout"""
+        return {
+            kind: [self.record(kind, key) for key in list(getattr(self, kind))]
+            for kind in ("playbooks", "watchlists", "arb_routes")
+        }
+    
+    def save(self):
+        """Queue a write of everything (write-behind, returns immediately)"""
+        self.store.mark_all()
+    
+    def flush(self):
+        """Write pending changes now"""
+        self.store.flush()
+    
+    def close(self):
+        self.store.close()
     
     def load(self):
-        """Load data from file"""
+        """Restore playbooks, watchlists and arb routes with their runtime state
+        
+        Objects are attached directly - nothing is re-saved or logged per item.
+        """
+        if not self.storage_file:
+            return
+        
+        start = time.perf_counter()
         try:
-            with open(self.storage_file, 'r') as f:
-                data = json.load(f)
-            
-            # Load playbooks (simplified - full reconstruction needed)
-            logger.info(f"Loaded {len(data.get('playbooks', []))} playbooks")
-            logger.info(f"Loaded {len(data.get('watchlists', []))} watchlists")
-            logger.info(f"Loaded {len(data.get('arb_routes', []))} arb routes")
-            
+            data = self.store.read_log() if self.store.fmt == "log" else None
+            migrate = data is not None  # Log format starting from a playbooks.json
+            if not data or not any(data.values()):
+                with open(self.storage_file, 'r') as f:
+                    data = json.load(f)
+            else:
+                migrate = False
         except FileNotFoundError:
             logger.info("No saved playbooks found, starting fresh")
+            return
         except Exception as e:
             logger.error(f"Load error: {e}")
+            return
+        
+        for kind, restore in (("playbooks", self._restore_playbook),
+                              ("watchlists", self._restore_watchlist),
+                              ("arb_routes", self._restore_route)):
+            for record in data.get(kind, []):
+                try:
+                    restore(record)
+                except (KeyError, ValueError, TypeError) as e:
+                    logger.warning(f"Skipping saved {kind[:-1]} {record.get('id')}: {e}")
+        
+        self._index = None
+        if migrate:
+            self.save()
+        else:
+            self.store.loaded(data)  # json snapshots are built from the records as read
+        
+        logger.info(f"Restored {len(self.playbooks)} playbooks, {len(self.watchlists)} watchlists, "
+                    f"{len(self.arb_routes)} arb routes in {(time.perf_counter() - start) * 1000:.1f}ms")
+    
+    def _restore_playbook(self, record: Dict):
+        playbook = Playbook.from_dict(record)  # Compiled on first evaluate
+        self.playbooks[playbook.id] = playbook
+        self._schedule_playbook(playbook, time.time())
+    
+    def _restore_watchlist(self, record: Dict):
+        watchlist = Watchlist.from_dict(record)  # Indexed on first lookup or edit
+        self.watchlists[watchlist.id] = watchlist
+        watchlist._on_change = self._on_watchlist_edit
+        self._unindexed.append(watchlist)
+    
+    def _restore_route(self, record: Dict):
+        route = ArbitrageRoute.from_dict(record)
+        self.arb_routes[route.id] = route
 
 
 # ============================================================================
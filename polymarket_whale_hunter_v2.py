@@ -9,7 +9,6 @@ python polymarket_whale_hunter_v2.py --market "super-bowl" --min-position 10000
 python polymarket_whale_hunter_v2.py --whale-address 0x123... --trace
 """
 
-import requests
 import json
 import time
 import argparse
@@ -17,6 +16,8 @@ from datetime import datetime
 from collections import defaultdict
 from typing import Dict, List, Optional
 
+from transport import http_session
+
 # Import multi-chain tracer
 try:
     from multichain_whale_tracer import (
@@ -32,7 +33,7 @@ POLYMARKET_CLOB_API = "https://clob.polymarket.com"
 
 class PolymarketClient:
     def __init__(self):
-        self.session = requests.Session()
+        self.session = http_session()
         self.session.headers.update({"Accept": "application/json", "User-Agent": "WhaleHunter/2.0"})
     
     def search_markets(self, query: str, limit: int = 50) -> List[Dict]:
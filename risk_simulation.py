@@ -0,0 +1,323 @@
+#!/usr/bin/env python3
+"""
+PORTFOLIO RISK SIMULATION - Monte Carlo over Binary Positions
+==============================================================
+Simulates the joint resolution of every open binary position and reports
+tail risk, so five positions that all amount to "Chiefs win" are seen as
+one concentrated bet instead of five small ones.
+
+FEATURES:
+- Positions grouped by canonical event (same event = perfectly correlated)
+- Cross-market aliases (e.g. Polymarket + Kalshi moneylines on one game),
+  declared with alias() or derived per market by a resolver - see
+  polymarket_event_key() for the Gamma-metadata rules
+- Value-at-Risk, expected shortfall and exact worst case per event
+- 10^5 scenarios in tens of milliseconds (vectorized NumPy)
+- Pre-trade check: "would this order push VaR past the limit?"
+
+USAGE:
+    from risk_simulation import RiskSimulator
+
+    risk = RiskSimulator(scenarios=100_000, confidence=0.95,
+                         resolver=lambda market_id, outcome: polymarket_event_key(
+                             polymarket.get_market(market_id), market_id, outcome))
+    risk.alias("kalshi_KC_BUF", "Chiefs", "poly_KC_BUF", "Chiefs")
+    risk.resolve(market_id, "Chiefs")       # When a position opens (blocking lookup)
+
+    report = risk.simulate(portfolio.positions.values())
+    print(report["var"], report["expected_shortfall"], report["worst_by_event"])
+
+    reason = risk.check_order(portfolio.positions.values(), market_id, "Chiefs",
+                              size_usd=50, price=0.55, max_var_usd=30)
+
+    python risk_simulation.py --bench 100000
+"""
+
+import time
+from collections import defaultdict
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+import logging
+
+import numpy as np
+
+logger = logging.getLogger('RiskSimulation')
+
+
+OTHER = "__other__"  # Outcomes of an event we hold nothing on
+
+
+def polymarket_event_key(market: Optional[Dict], market_id: str, outcome: str) -> Optional[Tuple[str, str]]:
+    """(event, outcome) a Polymarket outcome pays out on, from Gamma market metadata
+
+    - "Yes" on a neg-risk leg (Super Bowl winner: Chiefs) -> (event, "Chiefs")
+    - A named side ("Chiefs" on Chiefs vs. Bills) -> (event, "Chiefs"), so the
+      moneyline and spread on one team count as one bet - overstating
+      concentration rather than hiding it
+    - "No", Over/Under and markets outside an event stay their own event
+
+    None when the metadata is missing (lookup failed - try again later).
+    """
+    if not market:
+        return None
+
+    events = market.get("events") or []
+    event_id = str(events[0].get("id") or events[0].get("slug") or "") if events else ""
+    label = outcome.strip()
+
+    if event_id and label.lower() == "yes" and market.get("negRisk") and market.get("groupItemTitle"):
+        return (event_id, market["groupItemTitle"].strip())
+    if event_id and label and label.lower() not in ("yes", "no", "over", "under"):
+        return (event_id, label)
+    return (market_id, outcome)
+
+
+class RiskSimulator:
+    """Monte Carlo P&L distribution of open binary positions
+
+    Each canonical event resolves to exactly one outcome, drawn with the
+    market-implied probabilities (current prices). A position pays its
+    shares if its outcome wins and nothing otherwise; scenario P&L is
+    measured against the current mark. Events are independent of each
+    other - correlation comes only from positions sharing an event.
+
+    Markets map to events through alias() or, for markets not aliased, a
+    resolver(market_id, outcome) -> (event, outcome) or None. The resolver
+    runs only from resolve() - call it when a position opens, off the event
+    loop - and its answers are cached (misses for negative_ttl seconds);
+    simulate() and check_order() only read the cache, so they never block
+    on I/O.
+    """
+
+    def __init__(self, scenarios: int = 100_000, confidence: float = 0.95,
+                 seed: Optional[int] = 7,
+                 resolver: Optional[Callable[[str, str], Optional[Tuple[str, str]]]] = None,
+                 negative_ttl: float = 300):
+        self.scenarios = scenarios
+        self.confidence = confidence
+        self.rng = np.random.default_rng(seed)
+
+        # (market_id, outcome) -> (canonical event, canonical outcome)
+        self.aliases: Dict[Tuple[str, str], Tuple[str, str]] = {}
+        self.resolver = resolver
+        self._resolved: Dict[Tuple[str, str], Tuple[str, str]] = {}
+        self._unresolved: Dict[Tuple[str, str], float] = {}   # -> monotonic time to retry
+        self.negative_ttl = negative_ttl
+
+        # Uniform draws reused across checks (common random numbers),
+        # event-major so each event's draws are contiguous
+        self._uniforms = np.empty((0, scenarios))
+
+        self.stats = {"simulations": 0, "last_ms": 0.0}
+
+    def alias(self, market_id: str, outcome: str, event: str, event_outcome: str):
+        """Declare that (market_id, outcome) pays out on (event, event_outcome)"""
+        self.aliases[(market_id, outcome)] = (event, event_outcome)
+
+    def canonical(self, market_id: str, outcome: str) -> Tuple[str, str]:
+        """(event, outcome) from aliases and resolved markets - no lookups"""
+        key = (market_id, outcome)
+        return self.aliases.get(key) or self._resolved.get(key) or key
+
+    def resolve(self, market_id: str, outcome: str) -> Tuple[str, str]:
+        """canonical(), asking the resolver about markets not known yet
+
+        Blocking when it does ask. A miss (unknown market, failed lookup)
+        is retried only after negative_ttl seconds.
+        """
+        key = (market_id, outcome)
+        event = self.aliases.get(key) or self._resolved.get(key)
+        if event is not None or self.resolver is None:
+            return event or key
+        if self._unresolved.get(key, 0.0) > time.monotonic():
+            return key
+
+        try:
+            event = self.resolver(market_id, outcome)
+        except Exception as e:
+            logger.debug(f"Event lookup for {market_id} failed: {e}")
+            event = None
+
+        if event is None:
+            self._unresolved[key] = time.monotonic() + self.negative_ttl
+            return key
+        self._resolved[key] = event
+        self._unresolved.pop(key, None)
+        return event
+
+    # ------------------------------------------------------------------
+    # Simulation
+    # ------------------------------------------------------------------
+
+    def _build(self, legs: Iterable[Tuple[str, str, float, float]]):
+        """Collapse legs into per-event outcome payoffs
+
+        Returns event names, outcome names, cumulative probability bounds
+        (E x K-1) and the P&L matrix (E x K): P&L of everything on the
+        event if outcome k wins.
+        """
+        shares_on = defaultdict(lambda: defaultdict(float))   # event -> outcome -> shares
+        marked = defaultdict(float)                           # event -> current value
+        prices = defaultdict(dict)                            # event -> outcome -> price
+        weighted = defaultdict(lambda: defaultdict(float))    # event -> outcome -> shares * price
+
+        for market_id, outcome, shares, price in legs:
+            event, event_outcome = self.canonical(market_id, outcome)
+            shares_on[event][event_outcome] += shares
+            marked[event] += shares * price
+            weighted[event][event_outcome] += shares * price
+            prices[event][event_outcome] = price
+
+        # Aliased legs quoted at different prices: share-weighted average
+        for event, by_outcome in weighted.items():
+            for event_outcome, value in by_outcome.items():
+                shares = shares_on[event][event_outcome]
+                if shares > 0:
+                    prices[event][event_outcome] = value / shares
+
+        events = list(shares_on.keys())
+        outcomes = []
+        for event in events:
+            names = list(prices[event].keys())
+            if sum(prices[event].values()) < 0.999:
+                names.append(OTHER)
+            outcomes.append(names)
+
+        width = max((len(names) for names in outcomes), default=1)
+        counts = np.array([len(names) for names in outcomes], dtype=int)
+        probs = np.zeros((len(events), width))
+        pnl = np.zeros((len(events), width))
+
+        for e, event in enumerate(events):
+            implied = [prices[event].get(name, 0.0) for name in outcomes[e]]
+            if outcomes[e][-1] == OTHER:
+                implied[-1] = 1 - sum(implied[:-1])
+            total = sum(implied)
+            for k, name in enumerate(outcomes[e]):
+                probs[e, k] = implied[k] / total if total > 0 else 1 / len(implied)
+                pnl[e, k] = shares_on[event].get(name, 0.0) - marked[event]
+
+        # Cumulative bounds between outcomes; padding columns can never win
+        bounds = np.cumsum(probs, axis=1)[:, :-1]
+        bounds[np.arange(width - 1)[None, :] >= counts[:, None] - 1] = np.inf
+
+        return events, outcomes, bounds, pnl
+
+    def _draws(self, n_events: int) -> np.ndarray:
+        if len(self._uniforms) < n_events:
+            extra = self.rng.random((n_events - len(self._uniforms), self.scenarios))
+            self._uniforms = np.vstack([self._uniforms, extra])
+        return self._uniforms
+
+    def _scenario_pnl(self, bounds: np.ndarray, pnl: np.ndarray) -> np.ndarray:
+        """Portfolio P&L in every scenario (vector of length `scenarios`)"""
+        n_events = pnl.shape[0]
+        if n_events == 0:
+            return np.zeros(self.scenarios)
+
+        # Winning outcome = number of cumulative bounds at or below the draw
+        uniforms = self._draws(n_events)
+        total = np.zeros(self.scenarios)
+        for e in range(n_events):
+            total += pnl[e].take(np.searchsorted(bounds[e], uniforms[e], side="right"))
+
+        return total
+
+    def _report(self, scenario_pnl: np.ndarray) -> Dict:
+        k = int((1 - self.confidence) * (len(scenario_pnl) - 1))
+        tail = np.partition(scenario_pnl, k)[:k + 1]
+        cutoff = tail[-1]
+        return {
+            "scenarios": len(scenario_pnl),
+            "confidence": self.confidence,
+            "expected_pnl": float(scenario_pnl.mean()),
+            "var": float(max(0.0, -cutoff)),
+            "expected_shortfall": float(max(0.0, -tail.mean())) if len(tail) else 0.0,
+            "worst_case": float(max(0.0, -scenario_pnl.min()))
+        }
+
+    def simulate(self, positions: Iterable, extra: Optional[List[Tuple[str, str, float, float]]] = None) -> Dict:
+        """Risk report for positions (objects with market_id, outcome,
+        size_shares, current_price) plus optional hypothetical legs"""
+        start = time.perf_counter()
+
+        legs = [(p.market_id, p.outcome, p.size_shares, p.current_price) for p in positions]
+        legs.extend(extra or [])
+        events, outcomes, bounds, pnl = self._build(legs)
+
+        report = self._report(self._scenario_pnl(bounds, pnl))
+
+        # Exact worst case per event - no sampling needed
+        worst = {}
+        for e, event in enumerate(events):
+            k = int(np.argmin(pnl[e, :len(outcomes[e])]))
+            worst[event] = {"loss": float(max(0.0, -pnl[e, k])), "if": outcomes[e][k]}
+        report["worst_by_event"] = dict(sorted(worst.items(), key=lambda kv: -kv[1]["loss"]))
+        report["events"] = len(events)
+
+        self.stats["simulations"] += 1
+        self.stats["last_ms"] = round((time.perf_counter() - start) * 1000, 2)
+        report["elapsed_ms"] = self.stats["last_ms"]
+        return report
+
+    def check_order(self, positions: Iterable, market_id: str, outcome: str,
+                    size_usd: float, price: float, max_var_usd: float) -> Optional[str]:
+        """Reason to reject if the order would push VaR past max_var_usd"""
+        if price <= 0:
+            return None
+
+        leg = (market_id, outcome, size_usd / price, price)
+        report = self.simulate(positions, extra=[leg])
+
+        if report["var"] > max_var_usd:
+            event = self.canonical(market_id, outcome)[0]
+            return (f"VaR{self.confidence * 100:.0f} ${report['var']:,.2f} would exceed "
+                    f"${max_var_usd:,.2f} (event {event} worst case "
+                    f"${report['worst_by_event'][event]['loss']:,.2f})")
+        return None
+
+    def get_stats(self) -> Dict:
+        return {**self.stats, "scenarios": self.scenarios, "aliases": len(self.aliases),
+                "resolved": len(self._resolved), "unresolved": len(self._unresolved)}
+
+
+# ============================================================================
+# CLI
+# ============================================================================
+
+def main():
+    import argparse
+    import json
+    from types import SimpleNamespace
+
+    parser = argparse.ArgumentParser(description="Portfolio Risk Simulation")
+    parser.add_argument("--bench", type=int, default=100_000, help="Scenarios to simulate")
+    parser.add_argument("--positions", type=int, default=50, help="Random open positions")
+    parser.add_argument("--events", type=int, default=15, help="Distinct events they map to")
+
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(1)
+    positions = [
+        SimpleNamespace(
+            market_id=f"game_{rng.integers(args.events)}",
+            outcome=str(rng.choice(["home", "away"])),
+            size_shares=float(rng.uniform(10, 200)),
+            current_price=float(rng.uniform(0.2, 0.8))
+        )
+        for _ in range(args.positions)
+    ]
+
+    risk = RiskSimulator(scenarios=args.bench)
+    risk.simulate(positions)  # Warm the draw cache
+
+    start = time.perf_counter()
+    report = risk.simulate(positions)
+    elapsed = (time.perf_counter() - start) * 1000
+
+    report["worst_by_event"] = dict(list(report["worst_by_event"].items())[:5])
+    print(json.dumps(report, indent=2))
+    print(f"[*] {args.bench:,} scenarios x {args.positions} positions in {elapsed:.1f}ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -13,7 +13,6 @@ python solana_bridge_tracer.py --polygon-address 0x123... --hops 5
 python solana_bridge_tracer.py --tx-hash 0xabc... --trace-back
 """
 
-import requests
 import json
 import time
 import argparse
@@ -22,6 +21,8 @@ from datetime import datetime
 from typing import Dict, List, Optional, Tuple
 from collections import defaultdict
 
+from transport import http_session
+
 # ============================================================================
 # CONFIGURATION
 # ============================================================================
@@ -78,7 +79,7 @@ class SolanaTracer:
     
     def __init__(self, rpc_url: str = SOLANA_RPC):
         self.rpc_url = rpc_url
-        self.session = requests.Session()
+        self.session = http_session()
         self.cache = {}
     
     def _rpc_call(self, method: str, params: list) -> Optional[Dict]:
@@ -465,7 +466,7 @@ class WormholeTracer:
     
     def __init__(self):
         self.api_base = "https://api.wormholescan.io/api/v1"
-        self.session = requests.Session()
+        self.session = http_session()
     
     def get_vaa_by_tx(self, tx_hash: str, chain: str = "polygon") -> Optional[Dict]:
         """Get VAA (Verified Action Approval) by transaction hash"""
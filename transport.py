@@ -0,0 +1,352 @@
+#!/usr/bin/env python3
+"""
+TRANSPORT - Shared, Pre-Warmed HTTP Clients
+============================================
+One place that turns the speed settings (connection pooling, keepalive,
+DNS caching, aggressive timeouts, retries) into real client configuration,
+so every module's requests / aiohttp traffic gets them.
+
+FEATURES:
+- All requests.Session objects from http_session() share one pooled
+  adapter - a connection opened by any client is reused by all of them
+- TCP keepalive on every socket, pool sized by CONNECTION_POOL_SIZE
+- Connect timeout capped at ARBITRAGE_TIMEOUT_MS (read timeouts stay the
+  caller's - none given means no read timeout, as with plain requests),
+  ARBITRAGE_MODE_RETRIES retries on connect errors / 5xx
+- DNS cache (DNS_CACHE_TTL_SECONDS) on the aiohttp connector; requests
+  resolves only when the pool opens a connection, and caches lookups too
+  only with TRANSPORT_GLOBAL_DNS_CACHE (patches socket.getaddrinfo for the
+  whole process) or an explicit enable_dns_cache()
+- aiohttp_session(): same settings for async clients
+- prewarm(): DNS + TLS to CLOB, Gamma, ESPN and Etherscan at startup, then
+  re-touches hosts before idle connections are dropped, so the first
+  request after a quiet spell is as fast as steady state
+
+USAGE:
+    import transport
+
+    session = transport.http_session({"Accept": "application/json"})
+    resp = session.get(url, params=params, timeout=15)
+
+    transport.prewarm()                                 # At startup
+
+    async with transport.aiohttp_session() as session:
+        await transport.prewarm_async(session, [transport.ESPN_HOST])
+
+    python transport.py --bench
+"""
+
+import time
+import socket
+import threading
+from dataclasses import dataclass, asdict
+from typing import Dict, Iterable, List, Optional
+from urllib.parse import urlsplit
+import logging
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+logger = logging.getLogger('Transport')
+
+try:
+    from config import (USE_CONNECTION_POOL, CONNECTION_POOL_SIZE, ENABLE_DNS_CACHE,
+                        DNS_CACHE_TTL_SECONDS, ARBITRAGE_MODE_RETRIES, ARBITRAGE_TIMEOUT_MS)
+except ImportError:
+    USE_CONNECTION_POOL = True
+    CONNECTION_POOL_SIZE = 50
+    ENABLE_DNS_CACHE = True
+    DNS_CACHE_TTL_SECONDS = 300
+    ARBITRAGE_MODE_RETRIES = 1
+    ARBITRAGE_TIMEOUT_MS = 2000
+
+try:
+    from config import TRANSPORT_KEEP_WARM_SECONDS
+except ImportError:
+    TRANSPORT_KEEP_WARM_SECONDS = 30  # Below typical server idle timeouts (0 = off)
+
+try:
+    from config import TRANSPORT_GLOBAL_DNS_CACHE
+except ImportError:
+    TRANSPORT_GLOBAL_DNS_CACHE = False  # Opt-in: patches socket.getaddrinfo process-wide
+
+
+CLOB_HOST = "https://clob.polymarket.com"
+GAMMA_HOST = "https://gamma-api.polymarket.com"
+ESPN_HOST = "https://site.api.espn.com"
+ESPN_CORE_HOST = "https://sports.core.api.espn.com"  # Play-by-play
+ETHERSCAN_HOST = "https://api.etherscan.io"
+
+PREWARM_HOSTS = [CLOB_HOST, GAMMA_HOST, ESPN_HOST, ETHERSCAN_HOST]
+
+
+# ============================================================================
+# SETTINGS
+# ============================================================================
+
+@dataclass
+class TransportSettings:
+    """What every client gets (config.py values)"""
+    connection_pooling: bool = USE_CONNECTION_POOL
+    pool_size: int = CONNECTION_POOL_SIZE
+    dns_cache: bool = ENABLE_DNS_CACHE
+    dns_cache_ttl: int = DNS_CACHE_TTL_SECONDS
+    global_dns_cache: bool = TRANSPORT_GLOBAL_DNS_CACHE   # requests lookups too, via socket
+    max_retries: int = ARBITRAGE_MODE_RETRIES
+    timeout_ms: int = ARBITRAGE_TIMEOUT_MS
+    tcp_keepalive: bool = True
+    keepalive_seconds: int = 75          # aiohttp idle connection lifetime
+    keep_warm_seconds: int = TRANSPORT_KEEP_WARM_SECONDS
+
+
+SETTINGS = TransportSettings()
+
+
+# ============================================================================
+# DNS CACHE
+# ============================================================================
+
+_getaddrinfo = socket.getaddrinfo
+_dns_cache: Dict[tuple, tuple] = {}  # args -> (expires, result)
+_dns_lock = threading.Lock()
+_dns_stats = {"hits": 0, "misses": 0}
+
+
+def _cached_getaddrinfo(*args, **kwargs):
+    key = args + tuple(sorted(kwargs.items()))
+    now = time.monotonic()
+    entry = _dns_cache.get(key)
+    if entry is not None and entry[0] > now:
+        _dns_stats["hits"] += 1
+        return entry[1]
+
+    result = _getaddrinfo(*args, **kwargs)  # Failures are not cached
+    _dns_stats["misses"] += 1
+    with _dns_lock:
+        _dns_cache[key] = (now + SETTINGS.dns_cache_ttl, result)
+    return result
+
+
+def enable_dns_cache():
+    """Cache name resolution process-wide for SETTINGS.dns_cache_ttl seconds
+
+    Replaces socket.getaddrinfo for every library in the process - only
+    called for you with SETTINGS.global_dns_cache.
+    """
+    if SETTINGS.dns_cache and socket.getaddrinfo is not _cached_getaddrinfo:
+        socket.getaddrinfo = _cached_getaddrinfo
+
+
+# ============================================================================
+# REQUESTS
+# ============================================================================
+
+class _PooledAdapter(HTTPAdapter):
+    """HTTPAdapter with TCP keepalive on every pooled socket"""
+
+    def init_poolmanager(self, *args, **kwargs):
+        if SETTINGS.tcp_keepalive:
+            options = [(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1),
+                       (socket.SOL_SOCKET, socket.SO_KEEPALIVE, 1)]
+            for name, value in (("TCP_KEEPIDLE", 30), ("TCP_KEEPINTVL", 10), ("TCP_KEEPCNT", 3)):
+                if hasattr(socket, name):  # Linux
+                    options.append((socket.IPPROTO_TCP, getattr(socket, name), value))
+            kwargs["socket_options"] = options
+        super().init_poolmanager(*args, **kwargs)
+
+
+class _Session(requests.Session):
+    """Session that applies the connect timeout and records host activity"""
+
+    def request(self, method, url, *args, **kwargs):
+        connect = SETTINGS.timeout_ms / 1000
+        timeout = kwargs.get("timeout")
+        if timeout is None:
+            kwargs["timeout"] = (connect, None)
+        elif isinstance(timeout, (int, float)):
+            kwargs["timeout"] = (min(connect, timeout), timeout)
+
+        parts = urlsplit(url)
+        _last_used[f"{parts.scheme}://{parts.netloc}"] = time.monotonic()
+        return super().request(method, url, *args, **kwargs)
+
+
+_adapter: Optional[HTTPAdapter] = None
+_adapter_lock = threading.Lock()
+_last_used: Dict[str, float] = {}  # Host -> last request (monotonic)
+
+
+def _shared_adapter() -> HTTPAdapter:
+    global _adapter
+    with _adapter_lock:
+        if _adapter is None:
+            if SETTINGS.global_dns_cache:
+                enable_dns_cache()
+            retry = Retry(total=SETTINGS.max_retries, read=0, backoff_factor=0.05,
+                          status_forcelist=(502, 503, 504), raise_on_status=False,
+                          respect_retry_after_header=False)
+            pool_size = SETTINGS.pool_size if SETTINGS.connection_pooling else 1
+            _adapter = _PooledAdapter(pool_connections=len(PREWARM_HOSTS) * 4,
+                                      pool_maxsize=pool_size, max_retries=retry)
+        return _adapter
+
+
+def http_session(headers: Optional[Dict] = None) -> requests.Session:
+    """requests.Session on the shared, pre-warmed connection pool"""
+    session = _Session()
+    adapter = _shared_adapter()
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    if headers:
+        session.headers.update(headers)
+    return session
+
+
+# ============================================================================
+# AIOHTTP
+# ============================================================================
+
+def aiohttp_session(headers: Optional[Dict] = None, **kwargs):
+    """aiohttp.ClientSession with the same pool / DNS / timeout settings
+
+    Call from inside the running event loop.
+    """
+    import aiohttp
+
+    connector = aiohttp.TCPConnector(
+        limit=SETTINGS.pool_size if SETTINGS.connection_pooling else 1,
+        use_dns_cache=SETTINGS.dns_cache,
+        ttl_dns_cache=SETTINGS.dns_cache_ttl if SETTINGS.dns_cache else None,
+        keepalive_timeout=SETTINGS.keepalive_seconds
+    )
+    timeout = aiohttp.ClientTimeout(total=SETTINGS.timeout_ms / 1000 * 2,
+                                    sock_connect=SETTINGS.timeout_ms / 1000)
+    return aiohttp.ClientSession(connector=connector, timeout=timeout, headers=headers, **kwargs)
+
+
+async def prewarm_async(session, hosts: Iterable[str] = PREWARM_HOSTS) -> Dict[str, float]:
+    """Open a connection to each host on an aiohttp session - host -> ms"""
+    import asyncio
+
+    async def touch(host: str) -> float:
+        start = time.perf_counter()
+        try:
+            async with session.head(host + "/", allow_redirects=False) as resp:
+                await resp.read()
+        except Exception as e:
+            logger.debug(f"Prewarm {host} failed: {e}")
+            return -1.0
+        return (time.perf_counter() - start) * 1000
+
+    hosts = list(hosts)
+    return dict(zip(hosts, await asyncio.gather(*(touch(host) for host in hosts))))
+
+
+# ============================================================================
+# PRE-WARMING
+# ============================================================================
+
+_warm_hosts: List[str] = []
+_keep_warm_thread: Optional[threading.Thread] = None
+
+
+def _touch(session: requests.Session, host: str) -> float:
+    start = time.perf_counter()
+    try:
+        session.head(host + "/", allow_redirects=False)
+    except requests.RequestException as e:
+        logger.debug(f"Prewarm {host} failed: {e}")
+        return -1.0
+    return (time.perf_counter() - start) * 1000
+
+
+def prewarm(hosts: Iterable[str] = PREWARM_HOSTS, keep_warm: bool = True) -> Dict[str, float]:
+    """Resolve and open a TLS connection to each host (in parallel) - host -> ms
+
+    With keep_warm, a background thread re-touches any host idle for
+    SETTINGS.keep_warm_seconds so its pooled connection is never stale.
+    """
+    global _keep_warm_thread
+    session = http_session()
+    hosts = [host for host in hosts if host not in _warm_hosts]
+    timings: Dict[str, float] = {}
+
+    def warm(host: str):
+        timings[host] = _touch(session, host)
+
+    threads = [threading.Thread(target=warm, args=(host,), daemon=True) for host in hosts]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    _warm_hosts.extend(hosts)
+    logger.info("Prewarmed " + ", ".join(f"{urlsplit(host).netloc} {ms:.0f}ms"
+                                         for host, ms in timings.items()))
+
+    if keep_warm and SETTINGS.keep_warm_seconds > 0 and _keep_warm_thread is None:
+        _keep_warm_thread = threading.Thread(target=_keep_warm, args=(session,),
+                                             name="transport-keep-warm", daemon=True)
+        _keep_warm_thread.start()
+
+    return timings
+
+
+def _keep_warm(session: requests.Session):
+    interval = SETTINGS.keep_warm_seconds
+    while True:
+        time.sleep(interval / 2)
+        now = time.monotonic()
+        for host in list(_warm_hosts):
+            if now - _last_used.get(host, 0) >= interval:
+                _touch(session, host)
+
+
+def get_stats() -> Dict:
+    return {
+        "settings": asdict(SETTINGS),
+        "dns_cache": {**_dns_stats, "entries": len(_dns_cache)},
+        "warm_hosts": list(_warm_hosts),
+        "keep_warm": _keep_warm_thread is not None
+    }
+
+
+# ============================================================================
+# CLI
+# ============================================================================
+
+def main():
+    import argparse
+    import json
+
+    parser = argparse.ArgumentParser(description="Apollo Edge Transport")
+    parser.add_argument("--bench", action="store_true",
+                        help="Cold vs pre-warmed first-request latency per host")
+    parser.add_argument("--requests", type=int, default=5, help="Steady-state requests per host")
+
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.INFO)
+
+    if not args.bench:
+        print(json.dumps(get_stats(), indent=2))
+        return
+
+    results = {}
+    for host in PREWARM_HOSTS:
+        cold = _touch(requests.Session(), host)  # Default client: new DNS + TCP + TLS
+        results[host] = {"cold_ms": round(cold, 1)}
+
+    prewarm(keep_warm=False)
+    session = http_session()
+    for host in PREWARM_HOSTS:
+        first = _touch(session, host)
+        steady = sorted(_touch(session, host) for _ in range(args.requests))
+        results[host].update({"prewarmed_first_ms": round(first, 1),
+                              "steady_p50_ms": round(steady[len(steady) // 2], 1)})
+
+    print(json.dumps({"hosts": results, **get_stats()}, indent=2))
+
+
+if __name__ == "__main__":
+    main()
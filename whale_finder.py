@@ -11,13 +11,14 @@ Or with a specific wallet:
     python whale_finder.py 0xYourWalletAddress
 """
 
-import requests
 import json
 import time
 import sys
 from datetime import datetime
 from collections import defaultdict
 
+from transport import http_session
+
 # ============================================================================
 # YOUR API KEY - ALREADY CONFIGURED
 # ============================================================================
@@ -27,6 +28,9 @@ ETHERSCAN_API_KEY = "I47C92D1C8TN7JRRXGHCY8UXYCHE5UYEPJ"
 # Chain IDs: Polygon=137, Ethereum=1, Arbitrum=42161, Base=8453, Optimism=10
 ETHERSCAN_V2 = "https://api.etherscan.io/v2/api"
 
+# Pooled, pre-warmable connection shared by every call
+SESSION = http_session()
+
 # Polymarket = Polygon (Chain ID 137)
 POLYGON = 137
 
@@ -71,7 +75,7 @@ def api_call(chain_id, module, action, **kwargs):
     
     try:
         time.sleep(0.25)  # Rate limit: 5/sec
-        resp = requests.get(ETHERSCAN_V2, params=params, timeout=30)
+        resp = SESSION.get(ETHERSCAN_V2, params=params, timeout=30)
         data = resp.json()
         
         if data.get("status") == "1":
@@ -27,10 +27,12 @@ import os
 import sys
 import json
 import time
+import heapq
+import bisect
 import asyncio
 import aiohttp
-import requests
 import threading
+import websocket
 from datetime import datetime, timedelta
 from dataclasses import dataclass, field, asdict
 from typing import Dict, List, Optional, Callable, Tuple
@@ -40,6 +42,10 @@ from queue import Queue, PriorityQueue
 import logging
 import hashlib
 
+from fill_simulator import FillSimulator
+from transport import http_session
+from journal import Journal, to_record, from_record
+
 # ============================================================================
 # LOAD CONFIG FROM config.py
 # ============================================================================
@@ -85,6 +91,11 @@ except ImportError:
     MIN_CONFIDENCE_SCORE = 70
     POLYGON_RPC_URL = "https://polygon-rpc.com"
 
+try:
+    from config import WHALE_SNIPER_JOURNAL_FILE
+except ImportError:
+    WHALE_SNIPER_JOURNAL_FILE = ""  # Opt-in: demo / paper runs leave no files behind
+
 
 # ============================================================================
 # CONFIGURATION DATACLASS
@@ -106,6 +117,7 @@ class SniperConfig:
     EXECUTION_TIMEOUT_MS: int = 5000       # 5 second timeout
     RETRY_ATTEMPTS: int = 3
     RETRY_DELAY_MS: int = 200
+    COALESCE_WINDOW_MS: int = 150          # Merge same-market follows within 150ms
     
     # Risk Management
     MAX_CONCURRENT_SNIPES: int = 5
@@ -113,6 +125,12 @@ class SniperConfig:
     STOP_LOSS_PCT: float = 15.0
     TAKE_PROFIT_PCT: float = 50.0
     MAX_POSITION_HOLD_HOURS: int = 168     # 1 week max hold
+    MAX_EXIT_RETRIES: int = 5              # Re-arms after failed exits before giving up
+    EXIT_RETRY_BACKOFF_SEC: float = 5.0    # Max-hold re-fire delay, doubles per failure
+    
+    # Persistence
+    JOURNAL_FILE: str = WHALE_SNIPER_JOURNAL_FILE  # Order/position journal ("" disables)
+    JOURNAL_FSYNC_MS: int = 50             # Group-commit window
     
     # Monitoring
     POLL_INTERVAL_MS: int = 500            # Poll every 500ms
@@ -179,6 +197,7 @@ class SnipeOrder:
     created_at: datetime = field(default_factory=datetime.now)
     executed_at: Optional[datetime] = None
     fill_price: Optional[float] = None
+    filled_shares: Optional[float] = None  # Set on partial fills (None = filled in full)
     tx_hash: Optional[str] = None
     error: Optional[str] = None
 
@@ -237,7 +256,7 @@ class WhaleDetectionEngine:
     }
     
     def __init__(self):
-        self.session = requests.Session()
+        self.session = http_session()
         self.seen_txs = set()
         self.wallet_history = defaultdict(list)
         self.alert_cooldowns = {}
@@ -253,9 +272,11 @@ class WhaleDetectionEngine:
     
     def _emit_alert(self, alert: WhaleAlert):
         """Emit alert to all callbacks"""
-        # Check cooldown
+        # Check cooldown - snipeable fills are exempt here: a whale splitting
+        # one entry across fills must reach the OrderAggregator to be
+        # coalesced, and the aggregator applies the cooldown per order
         cooldown_key = f"{alert.wallet}_{alert.market_id}"
-        if cooldown_key in self.alert_cooldowns:
+        if cooldown_key in self.alert_cooldowns and not alert.is_snipeable:
             if datetime.now() < self.alert_cooldowns[cooldown_key]:
                 return
         
@@ -464,6 +485,267 @@ class WhaleDetectionEngine:
         return profile
 
 
+# ============================================================================
+# PRICE STREAM & EXIT ENGINE
+# ============================================================================
+
+class MarketPriceStream:
+    """CLOB market-channel WebSocket - pushes per-token price ticks"""
+    
+    WS_URL = "wss://ws-subscriptions-clob.polymarket.com/ws/market"
+    
+    def __init__(self):
+        self.ws = None
+        self.callbacks: Dict[str, List[Callable[[str, float], None]]] = defaultdict(list)
+        self._lock = threading.Lock()
+    
+    def subscribe(self, token_id: str, callback: Callable[[str, float], None]):
+        """Receive (token_id, price) ticks for a token"""
+        with self._lock:
+            new_token = token_id not in self.callbacks
+            self.callbacks[token_id].append(callback)
+        
+        if not self.ws:
+            self._start_websocket()
+        elif new_token:
+            self._send_subscription()
+    
+    def _send_subscription(self):
+        try:
+            self.ws.send(json.dumps({"assets_ids": list(self.callbacks.keys()), "type": "market"}))
+        except Exception as e:
+            logger.debug(f"Price stream subscribe deferred: {e}")
+    
+    def _emit(self, token_id: str, price):
+        if not token_id or price is None:
+            return
+        for callback in list(self.callbacks.get(token_id, ())):
+            try:
+                callback(token_id, float(price))
+            except Exception as e:
+                logger.error(f"Price tick callback error: {e}")
+    
+    def _on_message(self, ws, message):
+        try:
+            data = json.loads(message)
+        except ValueError:
+            return
+        
+        for event in data if isinstance(data, list) else [data]:
+            event_type = event.get("event_type")
+            
+            # Exits sell into the bid - prefer best bid, fall back to last trade
+            if event_type == "book":
+                bids = event.get("bids") or event.get("buys") or []
+                if bids:
+                    self._emit(event.get("asset_id"), max(float(b["price"]) for b in bids))
+            elif event_type == "price_change":
+                for change in event.get("price_changes", []):
+                    self._emit(change.get("asset_id"), change.get("best_bid") or change.get("price"))
+            elif event_type == "last_trade_price":
+                self._emit(event.get("asset_id"), event.get("price"))
+    
+    def _start_websocket(self):
+        def on_open(ws):
+            self._send_subscription()
+        
+        def on_error(ws, error):
+            logger.error(f"Price stream error: {error}")
+        
+        def on_close(ws, close_status, close_msg):
+            logger.info("Price stream closed, reconnecting...")
+            time.sleep(5)
+            self._start_websocket()
+        
+        self.ws = websocket.WebSocketApp(
+            self.WS_URL,
+            on_open=on_open,
+            on_message=self._on_message,
+            on_error=on_error,
+            on_close=on_close
+        )
+        
+        threading.Thread(target=self.ws.run_forever, daemon=True).start()
+
+
+class ExitEngine:
+    """Tick-driven stop-loss / take-profit / max-hold exits
+    
+    Stop and target triggers are kept in price-sorted lists per token, so
+    a tick only touches positions whose thresholds it crossed. Max-hold
+    deadlines live in a timer heap.
+    """
+    
+    def __init__(self, on_exit: Callable, subscribe: Optional[Callable] = None):
+        self.on_exit = on_exit  # async (position, reason, price)
+        self.subscribe = subscribe
+        
+        self._stops: Dict[str, List[Tuple[float, str]]] = {}    # Ascending stop price
+        self._targets: Dict[str, List[Tuple[float, str]]] = {}  # Ascending target price
+        self._positions: Dict[str, Position] = {}
+        self._timers: List[Tuple[float, str]] = []
+        self._subscribed = set()
+        self.last_prices: Dict[str, float] = {}
+        
+        self._lock = threading.Lock()
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        
+        self.exits_fired = defaultdict(int)
+        self.exit_failures: Dict[str, int] = {}  # position_id -> failed exits in a row
+        self._inflight = set()  # Exit orders being executed
+    
+    def bind(self, loop: Optional[asyncio.AbstractEventLoop] = None):
+        """Attach to the event loop exit orders are executed on"""
+        self._loop = loop or asyncio.get_running_loop()
+    
+    def watch(self, position: Position, not_before: float = 0.0):
+        """Start tracking an open position (max-hold fires no earlier than not_before)"""
+        token = position.market_id
+        
+        with self._lock:
+            self._positions[position.id] = position
+            bisect.insort(self._stops.setdefault(token, []), (position.stop_loss, position.id))
+            bisect.insort(self._targets.setdefault(token, []), (position.take_profit, position.id))
+            
+            deadline = position.entry_time.timestamp() + CONFIG.MAX_POSITION_HOLD_HOURS * 3600
+            deadline = max(deadline, not_before)
+            heapq.heappush(self._timers, (deadline, position.id))
+            
+            new_token = token not in self._subscribed
+            self._subscribed.add(token)
+        
+        if new_token and self.subscribe:
+            self.subscribe(token, self.on_tick)
+    
+    def retry(self, position: Position) -> bool:
+        """Re-arm a position whose exit failed or only partly filled
+        
+        Stop and target re-arm at once; an expired max-hold waits out an
+        exponential backoff. Gives up after CONFIG.MAX_EXIT_RETRIES.
+        """
+        failures = self.exit_failures.get(position.id, 0) + 1
+        if failures > CONFIG.MAX_EXIT_RETRIES:
+            self.exit_failures.pop(position.id, None)
+            logger.error(f"❌ {position.id}: {CONFIG.MAX_EXIT_RETRIES} exits failed - "
+                        f"no longer watched, close manually")
+            return False
+        
+        self.exit_failures[position.id] = failures
+        backoff = CONFIG.EXIT_RETRY_BACKOFF_SEC * 2 ** (failures - 1)
+        self.watch(position, not_before=time.time() + backoff)
+        return True
+    
+    def unwatch(self, position_id: str) -> Optional[Position]:
+        """Stop tracking a position (timer entries are dropped lazily)"""
+        with self._lock:
+            position = self._positions.pop(position_id, None)
+            if position:
+                self._remove(self._stops, position.market_id, (position.stop_loss, position_id))
+                self._remove(self._targets, position.market_id, (position.take_profit, position_id))
+        return position
+    
+    @staticmethod
+    def _remove(index: Dict[str, List[Tuple[float, str]]], token: str, entry: Tuple[float, str]):
+        entries = index.get(token)
+        if not entries:
+            return
+        i = bisect.bisect_left(entries, entry)
+        if i < len(entries) and entries[i] == entry:
+            del entries[i]
+    
+    def on_tick(self, token_id: str, price: float):
+        """Price tick - fire every stop/target the price crossed"""
+        self.last_prices[token_id] = price
+        triggered = []
+        
+        with self._lock:
+            stops = self._stops.get(token_id)
+            if stops and price <= stops[-1][0]:
+                # Stops at or above the price have been hit
+                i = bisect.bisect_left(stops, (price, ""))
+                triggered += [(pid, "stopped") for _, pid in stops[i:]]
+            
+            targets = self._targets.get(token_id)
+            if targets and price >= targets[0][0]:
+                # Targets at or below the price have been hit
+                i = bisect.bisect_right(targets, (price, "\uffff"))
+                triggered += [(pid, "profit_taken") for _, pid in targets[:i]]
+        
+        for position_id, reason in triggered:
+            self._fire(position_id, reason, price)
+    
+    def check_timers(self, now: Optional[float] = None):
+        """Fire max-hold exits whose deadline has passed"""
+        now = time.time() if now is None else now
+        due = []
+        
+        with self._lock:
+            while self._timers and self._timers[0][0] <= now:
+                _, position_id = heapq.heappop(self._timers)
+                if position_id in self._positions:
+                    due.append(position_id)
+        
+        for position_id in due:
+            position = self._positions.get(position_id)
+            if position:
+                price = self.last_prices.get(position.market_id, position.current_price)
+                self._fire(position_id, "closed", price)
+    
+    async def run_timers(self, running: Callable[[], bool]):
+        """Sleep until the next max-hold deadline and fire it"""
+        while running():
+            self.check_timers()
+            
+            with self._lock:
+                next_due = self._timers[0][0] if self._timers else None
+            
+            delay = 60 if next_due is None else max(0.01, min(60, next_due - time.time()))
+            await asyncio.sleep(delay)
+    
+    def _fire(self, position_id: str, reason: str, price: float):
+        if self._loop is None or self._loop.is_closed():
+            return  # Not trading yet - stay armed
+        
+        position = self.unwatch(position_id)
+        if not position or position.status != "open":
+            return
+        
+        position.update(price)
+        position.status = reason
+        self.exits_fired[reason] += 1
+        
+        logger.info(f"📊 EXIT {reason.upper()}: {position_id} @ {price:.4f} ({position.pnl_pct:+.1f}%)")
+        
+        coro = self.on_exit(position, reason, price)
+        try:
+            on_loop = asyncio.get_running_loop() is self._loop
+        except RuntimeError:
+            on_loop = False
+        
+        if on_loop:
+            self._spawn(coro)
+        else:
+            self._loop.call_soon_threadsafe(self._spawn, coro)
+    
+    def _spawn(self, coro):
+        task = self._loop.create_task(coro)
+        self._inflight.add(task)
+        task.add_done_callback(self._inflight.discard)
+    
+    async def drain(self, timeout: float = 10.0):
+        """Wait for exits already fired to finish"""
+        if self._inflight:
+            await asyncio.wait(list(self._inflight), timeout=timeout)
+    
+    def get_stats(self) -> Dict:
+        return {
+            "watched_positions": len(self._positions),
+            "tokens": len(self._subscribed),
+            "pending_timers": len(self._timers),
+            "exits_fired": dict(self.exits_fired)
+        }
+
+
 # ============================================================================
 # SNIPE EXECUTION ENGINE
 # ============================================================================
@@ -478,11 +760,75 @@ class SnipeExecutionEngine:
         self.positions = {}
         
         self.executor = ThreadPoolExecutor(max_workers=CONFIG.MAX_CONCURRENT_SNIPES)
+        self.fill_simulator = FillSimulator()
+        self.price_stream = MarketPriceStream()
+        self.exit_engine = ExitEngine(self.execute_exit, subscribe=self.price_stream.subscribe)
         self.daily_snipe_count = 0
         self.daily_reset = datetime.now().date()
         
+        self.journal = None  # Opened by open_journal() when trading starts
+        
         self._running = False
     
+    def open_journal(self):
+        """Open CONFIG.JOURNAL_FILE and restore state (re-arms open positions)"""
+        if not CONFIG.JOURNAL_FILE or self.journal is not None:
+            return
+        self.journal = Journal(
+            CONFIG.JOURNAL_FILE,
+            terminal={
+                "orders": lambda o: o["status"] in ("filled", "failed", "cancelled"),
+                "positions": lambda p: p["status"] != "open"
+            },
+            fsync_interval_ms=CONFIG.JOURNAL_FSYNC_MS
+        )
+        self._restore()
+    
+    def _restore(self):
+        """Rebuild orders, positions and the daily counter from the journal"""
+        for record in self.journal.table("orders").values():
+            order = from_record(SnipeOrder, record)
+            if order.status in ("pending", "executing"):
+                # Submitted but never confirmed before shutdown
+                order.status = "failed"
+                order.error = "Interrupted by restart"
+                self._journal_order(order)
+                logger.warning(f"⚠️ Order {order.id} was in flight at shutdown - check the exchange")
+            self.completed_orders.append(order)
+        self.completed_orders.sort(key=lambda o: o.created_at)
+        
+        for record in self.journal.table("positions").values():
+            position = from_record(Position, record)
+            self.positions[position.id] = position
+            if position.status == "open":
+                self.exit_engine.watch(position)
+        
+        counter = self.journal.get("counters", "daily_snipes")
+        if counter and counter["date"] == self.daily_reset.isoformat():
+            self.daily_snipe_count = counter["count"]
+        
+        open_count = len([p for p in self.positions.values() if p.status == "open"])
+        logger.info(f"📒 Restored {open_count} open positions, {len(self.completed_orders)} orders, "
+                    f"{self.daily_snipe_count} snipes today ({self.journal.stats['replay_ms']}ms)")
+    
+    def _journal_order(self, order: SnipeOrder):
+        if self.journal:
+            self.journal.put("orders", order.id, to_record(order))
+    
+    def _journal_position(self, position: Position):
+        if self.journal:
+            self.journal.put("positions", position.id, to_record(position))
+    
+    def _journal_counter(self):
+        if self.journal:
+            self.journal.put("counters", "daily_snipes",
+                             {"date": self.daily_reset.isoformat(), "count": self.daily_snipe_count})
+    
+    def close(self):
+        """Flush the journal to disk"""
+        if self.journal:
+            self.journal.close()
+    
     def create_snipe_order(self, alert: WhaleAlert) -> Optional[SnipeOrder]:
         """Create snipe order from whale alert"""
         
@@ -524,18 +870,25 @@ class SnipeExecutionEngine:
         
         order.status = "executing"
         self.active_orders[order.id] = order
+        self._journal_order(order)
         
         for attempt in range(CONFIG.RETRY_ATTEMPTS):
             try:
                 # In production, this would submit to Polymarket CLOB API
                 # For now, simulate execution
                 
+                submit_start = time.perf_counter()
                 success = await self._submit_order(order)
                 
+                if not PAPER_TRADING_MODE:
+                    # Feed measured submit latency to the paper fill simulator
+                    self.fill_simulator.latency.record((time.perf_counter() - submit_start) * 1000)
+                
                 if success:
                     order.status = "filled"
                     order.executed_at = datetime.now()
-                    order.fill_price = order.target_price * 1.001  # Simulated fill
+                    if order.fill_price is None:
+                        order.fill_price = order.target_price * 1.001  # Simulated fill
                     
                     self.daily_snipe_count += 1
                     self.completed_orders.append(order)
@@ -543,6 +896,11 @@ class SnipeExecutionEngine:
                     # Create position
                     position = self._create_position(order)
                     self.positions[position.id] = position
+                    self.exit_engine.watch(position)
+                    
+                    self._journal_order(order)
+                    self._journal_position(position)
+                    self._journal_counter()
                     
                     logger.info(f"✅ SNIPE FILLED: {order.id} @ {order.fill_price:.4f}")
                     return True
@@ -555,6 +913,8 @@ class SnipeExecutionEngine:
         
         order.status = "failed"
         order.error = "Max retries exceeded"
+        self.completed_orders.append(order)
+        self._journal_order(order)
         logger.error(f"❌ SNIPE FAILED: {order.id}")
         
         return False
@@ -574,9 +934,7 @@ class SnipeExecutionEngine:
         
         # Paper trading mode - simulate only
         if PAPER_TRADING_MODE:
-            logger.info(f"📝 PAPER TRADE: Would buy ${order.size_usd:,.0f} @ {order.target_price:.4f}")
-            await asyncio.sleep(0.05)  # Simulate latency
-            return True
+            return await self._simulate_fill(order)
         
         # REAL TRADING MODE
         logger.info(f"💰 REAL TRADE: Submitting ${order.size_usd:,.0f} order...")
@@ -629,6 +987,47 @@ class SnipeExecutionEngine:
             logger.error(f"❌ Trade execution failed: {e}")
             return False
     
+    async def _simulate_fill(self, order: SnipeOrder) -> bool:
+        """Paper fill matched against the mirrored order book"""
+        sim = self.fill_simulator
+        loop = asyncio.get_running_loop()
+        
+        mirrored = await loop.run_in_executor(self.executor, sim.mirror, order.market_id)
+        if not mirrored and not sim.has_book(order.market_id):
+            # No book for this token - fall back to a fixed paper fill
+            logger.info(f"📝 PAPER TRADE: Would {order.direction} ${order.size_usd:,.0f} @ {order.target_price:.4f} (no book)")
+            await asyncio.sleep(sim.latency.sample_ms() / 1000)
+            return True
+        
+        # Exits sell the position's shares; entries spend USD
+        size_shares = None
+        if order.direction == "sell" and order.target_price:
+            size_shares = order.size_usd / order.target_price
+        
+        fill = sim.submit(
+            order.id, order.market_id, order.direction,
+            size_usd=order.size_usd,
+            size_shares=size_shares,
+            limit_price=order.max_price or None
+        )
+        await asyncio.sleep(fill.latency_ms / 1000)
+        
+        # Snipes are immediate-or-cancel
+        if fill.status == "resting":
+            sim.cancel(fill)
+        
+        if fill.filled_shares <= 0:
+            logger.info(f"📝 PAPER TRADE: No liquidity within {order.max_price:.4f}")
+            return False
+        
+        order.fill_price = fill.avg_price
+        order.size_usd = fill.notional_usd
+        order.filled_shares = fill.filled_shares
+        
+        logger.info(f"📝 PAPER FILL: ${fill.notional_usd:,.2f} @ {fill.avg_price:.4f} "
+                   f"({fill.status}, {len(fill.fills)} levels, {fill.latency_ms:.0f}ms)")
+        return True
+    
     def _create_position(self, order: SnipeOrder) -> Position:
         """Create position from filled order"""
         return Position(
@@ -645,18 +1044,82 @@ class SnipeExecutionEngine:
             take_profit=order.fill_price * (1 + CONFIG.TAKE_PROFIT_PCT / 100)
         )
     
+    async def execute_exit(self, position: Position, reason: str, price: float) -> bool:
+        """Sell an open position immediately (called by the exit engine)"""
+        order = SnipeOrder(
+            id=f"exit_{position.id}_{int(time.time()*1000)}",
+            whale_alert_id=position.snipe_order_id,
+            market_id=position.market_id,
+            outcome=position.outcome,
+            direction="sell",
+            size_usd=position.size_shares * price,
+            target_price=price,
+            max_price=price * (1 - CONFIG.MAX_SLIPPAGE_PCT / 100)  # Floor for sells
+        )
+        
+        logger.info(f"⚡ EXECUTING EXIT ({reason}): {order.id} - {position.size_shares:,.2f} shares")
+        order.status = "executing"
+        
+        for attempt in range(CONFIG.RETRY_ATTEMPTS):
+            try:
+                if await self._submit_order(order):
+                    order.status = "filled"
+                    order.executed_at = datetime.now()
+                    if order.fill_price is None:
+                        order.fill_price = price
+                    self.completed_orders.append(order)
+                    
+                    sold = position.size_shares if order.filled_shares is None else order.filled_shares
+                    if sold < position.size_shares * 0.999:
+                        # Partial IOC fill - the rest stays open and protected
+                        position.size_shares -= sold
+                        position.update(order.fill_price)
+                        position.status = "open"
+                        self._journal_order(order)
+                        self._journal_position(position)
+                        
+                        logger.warning(f"◐ PARTIAL EXIT: {position.id} sold {sold:,.2f} @ {order.fill_price:.4f}, "
+                                      f"{position.size_shares:,.2f} shares still open")
+                        self.exit_engine.retry(position)
+                        return False
+                    
+                    self.exit_engine.exit_failures.pop(position.id, None)
+                    position.update(order.fill_price)
+                    position.status = reason
+                    self._journal_order(order)
+                    self._journal_position(position)
+                    
+                    logger.info(f"✅ EXIT FILLED: {position.id} @ {order.fill_price:.4f} "
+                               f"(P&L ${position.pnl_usd:,.2f})")
+                    return True
+            except Exception as e:
+                logger.error(f"Exit attempt {attempt+1} failed: {e}")
+            
+            if attempt < CONFIG.RETRY_ATTEMPTS - 1:
+                await asyncio.sleep(CONFIG.RETRY_DELAY_MS / 1000)
+        
+        order.status = "failed"
+        order.error = "Max retries exceeded"
+        self.completed_orders.append(order)
+        self._journal_order(order)
+        logger.error(f"❌ EXIT FAILED: {position.id} - re-arming triggers")
+        
+        # Keep protecting the position
+        position.status = "open"
+        self.exit_engine.retry(position)
+        return False
+    
     def update_positions(self, prices: Dict[str, float]):
-        """Update all positions with current prices"""
-        for pos_id, position in list(self.positions.items()):
+        """Feed manual price snapshots ("{market}_{outcome}" keys) to the exit engine"""
+        for position in list(self.positions.values()):
             if position.status != "open":
                 continue
             
             price_key = f"{position.market_id}_{position.outcome}"
             if price_key in prices:
                 position.update(prices[price_key])
-                
-                if position.status in ["stopped", "profit_taken"]:
-                    logger.info(f"📊 Position {pos_id}: {position.status} @ {position.pnl_pct:.1f}%")
+                position.status = "open"  # Exit engine owns the trigger
+                self.exit_engine.on_tick(position.market_id, prices[price_key])
     
     def get_stats(self) -> Dict:
         """Get execution statistics"""
@@ -676,6 +1139,253 @@ class SnipeExecutionEngine:
         }
 
 
+# ============================================================================
+# ORDER AGGREGATION
+# ============================================================================
+
+def merge_alerts(alerts: List[WhaleAlert]) -> WhaleAlert:
+    """Combine follow intents for one market/outcome into a single alert"""
+    if len(alerts) == 1:
+        return alerts[0]
+    
+    first = alerts[0]
+    total_size = sum(a.size_usd for a in alerts)
+    
+    # Size-weighted average whale entry price
+    if total_size > 0:
+        price = sum(a.price * a.size_usd for a in alerts) / total_size
+    else:
+        price = alerts[-1].price
+    
+    return WhaleAlert(
+        id=first.id,
+        wallet=first.wallet,
+        action=first.action,
+        market_id=first.market_id,
+        market_name=first.market_name,
+        outcome=first.outcome,
+        size_usd=total_size,
+        price=price,
+        tx_hash=first.tx_hash,
+        block_number=max(a.block_number for a in alerts),
+        timestamp=alerts[-1].timestamp,
+        confidence=max(a.confidence for a in alerts),
+        metadata={
+            **first.metadata,
+            "merged_alert_ids": [a.id for a in alerts],
+            "merged_wallets": sorted({a.wallet for a in alerts})
+        }
+    )
+
+
+class OrderAggregator:
+    """Coalesces follow intents for the same market/outcome inside a short window
+    
+    Each flushed order starts the wallet+market alert cooldown for its
+    wallets; a window whose wallets are all still cooling down on that
+    market is dropped, so a whale buying again later doesn't spawn a new
+    order each time.
+    """
+    
+    def __init__(self, on_flush: Callable[[WhaleAlert], None],
+                 window_ms: Optional[int] = None, cooldown_sec: Optional[float] = None):
+        self.on_flush = on_flush
+        self.window_ms = CONFIG.COALESCE_WINDOW_MS if window_ms is None else window_ms
+        self.cooldown_sec = CONFIG.ALERT_COOLDOWN_SEC if cooldown_sec is None else cooldown_sec
+        
+        self._pending: Dict[Tuple[str, str], List[WhaleAlert]] = {}
+        self._cooldowns: Dict[Tuple[str, str], float] = {}   # (wallet, market) -> monotonic expiry
+        self._lock = threading.Lock()
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        
+        self.intents_received = 0
+        self.orders_emitted = 0
+        self.orders_suppressed = 0
+        self.intents_suppressed = 0
+    
+    def bind(self, loop: Optional[asyncio.AbstractEventLoop] = None):
+        """Attach aggregator to the running event loop for window timers"""
+        self._loop = loop or asyncio.get_running_loop()
+    
+    def add(self, alert: WhaleAlert):
+        """Add a follow intent - opens a window on the first intent per market"""
+        key = (alert.market_id, alert.outcome)
+        
+        with self._lock:
+            self.intents_received += 1
+            
+            bucket = self._pending.get(key)
+            if bucket is not None:
+                bucket.append(alert)
+                return
+            
+            self._pending[key] = [alert]
+        
+        if self.window_ms <= 0 or self._loop is None or self._loop.is_closed():
+            self.flush(key)
+            return
+        
+        delay = self.window_ms / 1000
+        try:
+            on_loop = asyncio.get_running_loop() is self._loop
+        except RuntimeError:
+            on_loop = False
+        
+        if on_loop:
+            self._loop.call_later(delay, self.flush, key)
+        else:
+            self._loop.call_soon_threadsafe(self._loop.call_later, delay, self.flush, key)
+    
+    def flush(self, key: Tuple[str, str]):
+        """Close the window for one market and emit the merged intent"""
+        now = time.monotonic()
+        with self._lock:
+            alerts = self._pending.pop(key, None)
+            if not alerts:
+                return
+            
+            market_id = key[0]
+            wallets = {alert.wallet for alert in alerts}
+            if all(self._cooldowns.get((wallet, market_id), 0) > now for wallet in wallets):
+                self.orders_suppressed += 1
+                self.intents_suppressed += len(alerts)
+                logger.debug(f"Follow order on {market_id[:16]} suppressed - whale cooling down")
+                return
+            
+            if len(self._cooldowns) > 10_000:
+                self._cooldowns = {k: until for k, until in self._cooldowns.items() if until > now}
+            for wallet in wallets:
+                self._cooldowns[(wallet, market_id)] = now + self.cooldown_sec
+        
+        merged = merge_alerts(alerts)
+        if len(alerts) > 1:
+            logger.info(f"🔗 Coalesced {len(alerts)} follow intents on {key[0][:16]} "
+                       f"(${merged.size_usd:,.0f} combined)")
+        
+        self.orders_emitted += 1
+        try:
+            self.on_flush(merged)
+        except Exception as e:
+            logger.error(f"Aggregator flush error: {e}")
+    
+    def flush_all(self):
+        """Emit every open window immediately"""
+        with self._lock:
+            keys = list(self._pending.keys())
+        
+        for key in keys:
+            self.flush(key)
+    
+    def get_stats(self) -> Dict:
+        return {
+            "window_ms": self.window_ms,
+            "open_windows": len(self._pending),
+            "intents_received": self.intents_received,
+            "orders_emitted": self.orders_emitted,
+            "orders_suppressed": self.orders_suppressed,
+            "intents_coalesced": (self.intents_received - self.orders_emitted - self.intents_suppressed
+                                  - sum(len(bucket) for bucket in self._pending.values()))
+        }
+
+
+# ============================================================================
+# SNIPE QUEUE
+# ============================================================================
+
+class SnipeQueue:
+    """Awaitable order queue - wakes waiting workers the moment an order is put"""
+
+    def __init__(self):
+        self._queue: Optional[asyncio.Queue] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._backlog = deque()  # Orders put before a loop is bound
+        self._backlog_lock = threading.Lock()
+
+        # Metrics
+        self.total_enqueued = 0
+        self.total_dequeued = 0
+        self.max_depth = 0
+        self.wait_times_ms = deque(maxlen=1000)
+
+    def bind(self, loop: Optional[asyncio.AbstractEventLoop] = None):
+        """Attach queue to the running event loop"""
+        loop = loop or asyncio.get_running_loop()
+        queue = asyncio.Queue()
+
+        # Drain and publish together so a concurrent put() can't land in
+        # the backlog after it has been emptied
+        with self._backlog_lock:
+            while self._backlog:
+                queue.put_nowait(self._backlog.popleft())
+            self._loop = loop
+            self._queue = queue
+
+    def _on_loop_thread(self) -> bool:
+        try:
+            return asyncio.get_running_loop() is self._loop
+        except RuntimeError:
+            return False
+
+    def put(self, item):
+        """Enqueue item (safe to call from any thread)"""
+        entry = (time.perf_counter(), item)
+        depth = None
+
+        if self._queue is None:
+            with self._backlog_lock:
+                if self._queue is None:
+                    self._backlog.append(entry)
+                    depth = len(self._backlog)
+        if depth is None:
+            if self._on_loop_thread():
+                self._queue.put_nowait(entry)
+                depth = self._queue.qsize()
+            else:
+                self._loop.call_soon_threadsafe(self._queue.put_nowait, entry)
+                depth = self._queue.qsize() + 1
+
+        if item is not None:
+            self.total_enqueued += 1
+            self.max_depth = max(self.max_depth, depth)
+
+    async def get(self):
+        """Wait for the next item"""
+        enqueued_at, item = await self._queue.get()
+
+        if item is not None:
+            self.total_dequeued += 1
+            self.wait_times_ms.append((time.perf_counter() - enqueued_at) * 1000)
+
+        return item
+
+    def close(self, consumers: int):
+        """Wake up to `consumers` waiting workers with a stop sentinel"""
+        for _ in range(consumers):
+            self.put(None)
+
+    def qsize(self) -> int:
+        if self._queue is None:
+            return len(self._backlog)
+        return self._queue.qsize()
+
+    def empty(self) -> bool:
+        return self.qsize() == 0
+
+    def get_stats(self) -> Dict:
+        """Queue depth and wait-time metrics"""
+        waits = sorted(self.wait_times_ms)
+
+        return {
+            "depth": self.qsize(),
+            "max_depth": self.max_depth,
+            "total_enqueued": self.total_enqueued,
+            "total_dequeued": self.total_dequeued,
+            "avg_wait_ms": sum(waits) / len(waits) if waits else 0,
+            "p95_wait_ms": waits[int(len(waits) * 0.95)] if waits else 0,
+            "max_wait_ms": waits[-1] if waits else 0
+        }
+
+
 # ============================================================================
 # MAIN SNIPER SYSTEM
 # ============================================================================
@@ -687,7 +1397,8 @@ class WhaleSniper:
         self.detector = WhaleDetectionEngine()
         self.executor = SnipeExecutionEngine()
         
-        self.alerts_queue = Queue()
+        self.alerts_queue = SnipeQueue()
+        self.aggregator = OrderAggregator(self._on_follow_intent)
         self.running = False
         
         # Wire up detector to executor
@@ -713,25 +1424,40 @@ class WhaleSniper:
             self.stats["snipeable_alerts"] += 1
             logger.info(f"   ⚡ SNIPEABLE - Creating order...")
             
-            order = self.executor.create_snipe_order(alert)
-            if order:
-                self.alerts_queue.put((alert, order))
+            self.aggregator.add(alert)
+    
+    def _on_follow_intent(self, alert: WhaleAlert):
+        """Create one order per coalesced market/outcome window"""
+        order = self.executor.create_snipe_order(alert)
+        if order:
+            self.alerts_queue.put((alert, order))
     
     async def _process_alerts(self):
-        """Process alert queue"""
+        """Process alert queue with up to MAX_CONCURRENT_SNIPES orders in flight"""
+        self.alerts_queue.bind()
+        self.aggregator.bind()
+        self.executor.exit_engine.bind()
+        
+        await asyncio.gather(*(
+            self._snipe_worker() for _ in range(CONFIG.MAX_CONCURRENT_SNIPES)
+        ))
+    
+    async def _snipe_worker(self):
+        """Execute queued orders as soon as they arrive"""
         while self.running:
+            item = await self.alerts_queue.get()
+            if item is None:
+                break
+            
+            alert, order = item
+            
             try:
-                if not self.alerts_queue.empty():
-                    alert, order = self.alerts_queue.get_nowait()
-                    
-                    self.stats["snipes_attempted"] += 1
-                    success = await self.executor.execute_order(order)
-                    
-                    if success:
-                        self.stats["snipes_successful"] += 1
-                
-                await asyncio.sleep(0.01)  # Small delay
+                self.stats["snipes_attempted"] += 1
+                success = await self.executor.execute_order(order)
                 
+                if success:
+                    self.stats["snipes_successful"] += 1
+                    
             except Exception as e:
                 logger.error(f"Alert processing error: {e}")
     
@@ -756,15 +1482,26 @@ class WhaleSniper:
         logger.info(f"   Follow percentage: {CONFIG.FOLLOW_PERCENTAGE*100:.0f}%")
         logger.info(f"   Poll interval: {CONFIG.POLL_INTERVAL_MS}ms")
         
+        self.executor.open_journal()
+        timers = asyncio.create_task(self.executor.exit_engine.run_timers(lambda: self.running))
+        
         # Run scan loop and alert processor concurrently
-        await asyncio.gather(
-            self._scan_loop(),
-            self._process_alerts()
-        )
+        try:
+            await asyncio.gather(
+                self._scan_loop(),
+                self._process_alerts()
+            )
+        finally:
+            # Workers and fired exits have drained - nothing writes to the journal after this
+            timers.cancel()
+            await self.executor.exit_engine.drain()
+            self.executor.close()
     
     def stop(self):
-        """Stop the sniper"""
+        """Stop the sniper (start() closes the journal once workers finish)"""
         self.running = False
+        self.aggregator.flush_all()
+        self.alerts_queue.close(CONFIG.MAX_CONCURRENT_SNIPES)
         logger.info("Whale Sniper stopped")
     
     def get_status(self) -> Dict:
@@ -776,6 +1513,10 @@ class WhaleSniper:
             "runtime_seconds": runtime,
             "detection_stats": self.stats,
             "execution_stats": self.executor.get_stats(),
+            "queue_stats": self.alerts_queue.get_stats(),
+            "aggregation_stats": self.aggregator.get_stats(),
+            "exit_stats": self.executor.exit_engine.get_stats(),
+            "journal_stats": self.executor.journal.get_stats() if self.executor.journal else None,
             "config": asdict(CONFIG)
         }
 
@@ -0,0 +1,261 @@
+#!/usr/bin/env python3
+"""
+WIN PROBABILITY - Precomputed NFL Win-Probability Surface
+==========================================================
+Fair value of a moneyline the instant something happens on the field, as
+a table lookup instead of a model call.
+
+The surface is indexed by score differential, seconds left, and field
+position (yards to the opponent's end zone), always from the side with
+the ball. A team without the ball is looked up as 1 - P(opponent), which
+is what makes possession an index too.
+
+FEATURES:
+- Built offline from play-by-play (nflfastR CSV columns) - each cell is
+  the empirical win rate shrunk toward an analytic prior, so sparse cells
+  (down 35 with 10 seconds left) stay sane
+- Stored compact: uint16 probabilities in a compressed .npz (~200 KB)
+- O(1) lookups, linearly interpolated in time and field position (a few us)
+- Falls back to the analytic surface when no table file is present
+
+USAGE:
+    from win_probability import WinProbabilityTable
+
+    wp = WinProbabilityTable.default()            # WIN_PROBABILITY_TABLE or analytic
+    p = wp.lookup(score_diff=-3, seconds_left=420, has_ball=True, yardline_100=35)
+
+    python win_probability.py --build play_by_play_2015_2024.csv --out win_probability.npz
+    python win_probability.py --query -3 420 1 35
+    python win_probability.py --bench
+"""
+
+import os
+import csv
+import time
+from typing import Dict, Iterable, Optional
+import logging
+
+import numpy as np
+
+logger = logging.getLogger('WinProbability')
+
+try:
+    from config import WIN_PROBABILITY_TABLE
+except ImportError:
+    WIN_PROBABILITY_TABLE = "win_probability.npz"
+
+
+MAX_DIFF = 40            # Score differentials clamp to +-40
+TIME_STEP = 30           # Seconds per time bin
+GAME_SECONDS = 3600      # Regulation (overtime reads the clock as time left)
+YARD_STEP = 5            # Yards per field-position bin
+
+N_DIFF = 2 * MAX_DIFF + 1
+N_TIME = GAME_SECONDS // TIME_STEP + 1
+N_YARD = 100 // YARD_STEP + 1
+
+SCALE = 65535            # uint16 storage
+
+
+def _analytic(diff: np.ndarray, seconds: np.ndarray, yardline: np.ndarray) -> np.ndarray:
+    """Prior surface: final margin ~ normal around score + drive value
+
+    Expected points of the drive fall linearly with distance to the end
+    zone and fade out in the last two minutes; the margin's spread
+    shrinks with sqrt(time left) (13.45 points over a full game).
+    """
+    drive = (6.3 - 0.08 * yardline) * np.minimum(1.0, seconds / 120)
+    spread = 13.45 * np.sqrt(seconds / GAME_SECONDS) + 0.5
+    z = (diff + drive) / spread
+    return 1 / (1 + np.exp(-1.702 * z))  # Logistic approximation of the normal CDF
+
+
+def _grid():
+    return np.meshgrid(np.arange(-MAX_DIFF, MAX_DIFF + 1, dtype=float),
+                       np.arange(N_TIME, dtype=float) * TIME_STEP,
+                       np.arange(N_YARD, dtype=float) * YARD_STEP,
+                       indexing="ij")
+
+
+class WinProbabilityTable:
+    """P(offense wins) on a [diff, time, yardline] grid with O(1) lookups"""
+
+    def __init__(self, table: np.ndarray, source: str = "analytic"):
+        if table.shape != (N_DIFF, N_TIME, N_YARD):
+            raise ValueError(f"table shape {table.shape} != {(N_DIFF, N_TIME, N_YARD)}")
+        if table.dtype == np.uint16:
+            table = table.astype(np.float32) / SCALE
+        self.table = table.astype(np.float32)
+        self.source = source
+
+        # Flat float32 + item() is the cheapest scalar access numpy offers
+        self._flat = self.table.ravel()
+        self._item = self._flat.item
+
+    # ------------------------------------------------------------------
+    # Construction
+    # ------------------------------------------------------------------
+
+    @classmethod
+    def analytic(cls) -> "WinProbabilityTable":
+        return cls(_analytic(*_grid()), "analytic")
+
+    @classmethod
+    def build(cls, plays: Iterable[Dict], prior_weight: float = 25) -> "WinProbabilityTable":
+        """Table from play-by-play rows
+
+        Rows need score_differential (offense minus defense), posteam,
+        home_team, game_seconds_remaining, yardline_100 and result (final
+        home minus away). Each cell's empirical win rate is blended with
+        the analytic prior worth prior_weight plays.
+        """
+        wins = np.zeros((N_DIFF, N_TIME, N_YARD))
+        plays_seen = np.zeros((N_DIFF, N_TIME, N_YARD))
+        used = 0
+
+        for play in plays:
+            try:
+                diff = int(float(play["score_differential"]))
+                seconds = float(play["game_seconds_remaining"])
+                yardline = float(play["yardline_100"])
+                result = float(play["result"])
+                home = play["posteam"] == play["home_team"]
+            except (KeyError, TypeError, ValueError):
+                continue  # Kickoffs, timeouts and other rows without a snap
+
+            margin = result if home else -result
+            d = min(MAX_DIFF, max(-MAX_DIFF, diff)) + MAX_DIFF
+            t = min(N_TIME - 1, max(0, int(round(seconds / TIME_STEP))))
+            y = min(N_YARD - 1, max(0, int(round(yardline / YARD_STEP))))
+            wins[d, t, y] += 1.0 if margin > 0 else 0.5 if margin == 0 else 0.0
+            plays_seen[d, t, y] += 1
+            used += 1
+
+        prior = _analytic(*_grid())
+        table = (wins + prior_weight * prior) / (plays_seen + prior_weight)
+        logger.info(f"Built win probability table from {used:,} plays "
+                    f"({int((plays_seen > 0).sum()):,} of {plays_seen.size:,} cells observed)")
+        return cls(table, f"play-by-play ({used} plays)")
+
+    @classmethod
+    def from_csv(cls, path: str, prior_weight: float = 25) -> "WinProbabilityTable":
+        with open(path, newline="") as f:
+            return cls.build(csv.DictReader(f), prior_weight)
+
+    def save(self, path: str):
+        """Compressed uint16 table (atomic replace)"""
+        tmp_path = path + ".tmp.npz"  # np.savez appends .npz otherwise
+        np.savez_compressed(tmp_path,
+                            table=np.round(self.table * SCALE).astype(np.uint16),
+                            source=np.array(self.source),
+                            grid=np.array([MAX_DIFF, TIME_STEP, GAME_SECONDS, YARD_STEP]))
+        os.replace(tmp_path, path)
+
+    @classmethod
+    def load(cls, path: str) -> "WinProbabilityTable":
+        with np.load(path) as data:
+            grid = [int(v) for v in data["grid"]]
+            if grid != [MAX_DIFF, TIME_STEP, GAME_SECONDS, YARD_STEP]:
+                raise ValueError(f"{path} was built for grid {grid}")
+            return cls(data["table"], str(data["source"]))
+
+    @classmethod
+    def default(cls, path: Optional[str] = None) -> "WinProbabilityTable":
+        """The configured table file, or the analytic surface without one"""
+        path = path or WIN_PROBABILITY_TABLE
+        if path and os.path.exists(path):
+            try:
+                return cls.load(path)
+            except (OSError, KeyError, ValueError) as e:
+                logger.warning(f"Win probability table {path} unusable ({e}) - using analytic")
+        return cls.analytic()
+
+    # ------------------------------------------------------------------
+    # Lookup
+    # ------------------------------------------------------------------
+
+    def lookup(self, score_diff: float, seconds_left: float, has_ball: bool = True,
+               yardline_100: float = 75) -> float:
+        """P(team wins) - score_diff from the team's side, yardline_100 of
+        whoever has the ball (yards to their opponent's end zone)"""
+        if not has_ball:
+            return 1.0 - self.lookup(-score_diff, seconds_left, True, yardline_100)
+
+        d = int(round(score_diff))
+        d = (MAX_DIFF if d > MAX_DIFF else -MAX_DIFF if d < -MAX_DIFF else d) + MAX_DIFF
+
+        t = seconds_left / TIME_STEP
+        t = 0.0 if t < 0 else float(N_TIME - 1) if t > N_TIME - 1 else t
+        t0 = int(t)
+        t1 = t0 + 1 if t0 < N_TIME - 1 else t0
+        tf = t - t0
+
+        y = yardline_100 / YARD_STEP
+        y = 0.0 if y < 0 else float(N_YARD - 1) if y > N_YARD - 1 else y
+        y0 = int(y)
+        y1 = y0 + 1 if y0 < N_YARD - 1 else y0
+        yf = y - y0
+
+        item = self._item
+        base = d * N_TIME * N_YARD
+        row0 = base + t0 * N_YARD
+        row1 = base + t1 * N_YARD
+        p0 = item(row0 + y0) * (1 - yf) + item(row0 + y1) * yf
+        p1 = item(row1 + y0) * (1 - yf) + item(row1 + y1) * yf
+        return p0 * (1 - tf) + p1 * tf
+
+    def get_stats(self) -> Dict:
+        return {"source": self.source, "cells": int(self.table.size),
+                "bytes": int(self.table.size * 2)}
+
+
+# ============================================================================
+# CLI
+# ============================================================================
+
+def main():
+    import argparse
+    import random
+
+    parser = argparse.ArgumentParser(description="NFL Win Probability Table")
+    parser.add_argument("--build", type=str, help="Play-by-play CSV (nflfastR columns)")
+    parser.add_argument("--out", type=str, default=WIN_PROBABILITY_TABLE, help="Table file to write")
+    parser.add_argument("--prior-weight", type=float, default=25, help="Plays the prior is worth per cell")
+    parser.add_argument("--query", type=float, nargs=4, metavar=("DIFF", "SECONDS", "HAS_BALL", "YARDLINE"),
+                        help="Look up one state")
+    parser.add_argument("--bench", action="store_true", help="Time lookups")
+
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.INFO)
+
+    if args.build:
+        table = WinProbabilityTable.from_csv(args.build, args.prior_weight)
+        table.save(args.out)
+        print(f"[*] Wrote {args.out} ({os.path.getsize(args.out) / 1024:.0f} KB, {table.source})")
+        return
+
+    table = WinProbabilityTable.default()
+    print(f"[*] Table: {table.source}")
+
+    if args.query:
+        diff, seconds, has_ball, yardline = args.query
+        print(f"{table.lookup(diff, seconds, bool(has_ball), yardline):.4f}")
+
+    if args.bench or not args.query:
+        rnd = random.Random(1)
+        states = [(rnd.randint(-21, 21), rnd.uniform(0, 3600), rnd.random() < 0.5, rnd.uniform(1, 99))
+                  for _ in range(100_000)]
+        start = time.perf_counter()
+        for state in states:
+            table.lookup(*state)
+        elapsed = time.perf_counter() - start
+        print(f"[*] {len(states):,} lookups: {elapsed / len(states) * 1e6:.2f} us each")
+
+        # Touchdown (+7) midway through the 4th in a tie game
+        before = table.lookup(0, 450, True, 75)
+        after = table.lookup(7, 440, False, 75)
+        print(f"[*] Tie, own 25, 7:30 left: {before:.3f} -> TD + XP: {after:.3f}")
+
+
+if __name__ == "__main__":
+    main()